@@ -0,0 +1,95 @@
+"""
+Avatar thumbnails.
+
+Each uploaded avatar is cropped to squares of ``AVATAR_SIZES`` pixels and
+re-encoded as WebP and JPEG without EXIF or other metadata. The names are
+kept on ``Profile.avatar_thumbnails`` as ``{"64": {"webp": ..., "jpeg": ...}}``
+so lists can link small images instead of the original upload.
+"""
+import io
+import logging
+import os
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.utils import timezone
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from accounts.models import Profile
+
+logger = logging.getLogger(__name__)
+
+AVATAR_SIZES = (32, 64, 128, 256)
+THUMBNAIL_DIR = "avatars/thumbs"
+JPEG_BACKGROUND = (255, 255, 255)
+
+
+def _encode(image: Image.Image, image_format: str) -> bytes:
+    buffer = io.BytesIO()
+    if image_format == "webp":
+        image.save(buffer, "WEBP", quality=80, method=6)
+    else:
+        if image.mode == "RGBA":
+            background = Image.new("RGB", image.size, JPEG_BACKGROUND)
+            background.paste(image, mask=image.getchannel("A"))
+            image = background
+        image.save(buffer, "JPEG", quality=85, optimize=True, progressive=True)
+    return buffer.getvalue()
+
+
+def render_thumbnails(source) -> dict[int, dict[str, bytes]]:
+    """Encoded thumbnails of the image file ``source`` by size and format."""
+    with Image.open(source) as image:
+        # JPEG decoding can downscale by powers of two for free.
+        image.draft("RGB", (max(AVATAR_SIZES) * 2,) * 2)
+        image = ImageOps.exif_transpose(image)
+        has_alpha = image.mode in ("RGBA", "LA", "PA") or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+    rendered = {}
+    for size in sorted(AVATAR_SIZES, reverse=True):
+        image = ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS)
+        rendered[size] = {image_format: _encode(image, image_format) for image_format in ("webp", "jpeg")}
+    return rendered
+
+
+def delete_thumbnails(thumbnails: dict) -> None:
+    for names in (thumbnails or {}).values():
+        for name in names.values():
+            default_storage.delete(name)
+
+
+def generate_thumbnails(profile_id: int) -> dict | None:
+    """
+    Render and store the thumbnails of a profile's current avatar. Returns
+    the stored names, or None when nothing was stored.
+    """
+    profile = Profile.objects.filter(pk=profile_id).only("id", "avatar").first()
+    if profile is None or not profile.avatar:
+        return None
+    avatar_name = profile.avatar.name
+    try:
+        with profile.avatar.open("rb") as source:
+            rendered = render_thumbnails(source)
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError):
+        logger.warning("Avatar thumbnails failed for profile %s (%s)", profile_id, avatar_name, exc_info=True)
+        return None
+
+    stem = os.path.splitext(os.path.basename(avatar_name))[0]
+    thumbnails = {}
+    for size, encoded in sorted(rendered.items()):
+        thumbnails[str(size)] = {
+            image_format: default_storage.save(
+                f"{THUMBNAIL_DIR}/{profile_id}/{stem}-{size}.{image_format}", ContentFile(data)
+            )
+            for image_format, data in encoded.items()
+        }
+
+    # The avatar may have been replaced while this one was rendered.
+    updated = Profile.objects.filter(pk=profile_id, avatar=avatar_name).update(
+        avatar_thumbnails=thumbnails, updated_at=timezone.now()
+    )
+    if not updated:
+        delete_thumbnails(thumbnails)
+        return None
+    return thumbnails
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from accounts.avatars import delete_thumbnails, generate_thumbnails
+from accounts.models import Profile
+
+
+class Command(BaseCommand):
+    help = "Generate avatar thumbnails for profiles that have an avatar but no thumbnails"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="Regenerate existing thumbnails too")
+
+    def handle(self, *args, **options):
+        profiles = Profile.objects.exclude(avatar="").exclude(avatar__isnull=True)
+        if not options["all"]:
+            profiles = profiles.filter(avatar_thumbnails={})
+        count = 0
+        for profile_id, thumbnails in profiles.values_list("id", "avatar_thumbnails").iterator():
+            if generate_thumbnails(profile_id) is not None:
+                delete_thumbnails(thumbnails)
+                count += 1
+        self.stdout.write(self.style.SUCCESS(f"Generated thumbnails for {count} profile(s)"))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0004_add_avatar_field"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="avatar_thumbnails",
+            field=models.JSONField(blank=True, default=dict, editable=False),
+        ),
+    ]
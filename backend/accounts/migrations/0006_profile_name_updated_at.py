@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0005_profile_avatar_thumbnails"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profilename",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.conf import settings
 from django.db import models
+from django.utils.functional import cached_property
 from django.utils.translation import gettext_lazy as _
 
 
@@ -29,6 +30,10 @@ class Position(models.Model):
         return self.name
 
 
+# Relations rendered by ProfileSerializer; prefetch them for lists of profiles.
+PROFILE_DETAIL_PREFETCH = ("names", "employments__department", "employments__position")
+
+
 class Profile(models.Model):
     class Roles(models.TextChoices):
         ADMIN = "ADMIN", _("Admin")
@@ -68,6 +73,8 @@ class Profile(models.Model):
         blank=True,
         help_text=_("Foydalanuvchi profil rasmi"),
     )
+    # {"<size>": {"webp": name, "jpeg": name}}, filled in by accounts.avatars.
+    avatar_thumbnails = models.JSONField(default=dict, blank=True, editable=False)
     scopus = models.URLField(max_length=255, blank=True)
     scholar = models.URLField(max_length=255, blank=True)
     research_id = models.CharField(max_length=128, blank=True)
@@ -85,18 +92,25 @@ class Profile(models.Model):
             return [self.Roles.HOD, self.Roles.TEACHER]
         return [self.role]
 
+    @cached_property
+    def names_by_language(self) -> dict[str, "ProfileName"]:
+        """
+        ProfileName rows keyed by language, loaded once per instance.
+        Served from prefetch_related("names") without a query when prefetched.
+        """
+        return {profile_name.language: profile_name for profile_name in self.names.all()}
+
     def get_full_name_by_lang(self, lang: str) -> str:
         """Get full name in specified language, fallback to User model if not found."""
-        try:
-            profile_name = self.names.get(language=lang)
-            parts = [profile_name.first_name, profile_name.last_name]
-            if profile_name.father_name:
-                parts.append(profile_name.father_name)
-            return " ".join(parts).strip()
-        except self.names.model.DoesNotExist:
+        profile_name = self.names_by_language.get(lang)
+        if profile_name is None:
             # Fallback to User model's name
             full_name = self.user.get_full_name().strip()
             return full_name or self.user.username
+        parts = [profile_name.first_name, profile_name.last_name]
+        if profile_name.father_name:
+            parts.append(profile_name.father_name)
+        return " ".join(parts).strip()
 
     def __str__(self) -> str:
         return f"{self.user.get_full_name() or self.user.username} ({self.role})"
@@ -166,6 +180,7 @@ class ProfileName(models.Model):
     first_name = models.CharField(max_length=150)
     last_name = models.CharField(max_length=150)
     father_name = models.CharField(max_length=150, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = [("profile", "language")]
@@ -3,6 +3,8 @@ from rest_framework import serializers
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 
 from accounts.models import Department, Employment, Position, Profile, ProfileName
+from accounts.utils import profile_with_details
+from core.media import media_url
 
 User = get_user_model()
 
@@ -57,8 +59,21 @@ class ProfileShortSerializer(serializers.ModelSerializer):
         )
 
     def get_full_name(self, obj: Profile) -> str:
-        full_name = obj.user.get_full_name().strip()
-        return full_name or obj.user.username
+        return _short_name(obj)
+
+
+def _short_name(profile: Profile) -> str:
+    return profile.user.get_full_name().strip() or profile.user.username
+
+
+def profile_short_data(profile: Profile) -> dict:
+    """``ProfileShortSerializer(profile).data`` for hot paths, without per-field dispatch."""
+    return {
+        "id": profile.user.id,
+        "full_name": _short_name(profile),
+        "role": profile.role,
+        "user_id_str": profile.user_id_str,
+    }
 
 
 class ProfileSerializer(serializers.ModelSerializer):
@@ -81,6 +96,7 @@ class ProfileSerializer(serializers.ModelSerializer):
     employments = EmploymentSerializer(many=True, read_only=True)
 
     avatar = serializers.SerializerMethodField()
+    avatar_thumbnails = serializers.SerializerMethodField()
 
     class Meta:
         model = Profile
@@ -103,6 +119,7 @@ class ProfileSerializer(serializers.ModelSerializer):
             "phone",
             "birth_date",
             "avatar",
+            "avatar_thumbnails",
             "scopus",
             "scholar",
             "research_id",
@@ -137,24 +154,16 @@ class ProfileSerializer(serializers.ModelSerializer):
         return obj.get_full_name_by_lang("en")
 
     def get_avatar(self, obj: Profile) -> str | None:
-        """Return full URL for avatar image."""
-        if not obj.avatar:
-            return None
+        """Return full signed URL for avatar image."""
+        return media_url(obj.avatar, self.context.get("request"))
+
+    def get_avatar_thumbnails(self, obj: Profile) -> dict[str, dict[str, str]]:
+        """Signed URLs of the avatar thumbnails by size and format; empty until generated."""
         request = self.context.get("request")
-        if request:
-            # obj.avatar.url returns relative URL like /media/avatars/...
-            # build_absolute_uri will create full URL
-            avatar_url = obj.avatar.url
-            # If URL doesn't start with http, make it absolute
-            if avatar_url.startswith("http"):
-                return avatar_url
-            return request.build_absolute_uri(avatar_url)
-        # Fallback if no request context
-        from django.conf import settings
-        if obj.avatar:
-            # Return relative URL that frontend can use
-            return obj.avatar.url
-        return None
+        return {
+            size: {image_format: media_url(name, request) for image_format, name in names.items()}
+            for size, names in obj.avatar_thumbnails.items()
+        }
 
 
 class UserAdminWriteSerializer(serializers.ModelSerializer):
@@ -335,7 +344,7 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
 
     def validate(self, attrs):
         data = super().validate(attrs)
-        profile = self.user.profile
+        profile = profile_with_details(self.user)
         data["user"] = ProfileSerializer(profile, context=self.context).data
         return data
 
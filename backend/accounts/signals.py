@@ -1,11 +1,16 @@
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
+from django.utils import timezone
 
-from accounts.models import Department, Profile
+from accounts.models import Department, Employment, Profile, ProfileName
+from accounts.tasks import delete_avatar_thumbnails, generate_avatar_thumbnails
 
 User = get_user_model()
 
+# Thumbnails of the avatar being replaced; stored between pre_save and post_save.
+STALE_THUMBNAILS_ATTR = "_stale_avatar_thumbnails"
+
 
 def _get_default_department() -> Department | None:
     try:
@@ -21,3 +26,53 @@ def create_profile_on_user_creation(sender, instance: User, created: bool, **kwa
     department = _get_default_department()
     Profile.objects.create(user=instance, department=department)
 
+
+
+@receiver(pre_save, sender=Profile, dispatch_uid="reset_avatar_thumbnails")
+def reset_avatar_thumbnails(sender, instance: Profile, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and "avatar" not in update_fields):
+        return
+    previous = None
+    if instance.pk is not None:
+        previous = sender.objects.filter(pk=instance.pk).values("avatar", "avatar_thumbnails").first()
+    if previous is not None and previous["avatar"] == (instance.avatar.name or ""):
+        return
+    setattr(instance, STALE_THUMBNAILS_ATTR, previous["avatar_thumbnails"] if previous else {})
+    instance.avatar_thumbnails = {}
+
+
+@receiver(post_save, sender=Profile, dispatch_uid="regenerate_avatar_thumbnails")
+def regenerate_avatar_thumbnails(sender, instance: Profile, raw=False, update_fields=None, **kwargs):
+    if raw or not hasattr(instance, STALE_THUMBNAILS_ATTR):
+        return
+    stale = instance.__dict__.pop(STALE_THUMBNAILS_ATTR)
+    if update_fields is not None and "avatar_thumbnails" not in update_fields:
+        sender.objects.filter(pk=instance.pk).update(avatar_thumbnails={})
+    if stale:
+        delete_avatar_thumbnails.enqueue(stale)
+    if instance.avatar:
+        generate_avatar_thumbnails.enqueue(instance.pk)
+
+
+@receiver(post_delete, sender=Profile, dispatch_uid="delete_avatar_thumbnails")
+def release_avatar_thumbnails(sender, instance: Profile, **kwargs):
+    if instance.avatar_thumbnails:
+        delete_avatar_thumbnails.enqueue(instance.avatar_thumbnails)
+
+
+@receiver(post_save, sender=User, dispatch_uid="touch_profile_after_user_save")
+def touch_profile_after_user_save(sender, instance: User, created: bool, raw=False, update_fields=None, **kwargs):
+    # Names and usernames are rendered with the profile wherever it appears,
+    # so ORM and admin edits of a user must change its conditional GET
+    # validators too. Logins save last_login only.
+    if raw or created or (update_fields is not None and set(update_fields) <= {"last_login"}):
+        return
+    Profile.objects.filter(user=instance).update(updated_at=timezone.now())
+
+
+@receiver(post_delete, sender=ProfileName, dispatch_uid="touch_profile_after_name_delete")
+@receiver(post_delete, sender=Employment, dispatch_uid="touch_profile_after_employment_delete")
+def touch_profile_after_delete(sender, instance, **kwargs):
+    # A deleted row does not move its model's latest updated_at, so the
+    # user's conditional GET validators would not change without this.
+    Profile.objects.filter(pk=instance.profile_id).update(updated_at=timezone.now())
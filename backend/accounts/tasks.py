@@ -0,0 +1,12 @@
+from accounts.avatars import delete_thumbnails, generate_thumbnails
+from tasks.queue import task
+
+
+@task(name="accounts.generate_avatar_thumbnails", timeout=120)
+def generate_avatar_thumbnails(profile_id: int) -> None:
+    generate_thumbnails(profile_id)
+
+
+@task(name="accounts.delete_avatar_thumbnails", max_attempts=5)
+def delete_avatar_thumbnails(thumbnails: dict) -> None:
+    delete_thumbnails(thumbnails)
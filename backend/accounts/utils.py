@@ -9,10 +9,23 @@ def get_user_profile(user) -> Optional["Profile"]:
     return getattr(user, "profile", None)
 
 
+def profile_with_details(user):
+    """
+    Load the user's profile with everything ProfileSerializer renders, so
+    serializing it costs a fixed number of queries.
+    """
+    return (
+        Profile.objects.select_related("user", "department", "position")
+        .prefetch_related(*PROFILE_DETAIL_PREFETCH)
+        .get(user=user)
+    )
+
+
 User = get_user_model()
 
 try:  # pragma: no cover
-    from accounts.models import Profile
+    from accounts.models import PROFILE_DETAIL_PREFETCH, Profile
 except Exception:  # pragma: no cover
+    PROFILE_DETAIL_PREFETCH = ()
     Profile = None  # type: ignore
 
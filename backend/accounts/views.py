@@ -1,10 +1,10 @@
 from django.contrib.auth import get_user_model
-from drf_spectacular.utils import extend_schema
-from rest_framework import generics, permissions, viewsets
+from drf_spectacular.utils import extend_schema, extend_schema_view
+from rest_framework import generics, permissions, serializers, viewsets
 from rest_framework.response import Response
 from rest_framework_simplejwt.views import TokenObtainPairView
 
-from accounts.models import Department, Position
+from accounts.models import Department, Employment, Position, ProfileName
 from accounts.permissions import IsAdmin
 from accounts.serializers import (
     ChangePasswordSerializer,
@@ -16,31 +16,46 @@ from accounts.serializers import (
     UserAdminReadSerializer,
     UserAdminWriteSerializer,
 )
+from accounts.utils import profile_with_details
+from core.conditional import ConditionalGetMixin, conditional_get
+from core.fieldsets import FIELDSET_PARAMETERS, SparseFieldsetMixin, is_expanded
 
 User = get_user_model()
 
+USER_COLUMNS = ("username", "first_name", "last_name", "email")
+# ProfileSerializer fields read from the prefetched ProfileName rows.
+NAME_FIELDS = {"names", "full_name", "full_name_uzc", "full_name_ru", "full_name_en"}
+
 
 @extend_schema(
     tags=["Departments"],
     summary="List all departments",
     description="Get a list of all departments in the system.",
 )
-class DepartmentListView(generics.ListAPIView):
+class DepartmentListView(ConditionalGetMixin, generics.ListAPIView):
     queryset = Department.objects.all()
     serializer_class = DepartmentSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    @conditional_get("list_validators")
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
 
 @extend_schema(
     tags=["Positions"],
     summary="List all positions",
     description="Get a list of all positions in the system.",
 )
-class PositionListView(generics.ListAPIView):
+class PositionListView(ConditionalGetMixin, generics.ListAPIView):
     queryset = Position.objects.all()
     serializer_class = PositionSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    @conditional_get("list_validators")
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
 
 @extend_schema(
     tags=["Authentication"],
@@ -52,7 +67,7 @@ class CurrentUserView(generics.RetrieveAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
-        return self.request.user.profile
+        return profile_with_details(self.request.user)
 
 
 @extend_schema(
@@ -76,19 +91,33 @@ class ChangePasswordView(generics.GenericAPIView):
     summary="User management",
     description="CRUD operations for user management. List and retrieve are accessible to all authenticated users. Create, update, and delete are admin-only.",
 )
-class UserViewSet(viewsets.ModelViewSet):
+@extend_schema_view(
+    list=extend_schema(parameters=FIELDSET_PARAMETERS),
+    retrieve=extend_schema(parameters=FIELDSET_PARAMETERS),
+)
+class UserViewSet(ConditionalGetMixin, SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = (
         User.objects.all()
         .select_related("profile", "profile__department", "profile__position")
+        .prefetch_related(
+            "profile__names",
+            "profile__employments__department",
+            "profile__employments__position",
+        )
         .order_by("username")
     )
     filter_backends = []
+    expandable_fields = {"profile": lambda: serializers.IntegerField(source="profile.id", read_only=True)}
+    # Users have no timestamp of their own; every API edit of a user also saves the profile.
+    last_modified_field = "profile__updated_at"
+    conditional_dependencies = (Department, Position, Employment, ProfileName)
+    conditional_media = True
 
     def get_queryset(self):
         """
         Filter out admin and djangoadmin users from the list.
         """
-        queryset = super().get_queryset()
+        queryset = super().get_queryset() if self.fieldset is None else self._sparse_queryset()
         # Exclude admin and djangoadmin users from list view
         if self.action == "list":
             queryset = queryset.exclude(
@@ -100,6 +129,35 @@ class UserViewSet(viewsets.ModelViewSet):
             )
         return queryset
 
+    @conditional_get("list_validators")
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional_get("object_validators")
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    def _sparse_queryset(self):
+        """Only the joins and prefetches the requested profile fields need."""
+        fields = self.output_fields()
+        queryset = User.objects.only("id", *(name for name in USER_COLUMNS if name in fields)).order_by("username")
+        if "profile" not in fields:
+            return queryset
+        if not is_expanded(fields["profile"]):
+            return queryset.select_related("profile").only(*queryset.query.deferred_loading[0], "profile__id")
+        # Profile fields fall back to the user's names, so those stay loaded.
+        queryset = queryset.select_related("profile").only("id", *USER_COLUMNS, "profile")
+
+        profile_fields = fields["profile"].fields
+        for name in ("department", "position"):
+            if name in profile_fields:
+                queryset = queryset.select_related(f"profile__{name}")
+        if NAME_FIELDS.intersection(profile_fields):
+            queryset = queryset.prefetch_related("profile__names")
+        if "employments" in profile_fields:
+            queryset = queryset.prefetch_related("profile__employments__department", "profile__employments__position")
+        return queryset
+
     def get_permissions(self):
         """
         Allow all authenticated users to list and retrieve users (for author selection).
@@ -136,7 +194,10 @@ class CustomTokenObtainPairView(TokenObtainPairView):
 @extend_schema(
     tags=["Authentication"],
     summary="Upload avatar",
-    description="Upload or update the avatar image for the currently authenticated user.",
+    description=(
+        "Upload or update the avatar image for the currently authenticated user. "
+        "`avatar_thumbnails` (32-256px WebP and JPEG) are generated after the upload."
+    ),
 )
 class AvatarUploadView(generics.GenericAPIView):
     permission_classes = [permissions.IsAuthenticated]
@@ -159,5 +220,5 @@ class AvatarUploadView(generics.GenericAPIView):
         profile.avatar = avatar_file
         profile.save()
 
-        serializer = ProfileSerializer(profile, context={"request": request})
+        serializer = ProfileSerializer(profile_with_details(request.user), context={"request": request})
         return Response(serializer.data, status=200)
\ No newline at end of file
@@ -0,0 +1,157 @@
+"""
+Conditional GET (``If-None-Match``) for read endpoints.
+
+Requests carrying ``If-None-Match`` get validators computed from the
+database before anything is serialized: ``MAX(updated_at)`` and
+``COUNT(*)`` of the filtered queryset for lists, the row's ``updated_at``
+for details. A client whose copy is current gets ``304 Not Modified`` and
+nothing is serialized. Requests without it run no validator query; their
+ETag is a hash of the rendered body, which a later request can match too.
+
+ETags also cover what else shapes a response: the URL (filters, pages,
+fieldsets), the user, the negotiated media type, the latest change of the
+models shown nested in it and, when it carries signed media URLs, the
+signing window. There is no ``Last-Modified``: ``MAX(updated_at)`` does not
+move when a row is deleted, so ``If-Modified-Since`` would keep deleted rows
+in cached lists. Responses get ``Cache-Control: private, no-cache`` so
+clients revalidate instead of reusing them heuristically.
+"""
+import hashlib
+from functools import wraps
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max, Subquery
+from django.utils.cache import get_conditional_response, patch_cache_control
+
+from core.media import signing_window
+
+Validators = tuple
+
+
+def make_etag(request, *parts) -> str:
+    """Quoted ETag of ``parts`` for this URL, user and media type."""
+    key = repr(
+        (
+            request.get_full_path(),
+            getattr(request.user, "pk", None),
+            getattr(request, "accepted_media_type", None),
+            *parts,
+        )
+    )
+    return f'"{hashlib.sha256(key.encode()).hexdigest()[:32]}"'
+
+
+def _latest(model, field: str = "updated_at") -> Subquery:
+    return Subquery(model.objects.order_by(f"-{field}").values(field)[:1])
+
+
+def queryset_validators(queryset, field: str = "updated_at", dependencies=()) -> tuple[int, Validators]:
+    """
+    ``(count, validators)`` of ``queryset`` in one aggregate query: the row
+    count, the latest ``field`` and the latest ``updated_at`` of each model
+    in ``dependencies``.
+    """
+    latest = queryset.order_by().aggregate(
+        count=Count("pk"),
+        updated=Max(field),
+        **{f"dependency_{index}": Max(_latest(model)) for index, model in enumerate(dependencies)},
+    )
+    return latest["count"], tuple(latest.values())
+
+
+def _revalidate_content(request, response):
+    """
+    Post-render callback: tag a response that has no validator ETag with a
+    hash of its body, and answer 304 when the client holds that body.
+    """
+    if not 200 <= response.status_code < 300:
+        return None
+    etag = make_etag(request, hashlib.sha256(response.content).hexdigest())
+    if not response.has_header("ETag"):
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+    # The response keeps its own ETag, so a validator ETag replaces the
+    # client's content hash and the next request skips serializing.
+    return get_conditional_response(request, etag=etag, response=response)
+
+
+def _with_content_etag(request, response):
+    if hasattr(response, "add_post_render_callback"):
+        response.add_post_render_callback(lambda rendered: _revalidate_content(request, rendered))
+    return response
+
+
+def conditional_response(request, etag: str, respond):
+    """
+    A 304 when the client's copy matches ``etag``, ``respond()`` otherwise;
+    successful responses carry the ETag.
+    """
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = respond()
+    if 200 <= response.status_code < 300 or response.status_code == 304:
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def conditional_get(validators: str):
+    """
+    Answer conditional requests to a view method; ``validators`` names the
+    view method returning its validators, or None to skip the check (e.g.
+    an object that does not exist, so the method can answer 404).
+    """
+
+    def decorator(method):
+        @wraps(method)
+        def wrapper(view, request, *args, **kwargs):
+            def respond():
+                return _with_content_etag(request, method(view, request, *args, **kwargs))
+
+            if not request.META.get("HTTP_IF_NONE_MATCH"):
+                # Nothing to compare against, so no validator query.
+                return respond()
+            parts = getattr(view, validators)()
+            if parts is None:
+                return respond()
+            if view.conditional_media:
+                parts = (*parts, signing_window())
+            return conditional_response(request, make_etag(request, *parts), respond)
+
+        return wrapper
+
+    return decorator
+
+
+class ConditionalGetMixin:
+    """
+    Validators for ``@conditional_get("list_validators")`` and
+    ``@conditional_get("object_validators")`` on a generic view.
+
+    The view's queryset must hold only rows the user may read, since
+    details are checked against it without object permissions.
+    """
+
+    last_modified_field = "updated_at"
+    # Models shown nested in responses; their latest change counts too.
+    conditional_dependencies = ()
+    # Responses carry signed media URLs, which change every signing window.
+    conditional_media = False
+
+    def list_validators(self) -> Validators:
+        queryset = self.filter_queryset(self.get_queryset())
+        return queryset_validators(queryset, self.last_modified_field, self.conditional_dependencies)[1]
+
+    def object_validators(self) -> Validators | None:
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        queryset = self.filter_queryset(self.get_queryset())
+        try:
+            count, found = queryset_validators(
+                queryset.filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]}),
+                self.last_modified_field,
+                self.conditional_dependencies,
+            )
+        except (TypeError, ValueError, ValidationError):
+            # A malformed lookup; get_object() answers 404.
+            return None
+        return found if count == 1 else None
@@ -0,0 +1,122 @@
+"""
+Sparse fieldsets for list and detail responses.
+
+``?fields=id,title,owner.full_name`` keeps only the named fields,
+``?omit=description`` drops fields; dots address fields of nested objects.
+Nested objects a view lists in ``expandable_fields`` are expanded by
+default; with ``?expand=owner`` only the named ones are, and the others are
+rendered as primary keys. Views use the pruned serializer (see
+``SparseFieldsetMixin.output_fields``) to leave unneeded columns, joins and
+prefetches out of their querysets.
+"""
+from dataclasses import dataclass
+from functools import cached_property
+
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework.exceptions import ValidationError
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+FIELDS_QUERY_PARAM = "fields"
+OMIT_QUERY_PARAM = "omit"
+EXPAND_QUERY_PARAM = "expand"
+
+FIELDSET_PARAMETERS = [
+    OpenApiParameter(
+        FIELDS_QUERY_PARAM,
+        str,
+        description="Comma-separated fields to return; `owner.full_name` selects a field of a nested object.",
+    ),
+    OpenApiParameter(OMIT_QUERY_PARAM, str, description="Comma-separated fields to leave out."),
+    OpenApiParameter(
+        EXPAND_QUERY_PARAM,
+        str,
+        description="Comma-separated nested objects to expand; the others are returned as ids. All by default.",
+    ),
+]
+
+
+def _tree(value: str) -> dict:
+    """``"a,b.c,b.d"`` as ``{"a": {}, "b": {"c": {}, "d": {}}}``."""
+    tree = {}
+    for path in value.split(","):
+        node = tree
+        for name in filter(None, path.strip().split(".")):
+            node = node.setdefault(name, {})
+    return tree
+
+
+@dataclass(frozen=True)
+class Fieldset:
+    fields: dict | None = None
+    omit: dict | None = None
+    expand: frozenset | None = None
+
+    @classmethod
+    def from_request(cls, request) -> "Fieldset | None":
+        params = request.query_params
+        if not any(param in params for param in (FIELDS_QUERY_PARAM, OMIT_QUERY_PARAM, EXPAND_QUERY_PARAM)):
+            return None
+        expand = params.get(EXPAND_QUERY_PARAM)
+        return cls(
+            fields=_tree(params[FIELDS_QUERY_PARAM]) if FIELDS_QUERY_PARAM in params else None,
+            omit=_tree(params.get(OMIT_QUERY_PARAM, "")),
+            expand=None if expand is None else frozenset(filter(None, (name.strip() for name in expand.split(",")))),
+        )
+
+    def apply(self, serializer, expandable: dict | None = None, path: str = "") -> None:
+        """Prune ``serializer.fields`` in place; unknown names are a 400."""
+        fields = serializer.fields
+        expandable = expandable or {}
+        unknown = [f"{path}{name}" for name in [*(self.fields or {}), *(self.omit or {})] if name not in fields]
+        if unknown:
+            raise ValidationError({FIELDS_QUERY_PARAM: f"Noma'lum maydon: {', '.join(unknown)}"})
+        if self.expand is not None and not self.expand <= set(expandable):
+            unknown = sorted(self.expand - set(expandable))
+            raise ValidationError({EXPAND_QUERY_PARAM: f"Noma'lum maydon: {', '.join(unknown)}"})
+
+        for name in list(fields):
+            requested = None if self.fields is None else self.fields.get(name)
+            omitted = (self.omit or {}).get(name)
+            if (self.fields is not None and requested is None) or omitted == {}:
+                del fields[name]
+                continue
+            if name in expandable and self.expand is not None and name not in self.expand:
+                fields[name] = expandable[name]()
+                continue
+            nested = fields[name]
+            nested = nested.child if isinstance(nested, ListSerializer) else nested
+            if isinstance(nested, BaseSerializer) and (requested or omitted):
+                Fieldset(fields=requested or None, omit=omitted).apply(nested, path=f"{path}{name}.")
+
+
+class SparseFieldsetMixin:
+    """
+    ``?fields=``, ``?omit=`` and ``?expand=`` for the view's read actions.
+
+    ``expandable_fields`` maps nested fields to a factory of the field that
+    replaces them when they are not expanded.
+    """
+
+    expandable_fields: dict = {}
+    fieldset_actions = ("list", "retrieve")
+
+    @cached_property
+    def fieldset(self) -> Fieldset | None:
+        if self.action not in self.fieldset_actions:
+            return None
+        return Fieldset.from_request(self.request)
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        if self.fieldset is not None:
+            self.fieldset.apply(getattr(serializer, "child", serializer), self.expandable_fields)
+        return serializer
+
+    def output_fields(self) -> dict:
+        """The response's fields after pruning, by name."""
+        return self.get_serializer().fields
+
+
+def is_expanded(field) -> bool:
+    """Whether ``field`` renders nested objects rather than primary keys."""
+    return isinstance(getattr(field, "child", field), BaseSerializer)
@@ -0,0 +1,237 @@
+"""
+File responses for media: conditional requests, byte ranges and optional
+offloading of the transfer to the web server.
+
+With ``MEDIA_SENDFILE = "x-accel-redirect"`` nginx streams the bytes from an
+``internal`` location mapped at ``MEDIA_ACCEL_REDIRECT_PREFIX``; with
+``"x-sendfile"`` Apache (mod_xsendfile) or lighttpd streams the absolute
+path. Either way Django only checks access and answers 304s.
+
+URLs handed out by the API are signed with an HMAC of the file name and an
+expiry time, so a download needs neither authentication nor a database hit.
+"""
+import mimetypes
+import os
+import re
+import time
+from urllib.parse import quote, urlencode
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils.crypto import constant_time_compare, salted_hmac
+from django.utils.encoding import filepath_to_uri
+from django.utils.http import http_date, parse_etags, parse_http_date_safe
+
+SENDFILE_X_ACCEL = "x-accel-redirect"
+SENDFILE_X_SENDFILE = "x-sendfile"
+READ_SIZE = 64 * 1024
+
+EXPIRES_PARAM = "expires"
+SIGNATURE_PARAM = "signature"
+SIGNATURE_SALT = "core.media.signed-url"
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+_SHA256_NAME = re.compile(r"^[0-9a-f]{64}$")
+
+
+def _signature(name: str, expires: int) -> str:
+    return salted_hmac(SIGNATURE_SALT, f"{name}:{expires}", algorithm="sha256").hexdigest()[:32]
+
+
+def sign_media(name: str, now: float | None = None) -> tuple[int, str]:
+    """
+    ``(expires, signature)`` for ``name``. The expiry is rounded up to a
+    multiple of ``MEDIA_SIGNED_URL_TTL``, so a file keeps the same URL (and
+    browser cache entry) for a while; each URL is valid for one to two TTLs.
+    """
+    expires = signing_window_start(signing_window(now) + 2)
+    return expires, _signature(name, expires)
+
+
+def signing_window(now: float | None = None) -> int:
+    """Number of the ``MEDIA_SIGNED_URL_TTL`` period sign_media() is in."""
+    return int(time.time() if now is None else now) // settings.MEDIA_SIGNED_URL_TTL
+
+
+def signing_window_start(window: int) -> int:
+    """Unix time at which signed URLs of ``window`` start being handed out."""
+    return window * settings.MEDIA_SIGNED_URL_TTL
+
+
+def verify_media_signature(name: str, expires, signature) -> bool:
+    try:
+        expires = int(expires)
+    except (TypeError, ValueError):
+        return False
+    if expires < time.time() or not isinstance(signature, str):
+        return False
+    return constant_time_compare(signature, _signature(name, expires))
+
+
+def media_url(file, request=None) -> str | None:
+    """
+    Signed URL of a FieldFile, or of a name in the default storage, absolute
+    when ``request`` is given.
+    """
+    if not file:
+        return None
+    if isinstance(file, str):
+        name, url = file, default_storage.url(file)
+    else:
+        name, url = file.name, file.url
+    expires, signature = sign_media(name)
+    url = f"{url}?{urlencode({EXPIRES_PARAM: expires, SIGNATURE_PARAM: signature})}"
+    return request.build_absolute_uri(url) if request else url
+
+
+def media_urls(request=None):
+    """
+    ``media_url`` for the many files of one response. With the file system
+    storage the base URL is resolved, and made absolute, once instead of for
+    every file.
+    """
+    if not isinstance(default_storage, FileSystemStorage):
+        return lambda file: media_url(file, request)
+    base_url = default_storage.base_url
+    if request is not None:
+        base_url = request.build_absolute_uri(base_url)
+    now = time.time()
+
+    def build(file) -> str | None:
+        if not file:
+            return None
+        name = file if isinstance(file, str) else file.name
+        expires, signature = sign_media(name, now)
+        query = urlencode({EXPIRES_PARAM: expires, SIGNATURE_PARAM: signature})
+        return f"{base_url}{filepath_to_uri(name).lstrip('/')}?{query}"
+
+    return build
+
+
+def file_etag(name: str, stat: os.stat_result) -> str:
+    """Strong ETag: the content hash for blobs, else mtime and size."""
+    stem = os.path.splitext(os.path.basename(name))[0]
+    if _SHA256_NAME.match(stem):
+        return f'"{stem}"'
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def _not_modified(request, etag: str, last_modified: int) -> bool:
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    if if_none_match:
+        etags = parse_etags(if_none_match)
+        return "*" in etags or etag in etags or etag in [tag.removeprefix("W/") for tag in etags]
+    since = parse_http_date_safe(request.META.get("HTTP_IF_MODIFIED_SINCE", ""))
+    return since is not None and last_modified <= since
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """
+    ``(start, end)`` inclusive for a single ``bytes=`` range, ``None`` when
+    the header should be ignored. Raises ValueError when unsatisfiable.
+    """
+    match = _RANGE.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        # Malformed and multi-range requests get the whole file.
+        return None
+    first, last = match.groups()
+    if not first:
+        length = int(last)
+        if not length or not size:
+            raise ValueError
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError
+    return start, end
+
+
+def _if_range_matches(request, etag: str, last_modified: int) -> bool:
+    if_range = request.META.get("HTTP_IF_RANGE")
+    if not if_range:
+        return True
+    if if_range.startswith('"'):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def _read_range(path: str, start: int, length: int):
+    with open(path, "rb") as source:
+        source.seek(start)
+        while length > 0:
+            block = source.read(min(READ_SIZE, length))
+            if not block:
+                break
+            length -= len(block)
+            yield block
+
+
+def _offload(path: str, name: str) -> HttpResponse | None:
+    mode = settings.MEDIA_SENDFILE
+    if mode == SENDFILE_X_ACCEL:
+        response = HttpResponse()
+        response["X-Accel-Redirect"] = settings.MEDIA_ACCEL_REDIRECT_PREFIX.rstrip("/") + "/" + quote(name)
+        return response
+    if mode == SENDFILE_X_SENDFILE:
+        response = HttpResponse()
+        response["X-Sendfile"] = path
+        return response
+    return None
+
+
+def media_response(request, name: str, path: str, cache_control: str = "private, no-cache") -> HttpResponse:
+    """Serve the file at ``path`` (stored as ``name``) for a GET or HEAD request."""
+    stat = os.stat(path)
+    etag = file_etag(name, stat)
+    last_modified = int(stat.st_mtime)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": http_date(last_modified),
+        "Cache-Control": cache_control,
+        "Accept-Ranges": "bytes",
+    }
+
+    if _not_modified(request, etag, last_modified):
+        response = HttpResponseNotModified()
+    elif (response := _offload(path, name)) is not None:
+        # The web server answers Range requests itself.
+        del headers["Accept-Ranges"]
+    else:
+        response = _file_response(request, path, stat.st_size, etag, last_modified)
+
+    content_type, encoding = mimetypes.guess_type(name)
+    if response.status_code != 304:
+        response["Content-Type"] = content_type or "application/octet-stream"
+        if encoding:
+            response["Content-Encoding"] = encoding
+        response["Content-Disposition"] = f"inline; filename*=UTF-8''{quote(os.path.basename(name))}"
+    for header, value in headers.items():
+        response[header] = value
+    return response
+
+
+def _file_response(request, path: str, size: int, etag: str, last_modified: int) -> HttpResponse:
+    range_header = request.META.get("HTTP_RANGE")
+    byte_range = None
+    if range_header and _if_range_matches(request, etag, last_modified):
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+    if request.method == "HEAD":
+        response = HttpResponse()
+        response["Content-Length"] = str(size)
+        return response
+    if byte_range is None:
+        return FileResponse(open(path, "rb"))
+
+    start, end = byte_range
+    response = StreamingHttpResponse(_read_range(path, start, end - start + 1), status=206)
+    response["Content-Range"] = f"bytes {start}-{end}/{size}"
+    response["Content-Length"] = str(end - start + 1)
+    return response
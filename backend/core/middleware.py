@@ -0,0 +1,63 @@
+import logging
+from time import perf_counter
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from core.queries import record_queries
+
+logger = logging.getLogger("core.queries")
+
+
+class QueryCountMiddleware:
+    """
+    Report the SQL cost of each request.
+
+    Adds a ``Server-Timing`` header (shown in the browser's network panel) and
+    logs one ``core.queries`` record per request with the query count, SQL
+    time and duplicated statements. Requests that repeat a statement at least
+    ``QUERY_DUPLICATE_WARNING`` times are logged as warnings, which is how N+1
+    loops show up. Enabled by ``QUERY_INSTRUMENTATION``.
+    """
+
+    def __init__(self, get_response):
+        if not settings.QUERY_INSTRUMENTATION:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = perf_counter()
+        with record_queries() as stats:
+            response = self.get_response(request)
+        total_ms = (perf_counter() - started) * 1000
+
+        duplicates = stats.duplicates
+        response["Server-Timing"] = ", ".join(
+            [
+                f'db;dur={stats.duration_ms:.1f};desc="{stats.count} queries"',
+                f'dup;desc="{sum(duplicates.values()) - len(duplicates)} duplicate queries"',
+                f"total;dur={total_ms:.1f}",
+            ]
+        )
+
+        worst = max(duplicates.values(), default=0)
+        level = logging.WARNING if worst >= settings.QUERY_DUPLICATE_WARNING else logging.INFO
+        logger.log(
+            level,
+            "%s %s: %d queries, %.1f ms SQL, %.1f ms total",
+            request.method,
+            request.path,
+            stats.count,
+            stats.duration_ms,
+            total_ms,
+            extra={
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "query_count": stats.count,
+                "sql_ms": round(stats.duration_ms, 1),
+                "total_ms": round(total_ms, 1),
+                "duplicate_queries": duplicates,
+            },
+        )
+        return response
@@ -0,0 +1,291 @@
+import base64
+import json
+from datetime import date
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+PAGINATION_QUERY_PARAM = "pagination"
+COUNT_QUERY_PARAM = "count"
+APPROXIMATE_COUNT_HEADER = "X-Approximate-Count"
+
+
+def _ordering_fields(ordering) -> list[tuple[str, bool]]:
+    """Split an ordering into (field, descending) pairs ending with a unique ``id``."""
+    fields = [(field.lstrip("-"), field.startswith("-")) for field in ordering]
+    if not any(field in {"id", "pk"} for field, _ in fields):
+        fields.append(("id", fields[-1][1] if fields else False))
+    return fields
+
+
+def _equal(field: str, value) -> Q:
+    return Q(**{f"{field}__isnull": True}) if value is None else Q(**{field: value})
+
+
+def _after(field: str, lookup: str, value, nullable: bool) -> Q | None:
+    """Rows after ``value`` on one field; NULLs sort after every value."""
+    if not nullable:
+        return Q(**{f"{field}__{lookup}": value})
+    if lookup == "gt":
+        return None if value is None else Q(**{f"{field}__gt": value}) | Q(**{f"{field}__isnull": True})
+    return Q(**{f"{field}__isnull": False}) if value is None else Q(**{f"{field}__lt": value})
+
+
+def keyset_condition(
+    fields: list[tuple[str, bool]], values: list, reverse: bool = False, nullable: frozenset = frozenset()
+) -> Q:
+    """
+    Rows strictly after ``values`` in ``fields`` order (before it when
+    ``reverse``). Fields in ``nullable`` sort NULLs after every value, as
+    ``keyset_ordering()`` orders them.
+    """
+    condition = Q(pk__in=[])
+    for index, (field, descending) in enumerate(fields):
+        lookup = "lt" if descending != reverse else "gt"
+        after = _after(field, lookup, values[index], field in nullable)
+        if after is None:
+            continue
+        equal = Q()
+        for (name, _), value in zip(fields[:index], values):
+            equal &= _equal(name, value)
+        condition |= equal & after
+    return condition
+
+
+def keyset_ordering(fields: list[tuple[str, bool]], reverse: bool = False, nullable: frozenset = frozenset()) -> list:
+    """``order_by()`` arguments matching keyset_condition()."""
+    ordering = []
+    for field, descending in fields:
+        descending = descending != reverse
+        if field in nullable:
+            ordering.append(F(field).desc(nulls_first=True) if descending else F(field).asc(nulls_last=True))
+        else:
+            ordering.append(f"-{field}" if descending else field)
+    return ordering
+
+
+def _resolve_ordering_field(model, name: str):
+    """
+    ``(lookup, model field or None, nullable)`` for ordering by ``name``.
+    Relations compare by their key column, so ``owner`` becomes ``owner_id``;
+    many-valued relations cannot key a cursor and are refused.
+    """
+    parts, opts, field, nullable = name.split("__"), model._meta, None, False
+    for index, part in enumerate(parts):
+        try:
+            field = opts.get_field(part)
+        except FieldDoesNotExist:
+            # An annotation or ``pk``.
+            return name, None, False
+        if field.many_to_many or field.one_to_many or not field.concrete:
+            raise ValidationError({"ordering": f"Kursorli sahifalashda bu maydon bo'yicha saralab bo'lmaydi: {name}"})
+        nullable = nullable or field.null
+        if field.is_relation:
+            if index == len(parts) - 1:
+                parts[index] = field.attname
+            else:
+                opts = field.related_model._meta
+    return "__".join(parts), field, nullable
+
+
+def approximate_count(queryset) -> str:
+    """
+    Cheap row-count estimate for a queryset.
+
+    PostgreSQL returns the planner's row estimate; other backends count at
+    most ``APPROXIMATE_COUNT_LIMIT`` rows and report e.g. ``"1000+"``.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor == "postgresql":
+        sql, params = queryset.order_by().query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return str(int(plan[0]["Plan"]["Plan Rows"]))
+
+    limit = settings.APPROXIMATE_COUNT_LIMIT
+    count = queryset.order_by()[: limit + 1].count()
+    return f"{limit}+" if count > limit else str(count)
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Cursor pagination over the view's full ``ordering`` tuple.
+
+    Unlike DRF's CursorPagination, which keys on the first ordering field and
+    falls back to OFFSET for ties, the cursor stores the values of every
+    ordering field (plus ``id``) so each page is a single index range scan.
+    No COUNT(*) query is issued.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    invalid_cursor_message = "Invalid cursor"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.keys, self.fields, self.model_fields, nullable = [], [], [], set()
+        for name, descending in _ordering_fields(self.get_ordering(request, queryset, view)):
+            lookup, model_field, is_nullable = _resolve_ordering_field(queryset.model, name)
+            self.keys.append(name)
+            self.fields.append((lookup, descending))
+            self.model_fields.append(model_field)
+            if is_nullable:
+                nullable.add(lookup)
+        self.nullable = frozenset(nullable)
+        values, reverse = self.decode_cursor(request)
+
+        queryset = queryset.order_by(*keyset_ordering(self.fields, reverse, self.nullable))
+        if values is not None:
+            queryset = queryset.filter(keyset_condition(self.fields, values, reverse, self.nullable))
+
+        rows = list(queryset[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+
+        self.next_values = self.previous_values = None
+        if rows:
+            if reverse:
+                self.next_values = self._position(rows[-1])
+                self.previous_values = self._position(rows[0]) if has_more else None
+            else:
+                self.next_values = self._position(rows[-1]) if has_more else None
+                self.previous_values = self._position(rows[0]) if values is not None else None
+        return rows
+
+    def get_ordering(self, request, queryset, view):
+        """Honour ``?ordering=`` like DRF's CursorPagination, else the view's ordering."""
+        for backend in getattr(view, "filter_backends", None) or ():
+            if issubclass(backend, OrderingFilter):
+                ordering = backend().get_ordering(request, queryset, view)
+                if ordering:
+                    return ordering
+        return getattr(view, "ordering", None) or queryset.query.order_by or ("-id",)
+
+    def get_page_size(self, request) -> int:
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, api_settings.PAGE_SIZE))
+        except (TypeError, ValueError):
+            page_size = api_settings.PAGE_SIZE
+        return max(1, min(page_size, self.max_page_size))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            values, reverse = payload["p"], bool(payload.get("r"))
+        except (TypeError, ValueError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(self.fields):
+            raise NotFound(self.invalid_cursor_message)
+        return values, reverse
+
+    def encode_cursor(self, values, reverse: bool) -> str:
+        # Full-precision isoformat: truncated microseconds would skip rows.
+        values = [value.isoformat() if isinstance(value, date) else value for value in values]
+        payload = json.dumps({"p": values, "r": int(reverse)}, separators=(",", ":"))
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, base64.urlsafe_b64encode(payload.encode()).decode())
+
+    def _position(self, obj) -> list:
+        position = []
+        for key, (field, _), model_field in zip(self.keys, self.fields, self.model_fields):
+            if isinstance(obj, dict):
+                # A values() row, keyed by field name (foreign keys hold the id).
+                value = obj[key] if key in obj else obj[field]
+            else:
+                value = obj
+                for attr in field.split("__"):
+                    value = None if value is None else getattr(value, attr)
+            if model_field is not None and value is not None:
+                # Column values, e.g. a FieldFile's name.
+                value = model_field.get_prep_value(value)
+            position.append(value)
+        return position
+
+    def get_next_link(self):
+        if self.next_values is None:
+            return None
+        return self.encode_cursor(self.next_values, reverse=False)
+
+    def get_previous_link(self):
+        if self.previous_values is None:
+            return None
+        return self.encode_cursor(self.previous_values, reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+class CursorPaginationOptInMixin:
+    """
+    Let list endpoints switch to KeysetCursorPagination.
+
+    ``?pagination=cursor`` (or ``CURSOR_PAGINATION_DEFAULT = True``) selects the
+    cursor mode, ``?pagination=page`` forces the regular page-number mode.
+    ``?count=approximate`` adds an approximate total as a response header,
+    which is the only count the cursor mode reports.
+    """
+
+    cursor_pagination_class = KeysetCursorPagination
+
+    def use_cursor_pagination(self) -> bool:
+        mode = self.request.query_params.get(PAGINATION_QUERY_PARAM)
+        if mode == "cursor":
+            return True
+        if mode == "page":
+            return False
+        return settings.CURSOR_PAGINATION_DEFAULT
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            if self.use_cursor_pagination():
+                self._paginator = self.cursor_pagination_class()
+            else:
+                self._paginator = super().paginator
+        return self._paginator
+
+    def paginate_queryset(self, queryset):
+        if self.request.query_params.get(COUNT_QUERY_PARAM) == "approximate":
+            self._approximate_count = approximate_count(queryset)
+        return super().paginate_queryset(queryset)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if getattr(self, "_approximate_count", None) is not None:
+            response[APPROXIMATE_COUNT_HEADER] = self._approximate_count
+        return response
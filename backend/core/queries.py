@@ -0,0 +1,78 @@
+import re
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from time import perf_counter
+
+from django.db import connections
+
+_IN_LIST = re.compile(r"IN \((?:%s, )*%s\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fingerprint(sql: str) -> str:
+    """SQL with parameter lists collapsed, so N+1 lookups share one fingerprint."""
+    return _WHITESPACE.sub(" ", _IN_LIST.sub("IN (...)", sql)).strip()
+
+
+class QueryStats:
+    """Query count, SQL time and repeated statements recorded by ``record_queries``."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.fingerprints: Counter[str] = Counter()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += perf_counter() - started
+            self.count += 1
+            self.fingerprints[fingerprint(sql)] += 1
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration * 1000
+
+    @property
+    def duplicates(self) -> dict[str, int]:
+        """Statements executed more than once, most repeated first."""
+        return {sql: count for sql, count in self.fingerprints.most_common() if count > 1}
+
+    def summary(self) -> str:
+        lines = [f"{self.count} queries in {self.duration_ms:.1f} ms"]
+        lines += [f"  {count}x {sql}" for sql, count in self.duplicates.items()]
+        return "\n".join(lines)
+
+
+@contextmanager
+def record_queries():
+    """
+    Record every query run on any database connection inside the block.
+    Works with DEBUG off, unlike ``connection.queries``.
+    """
+    stats = QueryStats()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(stats))
+        yield stats
+
+
+@contextmanager
+def query_budget(max_queries: int, max_duplicates: int | None = None):
+    """
+    Fail with AssertionError when the block runs more than ``max_queries``
+    queries, or repeats one statement more than ``max_duplicates`` times.
+
+    Usage in tests::
+
+        with query_budget(6):
+            self.client.get("/api/methodical/")
+    """
+    with record_queries() as stats:
+        yield stats
+    if stats.count > max_queries:
+        raise AssertionError(f"Query budget of {max_queries} exceeded: {stats.summary()}")
+    if max_duplicates is not None and any(count > max_duplicates for count in stats.duplicates.values()):
+        raise AssertionError(f"Statement repeated more than {max_duplicates} times: {stats.summary()}")
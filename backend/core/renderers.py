@@ -0,0 +1,40 @@
+"""
+JSON rendering with orjson when it is installed.
+
+``FastJSONRenderer`` produces the same documents as DRF's JSONRenderer for
+compact output. Indented output (the browsable API, ``; indent=``) and
+installs without orjson use DRF's renderer.
+"""
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Dates, decimals, lazy strings etc. go through DRF's encoder so their
+        # format matches JSONRenderer.
+        encoder = self.encoder_class()
+        try:
+            ret = orjson.dumps(
+                data,
+                default=encoder.default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+            )
+        except (TypeError, orjson.JSONEncodeError):
+            # e.g. floats out of range, which orjson refuses.
+            return super().render(data, accepted_media_type, renderer_context)
+        # Same escaping as JSONRenderer, so the output is a strict JavaScript subset.
+        return ret.replace("\u2028".encode(), b"\\u2028").replace("\u2029".encode(), b"\\u2029")
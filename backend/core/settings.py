@@ -29,9 +29,11 @@ INSTALLED_APPS = [
     "works.apps.WorksConfig",
     "files.apps.FilesConfig",
     "stats",
+    "tasks",
 ]
 
 MIDDLEWARE = [
+    "core.middleware.QueryCountMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
@@ -82,6 +84,22 @@ def get_database_config():
 DATABASES = {"default": get_database_config()}
 
 
+# Cache
+# The stats cache invalidates entries through generation counters bumped by
+# whichever process writes works (web workers, run_tasks, rebuild_stats), so
+# production needs a backend shared between processes: RedisCache, or
+# DatabaseCache after `manage.py createcachetable`. The per-process locmem
+# default is only right for development and tests (see check stats.W001).
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("DJANGO_CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("DJANGO_CACHE_LOCATION", ""),
+    }
+}
+STATS_CACHE_ALIAS = "default"
+STATS_CACHE_TIMEOUT = int(os.getenv("STATS_CACHE_TIMEOUT_SECONDS", "3600"))
+
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -112,6 +130,24 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
+# Served without a permission check (still through /media/).
+MEDIA_PUBLIC_PREFIXES = ()
+# Lifetime in seconds of the signed media URLs returned by the API.
+MEDIA_SIGNED_URL_TTL = int(os.getenv("MEDIA_SIGNED_URL_TTL", "3600"))
+# "" streams files from Django; "x-accel-redirect" (nginx) or "x-sendfile"
+# (Apache/lighttpd) hands the transfer to the web server after the access check.
+MEDIA_SENDFILE = os.getenv("MEDIA_SENDFILE", "")
+# nginx `internal` location aliased to MEDIA_ROOT, for X-Accel-Redirect.
+MEDIA_ACCEL_REDIRECT_PREFIX = os.getenv("MEDIA_ACCEL_REDIRECT_PREFIX", "/protected-media/")
+
+# Resumable uploads (/api/uploads/)
+RESUMABLE_UPLOAD_MAX_SIZE = int(os.getenv("RESUMABLE_UPLOAD_MAX_MB", "500")) * 1024 * 1024
+RESUMABLE_UPLOAD_TTL_HOURS = int(os.getenv("RESUMABLE_UPLOAD_TTL_HOURS", "24"))
+
+# Background tasks (manage.py run_tasks). Eager mode runs them in-process
+# after commit, for development without a worker.
+TASKS_EAGER = os.getenv("TASKS_EAGER", "False").lower() == "true"
+TASKS_POLL_INTERVAL = float(os.getenv("TASKS_POLL_INTERVAL", "1"))
 
 
 
@@ -135,6 +171,32 @@ REST_FRAMEWORK = {
 }
 
 
+# Keyset cursor pagination for work and file lists (opt-in per request with ?pagination=cursor)
+CURSOR_PAGINATION_DEFAULT = os.getenv("CURSOR_PAGINATION_DEFAULT", "False").lower() == "true"
+APPROXIMATE_COUNT_LIMIT = 1000
+
+# Work lists from values() rows rendered with orjson (opt-in per request with ?fast=1)
+WORKS_FAST_LIST_DEFAULT = os.getenv("WORKS_FAST_LIST_DEFAULT", "False").lower() == "true"
+
+
+# Per-request SQL instrumentation (Server-Timing header + "core.queries" log)
+QUERY_INSTRUMENTATION = os.getenv("QUERY_INSTRUMENTATION", str(DEBUG)).lower() == "true"
+QUERY_DUPLICATE_WARNING = int(os.getenv("QUERY_DUPLICATE_WARNING", "5"))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        "core.queries": {
+            "handlers": ["console"],
+            "level": os.getenv("QUERY_LOG_LEVEL", "INFO"),
+            "propagate": False,
+        },
+    },
+}
+
+
 SIMPLE_JWT = {
     "AUTH_HEADER_TYPES": ("Bearer",),
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=int(os.getenv("JWT_ACCESS_LIFETIME_MINUTES", "15"))),
@@ -172,6 +234,7 @@ SPECTACULAR_SETTINGS = {
     - `/api/research/` - Research works
     - `/api/certificates/` - Certificates
     - `/api/software-certificates/` - Software certificates
+    - `/api/works/feed/` - All work types in one cursor-paginated feed
     - `/api/files/` - File storage
     - `/api/stats/` - Statistics
     """,
@@ -217,6 +280,7 @@ SPECTACULAR_SETTINGS = {
         {"name": "Research Works", "description": "Research works management"},
         {"name": "Certificates", "description": "Certificate management"},
         {"name": "Software Certificates", "description": "Software certificate management"},
+        {"name": "Works Feed", "description": "Unified feed across all work types"},
         {"name": "Files", "description": "File storage and management"},
         {"name": "Statistics", "description": "Statistics and analytics"},
         {"name": "Departments", "description": "Department information"},
@@ -0,0 +1,105 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from rest_framework.test import APITestCase
+
+from accounts.models import Department, Profile
+from core.queries import query_budget
+from works.models import Certificate, MethodicalWork, ResearchWork, SoftwareCertificate
+
+User = get_user_model()
+
+# Works per kind and co-authors per work: enough that a per-row query
+# would blow every budget below.
+WORKS_PER_KIND = 6
+AUTHORS_PER_WORK = 3
+
+# Queries per request. Work lists are keyed by role, then by ``?fast=``:
+# the serializer path adds the page's prefetch of authors.
+WORK_LIST_BUDGETS = {
+    "ADMIN": {"0": 4, "1": 3},
+    "HOD": {"0": 4, "1": 3},
+    "TEACHER": {"0": 4, "1": 3},
+}
+WORK_DETAIL_BUDGETS = {"ADMIN": 3, "HOD": 3, "TEACHER": 3}
+ENDPOINT_BUDGETS = {
+    # The page, then each kind's rows, authors and author users.
+    "/api/works/feed/": 13,
+    "/api/auth/me/": 3,
+    "/api/users/": 4,
+    # Stats are read from the rollup table.
+    "/api/stats/admin/": 1,
+    "/api/stats/department/": 1,
+    "/api/stats/me/": 1,
+    # Each kind's rows, authors and author users, in one chunk here.
+    "/api/works/export/?output=csv": 12,
+    "/api/works/export/?output=xlsx": 12,
+    "/api/stats/export/?output=csv": 1,
+}
+WORK_URLS = ("/api/methodical/", "/api/research/", "/api/certificates/", "/api/software-certificates/")
+
+
+class QueryBudgetTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        department = Department.objects.create(name="Budget")
+        cls.users = {}
+        for role in Profile.Roles.values:
+            user = User.objects.create_user(f"budget-{role.lower()}", password="pw")
+            user.profile.role = role
+            user.profile.department = department
+            user.profile.save()
+            cls.users[role] = user
+        colleagues = [User.objects.create_user(f"budget-{index}", password="pw").profile for index in range(4)]
+        for colleague in colleagues:
+            colleague.department = department
+            colleague.save()
+
+        teacher = cls.users["TEACHER"].profile
+        common = {"year": "2024-2025", "language": "UZ", "department": department}
+        kinds = (
+            (MethodicalWork, {"type": MethodicalWork.Types.GUIDE}),
+            (ResearchWork, {"type": ResearchWork.Types.LOCAL_ARTICLE}),
+            (Certificate, {"type": Certificate.Types.LOCAL}),
+            (SoftwareCertificate, {"type": SoftwareCertificate.Types.DGU}),
+        )
+        cls.works = {}
+        for model, extra in kinds:
+            for index in range(WORKS_PER_KIND):
+                work = model.objects.create(
+                    title=f"Budget {index}",
+                    owner=colleagues[index % len(colleagues)] if index % 2 else teacher,
+                    is_department_visible=bool(index % 3),
+                    **common,
+                    **extra,
+                )
+                work.authors.set(colleagues[index % 2 : index % 2 + AUTHORS_PER_WORK - 1] + [teacher])
+                cls.works.setdefault(model, []).append(work)
+
+    def setUp(self):
+        caches[settings.STATS_CACHE_ALIAS].clear()
+
+    def get(self, role: str, url: str, budget: int):
+        self.client.force_authenticate(self.users[role])
+        with self.subTest(role=role, url=url), query_budget(budget):
+            response = self.client.get(url)
+            if response.streaming:
+                b"".join(response.streaming_content)
+        self.assertEqual(response.status_code, 200, url)
+        return response
+
+    def test_work_lists(self):
+        for role, budgets in WORK_LIST_BUDGETS.items():
+            for url in WORK_URLS:
+                for fast, budget in budgets.items():
+                    self.get(role, f"{url}?fast={fast}", budget)
+
+    def test_work_details(self):
+        for role, budget in WORK_DETAIL_BUDGETS.items():
+            for url, works in zip(WORK_URLS, self.works.values()):
+                self.get(role, f"{url}{works[0].pk}/", budget)
+
+    def test_endpoints(self):
+        for url, budget in ENDPOINT_BUDGETS.items():
+            role = "TEACHER" if url == "/api/stats/me/" else "HOD" if "department" in url else "ADMIN"
+            self.get(role, url, budget)
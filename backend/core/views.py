@@ -1,6 +1,15 @@
+import os
+
 from django.conf import settings
-from django.http import JsonResponse
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import Http404, HttpResponseForbidden, HttpResponseNotAllowed, JsonResponse
+from django.utils._os import safe_join
 from django.views.decorators.http import require_GET
+from drf_spectacular.utils import extend_schema
+from rest_framework.views import APIView
+
+from core.media import EXPIRES_PARAM, SIGNATURE_PARAM, media_response, verify_media_signature
+from files.access import can_view_media, is_public_media
 
 
 @require_GET
@@ -8,6 +17,56 @@ def health_check(request):
     return JsonResponse({"status": "ok"})
 
 
+def _media_path(path: str) -> tuple[str, str]:
+    """The storage name and absolute path of a /media/ path."""
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+    except SuspiciousFileOperation:
+        raise Http404
+    return os.path.relpath(full_path, os.path.realpath(settings.MEDIA_ROOT)).replace(os.sep, "/"), full_path
+
+
+def _cache_control(name: str) -> str:
+    # Blob names change with their content, so they can be cached for good.
+    return "private, max-age=31536000, immutable" if name.startswith("blobs/") else "private, no-cache"
+
+
+@extend_schema(exclude=True)
+class MediaView(APIView):
+    """
+    Serve uploaded files to the users allowed to see the records referencing
+    them, with Range, ETag and Last-Modified support. Unknown and forbidden
+    files are both 404 so their existence is not revealed.
+    """
+
+    permission_classes = []
+    http_method_names = ["get", "head", "options"]
+
+    def get(self, request, path):
+        name, full_path = _media_path(path)
+        if not is_public_media(name) and not request.user.is_authenticated:
+            self.permission_denied(request)
+        if not os.path.isfile(full_path) or not can_view_media(request, self, name):
+            raise Http404
+        return media_response(request, name, full_path, cache_control=_cache_control(name))
+
+
+_media_view = MediaView.as_view()
+
+
 def serve_media(request, path):
-    from django.views.static import serve
-    return serve(request, path, document_root=settings.MEDIA_ROOT)
+    """
+    Serve signed media URLs (see ``core.media.media_url``) after checking the
+    signature alone, without authentication or queries; anything else goes
+    through ``MediaView``'s per-record access check.
+    """
+    if SIGNATURE_PARAM not in request.GET:
+        return _media_view(request, path=path)
+    if request.method not in ("GET", "HEAD"):
+        return HttpResponseNotAllowed(["GET", "HEAD"])
+    name, full_path = _media_path(path)
+    if name != path or not verify_media_signature(name, request.GET.get(EXPIRES_PARAM), request.GET[SIGNATURE_PARAM]):
+        return HttpResponseForbidden()
+    if not os.path.isfile(full_path):
+        raise Http404
+    return media_response(request, name, full_path, cache_control=_cache_control(name))
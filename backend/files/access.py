@@ -0,0 +1,60 @@
+"""Who may download a media file, by the records that reference it."""
+from django.conf import settings
+from django.db.models import FileField, Q
+
+from accounts.utils import get_user_profile
+from files.models import StoredFile
+from files.permissions import StoredFileAccessPermission
+from works.models import WORK_MODELS
+from works.permissions import WorkAccessPermission
+from works.utils import filter_visible_works
+
+# Partial resumable uploads are never served.
+PRIVATE_PREFIXES = ("uploads/partial/", "blobs/tmp/")
+# Readable by every user with a profile.
+PROFILE_PREFIXES = ("avatars/",)
+
+
+def is_public_media(name: str) -> bool:
+    return name.startswith(tuple(settings.MEDIA_PUBLIC_PREFIXES))
+
+
+def _file_lookup(model, name: str) -> Q | None:
+    lookup = Q()
+    for field in model._meta.fields:
+        if isinstance(field, FileField):
+            lookup |= Q(**{field.name: name})
+    return lookup or None
+
+
+def can_view_media(request, view, name: str) -> bool:
+    """
+    Whether the request's user may read ``name``: a stored file or work
+    referencing it must pass ``StoredFileAccessPermission`` or
+    ``WorkAccessPermission``. A deduplicated blob is readable through any
+    record referencing it.
+    """
+    if name.startswith(PRIVATE_PREFIXES):
+        return False
+    if is_public_media(name):
+        return True
+    profile = get_user_profile(request.user)
+    if not profile:
+        return False
+    if name.startswith(PROFILE_PREFIXES):
+        return True
+
+    permission = StoredFileAccessPermission()
+    for stored in StoredFile.objects.filter(file=name).select_related("owner"):
+        if permission.has_object_permission(request, view, stored):
+            return True
+
+    permission = WorkAccessPermission()
+    for model in WORK_MODELS.values():
+        lookup = _file_lookup(model, name)
+        if lookup is None:
+            continue
+        work = filter_visible_works(model.objects.filter(lookup), profile).first()
+        if work is not None and permission.has_object_permission(request, view, work):
+            return True
+    return False
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from files.models import StoredFile
+from files.models import FileBlob, FileText, StoredFile, UploadSession
 
 
 @admin.register(StoredFile)
@@ -8,3 +8,25 @@ class StoredFileAdmin(admin.ModelAdmin):
     list_display = ("file", "owner", "size", "created_at")
     list_filter = ("owner__department",)
     search_fields = ("file", "owner__user__username")
+
+
+@admin.register(UploadSession)
+class UploadSessionAdmin(admin.ModelAdmin):
+    list_display = ("filename", "owner", "target", "offset", "size", "updated_at")
+    search_fields = ("filename", "owner__user__username")
+
+
+@admin.register(FileBlob)
+class FileBlobAdmin(admin.ModelAdmin):
+    list_display = ("sha256", "name", "size", "ref_count", "created_at")
+    search_fields = ("sha256", "name")
+    readonly_fields = ("sha256", "name", "size", "ref_count", "created_at")
+
+
+@admin.register(FileText)
+class FileTextAdmin(admin.ModelAdmin):
+    list_display = ("name", "unsupported", "extracted_at")
+    list_filter = ("unsupported",)
+    search_fields = ("name",)
+    exclude = ("content",)
+    readonly_fields = ("name", "text", "unsupported", "extracted_at")
@@ -14,3 +14,7 @@ class FilesConfig(AppConfig):
             # Create uploads/files directory
             uploads_dir = media_root / "uploads" / "files"
             uploads_dir.mkdir(parents=True, exist_ok=True)
+
+        from files.signals import connect_signals
+
+        connect_signals()
@@ -0,0 +1,111 @@
+"""
+Plain text of uploaded documents, for full-text search.
+
+DOCX and PPTX files are zip archives of XML parts. The parts are untrusted,
+so they are parsed with ``defusedxml`` (no DTDs, entities or external
+references) and refused when they would inflate past ``MAX_PART_SIZE``;
+PDFs need the optional ``pypdf`` package. Text is capped at ``MAX_CHARS``
+and whitespace is collapsed, which is all search needs.
+"""
+import importlib.util
+import logging
+import os
+import re
+import zipfile
+from typing import IO, Iterator
+
+logger = logging.getLogger(__name__)
+
+MAX_CHARS = 100_000
+# Uncompressed size of one XML part; zip bombs are refused before inflating.
+MAX_PART_SIZE = 64 * 1024 * 1024
+
+WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+DRAWING_NS = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+_SLIDE = re.compile(r"^ppt/slides/slide(\d+)\.xml$")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class ExtractionUnavailable(Exception):
+    """The library needed for this file type is not installed."""
+
+
+class PartTooLarge(ValueError):
+    """An archive part inflates past MAX_PART_SIZE."""
+
+
+def _open_part(archive: zipfile.ZipFile, name: str) -> IO[bytes]:
+    # ZipExtFile stops at the size the entry declares, so checking it bounds the read.
+    info = archive.getinfo(name)
+    if info.file_size > MAX_PART_SIZE:
+        raise PartTooLarge(f"{name} inflates to {info.file_size} bytes")
+    return archive.open(info)
+
+
+def _xml_text(part: IO[bytes], text_tag: str, break_tags: set[str]) -> Iterator[str]:
+    try:
+        from defusedxml.ElementTree import iterparse
+    except ImportError:
+        raise ExtractionUnavailable("defusedxml is not installed")
+    # Office parts never declare a DTD, so any is refused.
+    for _, element in iterparse(part, events=("end",), forbid_dtd=True):
+        if element.tag == text_tag and element.text:
+            yield element.text
+        elif element.tag in break_tags:
+            yield " "
+            # Paragraphs are done with; keep memory flat on large documents.
+            element.clear()
+
+
+def _docx_text(file: IO[bytes]) -> Iterator[str]:
+    with zipfile.ZipFile(file) as archive, _open_part(archive, "word/document.xml") as part:
+        yield from _xml_text(part, f"{WORD_NS}t", {f"{WORD_NS}p", f"{WORD_NS}tab", f"{WORD_NS}br"})
+
+
+def _pptx_text(file: IO[bytes]) -> Iterator[str]:
+    with zipfile.ZipFile(file) as archive:
+        slides = sorted(
+            (int(match.group(1)), name) for name in archive.namelist() if (match := _SLIDE.match(name))
+        )
+        for _, name in slides:
+            with _open_part(archive, name) as part:
+                yield from _xml_text(part, f"{DRAWING_NS}t", {f"{DRAWING_NS}p"})
+
+
+def _pdf_text(file: IO[bytes]) -> Iterator[str]:
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        raise ExtractionUnavailable("pypdf is not installed")
+    for page in PdfReader(file).pages:
+        yield page.extract_text() or ""
+        yield " "
+
+
+EXTRACTORS = {".pdf": _pdf_text, ".docx": _docx_text, ".pptx": _pptx_text}
+# Optional packages the extractors need, by extension.
+REQUIREMENTS = {".pdf": "pypdf", ".docx": "defusedxml", ".pptx": "defusedxml"}
+
+
+def is_extractable(name: str) -> bool:
+    return os.path.splitext(name)[1].lower() in EXTRACTORS
+
+
+def is_supported(name: str) -> bool:
+    """Whether the package the extractor of ``name`` needs is installed."""
+    package = REQUIREMENTS.get(os.path.splitext(name)[1].lower())
+    return package is None or importlib.util.find_spec(package) is not None
+
+
+def extract_text(file: IO[bytes], name: str) -> str:
+    """
+    Text of the document ``file`` (a seekable binary file) named ``name``.
+    Raises ExtractionUnavailable, or the parser's error for a broken file.
+    """
+    pieces, length = [], 0
+    for piece in EXTRACTORS[os.path.splitext(name)[1].lower()](file):
+        pieces.append(piece)
+        length += len(piece)
+        if length > MAX_CHARS:
+            break
+    return _WHITESPACE.sub(" ", "".join(pieces)).strip()[:MAX_CHARS]
@@ -0,0 +1,21 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from files.models import UploadSession
+from files.uploads import discard
+
+
+class Command(BaseCommand):
+    help = "Delete resumable upload sessions idle longer than RESUMABLE_UPLOAD_TTL_HOURS, with their partial files"
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=settings.RESUMABLE_UPLOAD_TTL_HOURS)
+        sessions = UploadSession.objects.filter(updated_at__lt=cutoff)
+        count = 0
+        for session in sessions.iterator():
+            discard(session)
+            count += 1
+        self.stdout.write(self.style.SUCCESS(f"Removed {count} stale upload session(s)"))
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:13
+
+import files.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("files", "0002_upload_session"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FileBlob",
+            fields=[
+                (
+                    "sha256",
+                    models.CharField(max_length=64, primary_key=True, serialize=False),
+                ),
+                ("name", models.CharField(max_length=100, unique=True)),
+                ("size", models.PositiveBigIntegerField()),
+                ("ref_count", models.PositiveIntegerField(default=0)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name="storedfile",
+            name="file",
+            field=models.FileField(
+                storage=files.storage.content_storage, upload_to="uploads/files/"
+            ),
+        ),
+    ]
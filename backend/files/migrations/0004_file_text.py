@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("files", "0003_content_storage"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FileText",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, unique=True)),
+                ("content", models.BinaryField()),
+                ("extracted_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("files", "0004_file_text"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="filetext",
+            name="unsupported",
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -1,10 +1,14 @@
+import uuid
+import zlib
+
 from django.db import models
 
 from accounts.models import Profile
+from files.storage import content_storage
 
 
 class StoredFile(models.Model):
-    file = models.FileField(upload_to="uploads/files/")
+    file = models.FileField(upload_to="uploads/files/", storage=content_storage)
     owner = models.ForeignKey(
         Profile,
         on_delete=models.CASCADE,
@@ -24,3 +28,74 @@ class StoredFile(models.Model):
         if self.file and self.size == 0:
             self.size = self.file.size
             super().save(update_fields=["size"])
+
+
+class FileBlob(models.Model):
+    """One stored copy of a distinct file content; see files.storage."""
+
+    sha256 = models.CharField(max_length=64, primary_key=True)
+    name = models.CharField(max_length=100, unique=True)
+    size = models.PositiveBigIntegerField()
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.ref_count} references)"
+
+
+class FileText(models.Model):
+    """
+    Plain text extracted from a stored document (see files.extract), kept
+    zlib-compressed and keyed by storage name. An empty text means there was
+    nothing to extract, so the file is not tried again. ``unsupported`` marks
+    files whose extractor needs a package that is not installed; they are
+    tried again once it is.
+    """
+
+    name = models.CharField(max_length=100, unique=True)
+    content = models.BinaryField()
+    unsupported = models.BooleanField(default=False)
+    extracted_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return self.name
+
+    @property
+    def text(self) -> str:
+        return zlib.decompress(self.content).decode()
+
+    @text.setter
+    def text(self, value: str) -> None:
+        self.content = zlib.compress(value.encode(), 6)
+
+
+class UploadSession(models.Model):
+    """
+    A resumable upload in progress. Chunks are appended to a partial file in
+    storage; finalizing attaches it to a new StoredFile (``target="file"``) or
+    to the ``field`` of work ``work_id`` of kind ``target``.
+    """
+
+    STORED_FILE_TARGET = "file"
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    owner = models.ForeignKey(
+        Profile,
+        on_delete=models.CASCADE,
+        related_name="upload_sessions",
+    )
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+    target = models.CharField(max_length=32, default=STORED_FILE_TARGET)
+    work_id = models.PositiveBigIntegerField(null=True, blank=True)
+    field = models.CharField(max_length=32, blank=True)
+    sha256 = models.CharField(max_length=64, blank=True, help_text="Checksum expected by the client, if given")
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ("-created_at",)
+
+    def __str__(self) -> str:
+        return f"{self.filename} ({self.offset}/{self.size} bytes)"
@@ -2,11 +2,14 @@ import mimetypes
 import os
 
 from django.conf import settings
+from django.db import transaction
 from rest_framework import serializers
 
 from accounts.serializers import ProfileShortSerializer
 from accounts.utils import get_user_profile
-from files.models import StoredFile
+from core.media import media_url
+from files.models import StoredFile, UploadSession
+from works.models import WORK_MODELS
 
 
 ALLOWED_EXTENSIONS = {".pdf", ".docx", ".pptx", ".png", ".jpg", ".jpeg"}
@@ -19,6 +22,15 @@ ALLOWED_MIME_TYPES = {
 }
 
 
+def validate_upload_name(name: str) -> None:
+    extension = os.path.splitext(name)[1].lower()
+    if extension not in ALLOWED_EXTENSIONS:
+        raise serializers.ValidationError("Yuklanayotgan fayl turi qo'llab-quvvatlanmaydi.")
+    mime, _ = mimetypes.guess_type(name)
+    if mime and mime not in ALLOWED_MIME_TYPES:
+        raise serializers.ValidationError("Yuklanayotgan fayl MIME turi qo'llab-quvvatlanmaydi.")
+
+
 class StoredFileListSerializer(serializers.ModelSerializer):
     owner = ProfileShortSerializer(read_only=True)
     url = serializers.SerializerMethodField()
@@ -29,10 +41,7 @@ class StoredFileListSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
     def get_url(self, obj: StoredFile) -> str:
-        request = self.context.get("request")
-        if request:
-            return request.build_absolute_uri(obj.file.url)
-        return obj.file.url
+        return media_url(obj.file, self.context.get("request"))
 
 
 class StoredFileUploadSerializer(serializers.ModelSerializer):
@@ -42,19 +51,58 @@ class StoredFileUploadSerializer(serializers.ModelSerializer):
         read_only_fields = ("id",)
 
     def validate_file(self, value):
-        extension = os.path.splitext(value.name)[1].lower()
-        if extension not in ALLOWED_EXTENSIONS:
-            raise serializers.ValidationError("Yuklanayotgan fayl turi qo'llab-quvvatlanmaydi.")
-        mime, _ = mimetypes.guess_type(value.name)
-        if mime and mime not in ALLOWED_MIME_TYPES:
-            raise serializers.ValidationError("Yuklanayotgan fayl MIME turi qo'llab-quvvatlanmaydi.")
+        validate_upload_name(value.name)
         return value
 
     def create(self, validated_data):
         request = self.context["request"]
         profile = get_user_profile(request.user)
-        instance = StoredFile.objects.create(owner=profile, **validated_data)
-        instance.size = instance.file.size
-        instance.save(update_fields=["size"])
-        return instance
+        # The blob reference is added in the same transaction as the row.
+        with transaction.atomic():
+            return StoredFile.objects.create(owner=profile, size=validated_data["file"].size, **validated_data)
+
+
+class UploadSessionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = UploadSession
+        fields = ("id", "filename", "size", "offset", "target", "work_id", "field", "sha256", "created_at")
+        read_only_fields = ("id", "offset", "created_at")
+        extra_kwargs = {
+            "target": {"required": False},
+            "work_id": {"required": False},
+            "field": {"required": False},
+            "sha256": {"required": False},
+        }
+
+    def validate_size(self, value):
+        if value < 1 or value > settings.RESUMABLE_UPLOAD_MAX_SIZE:
+            raise serializers.ValidationError(
+                f"Fayl hajmi 1 baytdan {settings.RESUMABLE_UPLOAD_MAX_SIZE} baytgacha bo'lishi kerak."
+            )
+        return value
+
+    def validate_sha256(self, value):
+        value = value.lower()
+        if value and (len(value) != 64 or any(char not in "0123456789abcdef" for char in value)):
+            raise serializers.ValidationError("SHA-256 64 ta hex belgidan iborat bo'lishi kerak.")
+        return value
+
+    def validate(self, attrs):
+        target = attrs.get("target", UploadSession.STORED_FILE_TARGET)
+        if target == UploadSession.STORED_FILE_TARGET:
+            try:
+                validate_upload_name(attrs["filename"])
+            except serializers.ValidationError as exc:
+                raise serializers.ValidationError({"filename": exc.detail})
+            return {**attrs, "work_id": None, "field": "file"}
 
+        model = WORK_MODELS.get(target)
+        if model is None:
+            raise serializers.ValidationError({"target": f"Noma'lum manzil: {target}"})
+        if not attrs.get("work_id"):
+            raise serializers.ValidationError({"work_id": "Majburiy maydon."})
+        file_fields = [field.name for field in model._meta.fields if field.get_internal_type() == "FileField"]
+        field = attrs.get("field") or "file"
+        if field not in file_fields:
+            raise serializers.ValidationError({"field": f"Qo'llab-quvvatlanadigan maydonlar: {', '.join(file_fields)}"})
+        return {**attrs, "field": field}
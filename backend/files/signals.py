@@ -0,0 +1,27 @@
+from django.db.models import FileField
+from django.db.models.signals import post_delete
+
+from files.models import StoredFile
+from files.storage import ContentAddressedStorage
+from files.tasks import delete_later
+from works.models import WORK_MODELS
+
+
+def content_fields(model) -> list[FileField]:
+    """File fields of ``model`` stored in the content-addressed storage."""
+    return [
+        field
+        for field in model._meta.fields
+        if isinstance(field, FileField) and isinstance(field.storage, ContentAddressedStorage)
+    ]
+
+
+def release_files(sender, instance, **kwargs):
+    """Queue dropping the storage references of a deleted row."""
+    for field in content_fields(sender):
+        delete_later(getattr(instance, field.attname))
+
+
+def connect_signals() -> None:
+    for model in (StoredFile, *WORK_MODELS.values()):
+        post_delete.connect(release_files, sender=model, dispatch_uid=f"files_release_{model._meta.label_lower}")
@@ -0,0 +1,117 @@
+"""
+Content-addressed file storage.
+
+Every distinct content is stored once, as ``blobs/<aa>/<sha256><ext>``, and
+a FileBlob row counts the file fields referencing it. Saving a file whose
+content is already stored only adds a reference; deleting a file removes a
+reference, and the blob is removed with the last one.
+
+Names saved before this storage was introduced are not blobs and keep their
+plain FileSystemStorage behaviour.
+
+References are counted in the caller's transaction: save files inside the
+transaction that writes the rows naming them, so a rollback drops the
+reference together with the row.
+"""
+import hashlib
+import os
+import uuid
+
+from django.apps import apps
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+
+BLOB_DIR = "blobs"
+
+
+def _blob_model():
+    return apps.get_model("files", "FileBlob")
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    def blob_name(self, sha256: str, extension: str) -> str:
+        return f"{BLOB_DIR}/{sha256[:2]}/{sha256}{extension.lower()}"
+
+    def is_blob(self, name: str) -> bool:
+        return name.startswith(f"{BLOB_DIR}/")
+
+    def get_available_name(self, name, max_length=None):
+        # _save picks the name from the content, so the requested one is never used.
+        return name
+
+    def _save(self, name, content):
+        os.makedirs(self.path(f"{BLOB_DIR}/tmp"), exist_ok=True)
+        temporary = self.path(f"{BLOB_DIR}/tmp/{uuid.uuid4().hex}")
+        hasher = hashlib.sha256()
+        if hasattr(content, "temporary_file_path"):
+            # Large uploads already sit on disk; hash them in place.
+            with open(content.temporary_file_path(), "rb") as source:
+                for block in iter(lambda: source.read(1024 * 1024), b""):
+                    hasher.update(block)
+            digest = hasher.hexdigest()
+            if self.reference(digest):
+                return self.reference_name(digest)
+            file_move_safe(content.temporary_file_path(), temporary, allow_overwrite=True)
+        else:
+            with open(temporary, "wb") as target:
+                for chunk in content.chunks():
+                    target.write(chunk)
+                    hasher.update(chunk)
+            digest = hasher.hexdigest()
+        return self.adopt(temporary, digest, os.path.splitext(name)[1])
+
+    def adopt(self, path: str, sha256: str, extension: str) -> str:
+        """
+        Take a complete file at ``path`` with a known digest and return its
+        blob name with one new reference. ``path`` is moved or removed.
+        """
+        FileBlob = _blob_model()
+        with transaction.atomic():
+            blob = FileBlob.objects.select_for_update().filter(pk=sha256).first()
+            if blob is not None:
+                os.remove(path)
+                FileBlob.objects.filter(pk=sha256).update(ref_count=F("ref_count") + 1)
+                return blob.name
+
+            name = self.blob_name(sha256, extension)
+            os.makedirs(os.path.dirname(self.path(name)), exist_ok=True)
+            os.replace(path, self.path(name))
+            FileBlob.objects.create(sha256=sha256, name=name, size=os.path.getsize(self.path(name)), ref_count=1)
+            return name
+
+    def reference(self, sha256: str) -> bool:
+        """Add a reference to already stored content without its bytes."""
+        return bool(_blob_model().objects.filter(pk=sha256).update(ref_count=F("ref_count") + 1))
+
+    def reference_name(self, sha256: str) -> str:
+        return _blob_model().objects.values_list("name", flat=True).get(pk=sha256)
+
+    def stored_blob(self, sha256: str):
+        """The FileBlob holding ``sha256``, or None when it is not stored."""
+        return _blob_model().objects.filter(pk=sha256).first()
+
+    def delete(self, name):
+        if not name or not self.is_blob(name):
+            return super().delete(name)
+        FileBlob = _blob_model()
+        with transaction.atomic():
+            blob = FileBlob.objects.select_for_update().filter(name=name).first()
+            if blob is None:
+                return super().delete(name)
+            if blob.ref_count > 1:
+                FileBlob.objects.filter(pk=blob.pk).update(ref_count=F("ref_count") - 1)
+                return
+            # Removed while the row is locked, so a concurrent save of the
+            # same content cannot reuse the blob being deleted.
+            blob.delete()
+            super().delete(name)
+
+
+_content_storage = ContentAddressedStorage()
+
+
+def content_storage() -> ContentAddressedStorage:
+    """Storage callable for FileFields that share deduplicated content."""
+    return _content_storage
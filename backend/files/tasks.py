@@ -0,0 +1,23 @@
+from django.apps import apps
+
+from files.models import FileText
+from tasks.queue import task
+
+
+@task(name="files.delete_file", max_attempts=5)
+def delete_file(model_label: str, field_name: str, name: str) -> None:
+    """Delete ``name`` from the storage of ``model_label.field_name``."""
+    storage = apps.get_model(model_label)._meta.get_field(field_name).storage
+    storage.delete(name)
+    # Deduplicated content stays while other files reference it.
+    if not storage.exists(name):
+        FileText.objects.filter(name=name).delete()
+
+
+def delete_later(file) -> None:
+    """
+    Queue deletion of a FieldFile's current file, e.g. one being replaced.
+    Queued in the current transaction, so a rolled back change keeps it.
+    """
+    if file:
+        delete_file.enqueue(file.field.model._meta.label, file.field.name, file.name)
@@ -1,3 +1,586 @@
-from django.test import TestCase
+import hashlib
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
 
-# Create your tests here.
+from defusedxml import DTDForbidden
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase
+from rest_framework.test import APITestCase
+
+from accounts.models import Department, Profile
+from core.media import media_url, parse_range, sign_media
+from files import extract, uploads
+from files.models import FileBlob, FileText, StoredFile, UploadSession
+from tasks.queue import run_next
+from works.models import MethodicalWork
+from works.search import file_texts
+from works.tasks import extract_file_text
+
+User = get_user_model()
+
+
+class MediaTestCase(APITestCase):
+    """Runs each test against an empty MEDIA_ROOT of its own."""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media_settings = self.settings(MEDIA_ROOT=media_root)
+        media_settings.enable()
+        self.addCleanup(media_settings.disable)
+
+
+def run_tasks() -> None:
+    while run_next("tests"):
+        pass
+
+
+class ResumableUploadTests(MediaTestCase):
+    URL = "/api/uploads/"
+    CONTENT = b"0123456789" * 10
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("uploader", password="pw")
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.user)
+        uploads._hashers.clear()
+
+    def start(self, content: bytes = CONTENT, **extra) -> UploadSession:
+        response = self.client.post(
+            self.URL, {"filename": "notes.pdf", "size": len(content), **extra}, format="json"
+        )
+        self.assertEqual(response.status_code, 201, response.content)
+        return UploadSession.objects.get(pk=response.json()["id"])
+
+    def send(self, session: UploadSession, offset: int, chunk: bytes):
+        return self.client.patch(
+            f"{self.URL}{session.pk}/",
+            chunk,
+            content_type="application/offset+octet-stream",
+            HTTP_UPLOAD_OFFSET=str(offset),
+        )
+
+    def finalize(self, session: UploadSession):
+        return self.client.post(f"{self.URL}{session.pk}/finalize/")
+
+    def assert_stored(self, response, content: bytes = CONTENT):
+        self.assertEqual(response.status_code, 201, response.content)
+        digest = hashlib.sha256(content).hexdigest()
+        self.assertEqual(response.json()["sha256"], digest)
+        stored = StoredFile.objects.get(pk=response.json()["id"])
+        with stored.file.open("rb") as file:
+            self.assertEqual(file.read(), content)
+
+    def test_offset_mismatch(self):
+        session = self.start()
+        self.assertEqual(self.send(session, 0, self.CONTENT[:30]).status_code, 204)
+        for offset in (0, 20, 40):
+            response = self.send(session, offset, self.CONTENT[offset:])
+            self.assertEqual(response.status_code, 409)
+            self.assertEqual(response["Upload-Offset"], "30")
+        session.refresh_from_db()
+        self.assertEqual(session.offset, 30)
+        self.assertEqual(self.finalize(session).status_code, 409)
+
+    def test_resume_after_partial_write(self):
+        session = self.start()
+        self.assertEqual(self.send(session, 0, self.CONTENT[:40])["Upload-Offset"], "40")
+        # A chunk that failed after writing bytes it never recorded.
+        with open(uploads.partial_path(session), "ab") as partial:
+            partial.write(b"garbage")
+
+        response = self.client.get(f"{self.URL}{session.pk}/")
+        self.assertEqual(response["Upload-Offset"], "40")
+        self.assertEqual(self.send(session, 40, self.CONTENT[40:])["Upload-Offset"], str(len(self.CONTENT)))
+        self.assert_stored(self.finalize(session))
+        self.assertFalse(os.path.exists(uploads.partial_path(session)))
+        self.assertFalse(UploadSession.objects.filter(pk=session.pk).exists())
+
+    def test_chunk_past_size_is_rejected(self):
+        session = self.start()
+        self.assertEqual(self.send(session, 0, self.CONTENT + b"!").status_code, 413)
+        session.refresh_from_db()
+        self.assertEqual(session.offset, 0)
+        self.assertEqual(os.path.getsize(uploads.partial_path(session)), 0)
+
+    def test_finalize_verifies_hash(self):
+        session = self.start(sha256=hashlib.sha256(b"other").hexdigest())
+        self.send(session, 0, self.CONTENT)
+        response = self.finalize(session)
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(UploadSession.objects.filter(pk=session.pk).exists())
+        self.assertFalse(os.path.exists(uploads.partial_path(session)))
+        self.assertFalse(StoredFile.objects.exists())
+
+        session = self.start(sha256=hashlib.sha256(self.CONTENT).hexdigest().upper())
+        self.send(session, 0, self.CONTENT)
+        self.assert_stored(self.finalize(session))
+
+    def test_discard_removes_partial_file(self):
+        session = self.start()
+        self.send(session, 0, self.CONTENT[:50])
+        self.assertIn(str(session.pk), uploads._hashers)
+        self.assertEqual(self.client.delete(f"{self.URL}{session.pk}/").status_code, 204)
+        self.assertFalse(UploadSession.objects.filter(pk=session.pk).exists())
+        self.assertFalse(os.path.exists(uploads.partial_path(session)))
+        self.assertNotIn(str(session.pk), uploads._hashers)
+
+    def test_cold_hasher_cache(self):
+        """Chunks and finalize served by processes that never saw the earlier chunks."""
+        session = self.start(sha256=hashlib.sha256(self.CONTENT).hexdigest())
+        for offset in range(0, len(self.CONTENT), 30):
+            uploads._hashers.clear()
+            self.assertEqual(self.send(session, offset, self.CONTENT[offset : offset + 30]).status_code, 204)
+        uploads._hashers.clear()
+        self.assert_stored(self.finalize(session))
+
+    def test_stale_cached_hasher_is_not_reused(self):
+        session = self.start()
+        self.send(session, 0, self.CONTENT[:50])
+        # Another process took the session further; this one's hasher is behind.
+        with open(uploads.partial_path(session), "ab") as partial:
+            partial.write(self.CONTENT[50:])
+        UploadSession.objects.filter(pk=session.pk).update(offset=len(self.CONTENT))
+        self.assert_stored(self.finalize(session))
+
+
+class BlobReferenceTests(MediaTestCase):
+    CONTENT = b"shared content"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.teacher = User.objects.create_user("blob-teacher", password="pw")
+        cls.outsider = User.objects.create_user("blob-outsider", password="pw")
+        for user, name in ((cls.teacher, "Blob"), (cls.outsider, "Blob other")):
+            user.profile.department = Department.objects.create(name=name)
+            user.profile.save()
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.teacher)
+        self.works = [self.work(self.teacher, self.CONTENT) for _ in range(2)]
+
+    def work(self, user, content: bytes | None = None) -> MethodicalWork:
+        work = MethodicalWork.objects.create(
+            title="Blob",
+            type=MethodicalWork.Types.GUIDE,
+            year="2024-2025",
+            language="UZ",
+            owner=user.profile,
+            department=user.profile.department,
+        )
+        if content is not None:
+            work.file.save("work.pdf", ContentFile(content))
+        return work
+
+    def blob(self, content: bytes = CONTENT) -> FileBlob | None:
+        return FileBlob.objects.filter(pk=hashlib.sha256(content).hexdigest()).first()
+
+    def upload(self, work: MethodicalWork, content: bytes, announce: bool = False):
+        """Upload ``content`` into ``work.file``; returns the session and the finalize response."""
+        data = {"filename": "work.pdf", "size": len(content), "target": "methodical", "work_id": work.pk}
+        if announce:
+            data["sha256"] = hashlib.sha256(content).hexdigest()
+        session = UploadSession.objects.get(pk=self.client.post("/api/uploads/", data, format="json").json()["id"])
+        if session.offset == 0:
+            self.client.patch(
+                f"/api/uploads/{session.pk}/",
+                content,
+                content_type="application/offset+octet-stream",
+                HTTP_UPLOAD_OFFSET="0",
+            )
+        return session, self.client.post(f"/api/uploads/{session.pk}/finalize/")
+
+    def test_works_share_one_blob(self):
+        first, second = self.works
+        self.assertEqual(first.file.name, second.file.name)
+        self.assertEqual(FileBlob.objects.count(), 1)
+        self.assertEqual(self.blob().ref_count, 2)
+
+    def test_deleting_a_work_releases_its_reference(self):
+        first, second = self.works
+        name = first.file.name
+        self.assertEqual(self.client.delete(f"/api/methodical/{first.pk}/").status_code, 204)
+        run_tasks()
+        self.assertEqual(self.blob().ref_count, 1)
+        self.assertTrue(second.file.storage.exists(name))
+
+        self.assertEqual(self.client.delete(f"/api/methodical/{second.pk}/").status_code, 204)
+        run_tasks()
+        self.assertIsNone(self.blob())
+        self.assertFalse(second.file.storage.exists(name))
+
+    def test_replacing_a_file_moves_the_reference(self):
+        first, second = self.works
+        _, response = self.upload(first, b"replacement")
+        self.assertEqual(response.status_code, 201, response.content)
+        run_tasks()
+        self.assertEqual(self.blob().ref_count, 1)
+        self.assertEqual(self.blob(b"replacement").ref_count, 1)
+
+        _, response = self.upload(second, b"replacement")
+        self.assertEqual(response.status_code, 201, response.content)
+        run_tasks()
+        self.assertIsNone(self.blob())
+        self.assertEqual(self.blob(b"replacement").ref_count, 2)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.file.name, second.file.name)
+
+    def test_readable_content_is_deduplicated_without_bytes(self):
+        session, response = self.upload(self.work(self.teacher), self.CONTENT, announce=True)
+        self.assertEqual(session.offset, session.size)
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(self.blob().ref_count, 3)
+
+    def test_dedupe_refused_without_read_access(self):
+        self.client.force_authenticate(self.outsider)
+        target = self.work(self.outsider)
+        data = {
+            "filename": "work.pdf",
+            "size": len(self.CONTENT),
+            "target": "methodical",
+            "work_id": target.pk,
+            "sha256": hashlib.sha256(self.CONTENT).hexdigest(),
+        }
+        response = self.client.post("/api/uploads/", data, format="json")
+        self.assertEqual(response.json()["offset"], 0)
+        self.assertEqual(self.client.post(f"/api/uploads/{response.json()['id']}/finalize/").status_code, 409)
+        self.assertEqual(self.blob().ref_count, 2)
+
+        # Sending the bytes still lands on the shared blob.
+        UploadSession.objects.all().delete()
+        _, response = self.upload(target, self.CONTENT, announce=True)
+        self.assertEqual(response.status_code, 201, response.content)
+        self.assertEqual(self.blob().ref_count, 3)
+
+    def test_access_lost_before_finalize(self):
+        target = self.work(self.teacher)
+        data = {"filename": "work.pdf", "size": len(self.CONTENT), "target": "methodical", "work_id": target.pk}
+        data["sha256"] = hashlib.sha256(self.CONTENT).hexdigest()
+        session_id = self.client.post("/api/uploads/", data, format="json").json()["id"]
+        MethodicalWork.objects.filter(pk__in=[work.pk for work in self.works]).update(
+            owner=self.outsider.profile, department=self.outsider.profile.department
+        )
+        response = self.client.post(f"/api/uploads/{session_id}/finalize/")
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(UploadSession.objects.get(pk=session_id).offset, 0)
+        self.assertEqual(self.blob().ref_count, 2)
+
+
+class MediaResponseTests(MediaTestCase):
+    CONTENT = b"0123456789abcdef"
+
+    @classmethod
+    def setUpTestData(cls):
+        department = Department.objects.create(name="Media")
+        cls.users = {}
+        for name, role, user_department in (
+            ("owner", Profile.Roles.TEACHER, department),
+            ("colleague", Profile.Roles.TEACHER, department),
+            ("head", Profile.Roles.HOD, department),
+            ("other-head", Profile.Roles.HOD, Department.objects.create(name="Media other")),
+        ):
+            user = User.objects.create_user(f"media-{name}", password="pw")
+            user.profile.role = role
+            user.profile.department = user_department
+            user.profile.save()
+            cls.users[name] = user
+
+    def setUp(self):
+        super().setUp()
+        stored = StoredFile(owner=self.users["owner"].profile)
+        stored.file.save("notes.txt", ContentFile(self.CONTENT))
+        self.url = f"/media/{stored.file.name}"
+        self.client.force_authenticate(self.users["owner"])
+
+    def get(self, **headers):
+        response = self.client.get(self.url, headers=headers)
+        body = b"".join(response.streaming_content) if response.streaming else response.content
+        return response, body
+
+    def test_parse_range(self):
+        cases = {
+            "bytes=0-4": (0, 4),
+            "bytes=10-": (10, 15),
+            "bytes=4-100": (4, 15),
+            "bytes=-4": (12, 15),
+            "bytes=-100": (0, 15),
+            # Multi-range and malformed headers are ignored.
+            "bytes=0-1,4-5": None,
+            "bytes=-": None,
+            "items=0-4": None,
+        }
+        for header, expected in cases.items():
+            with self.subTest(header=header):
+                self.assertEqual(parse_range(header, 16), expected)
+        for header, size in (("bytes=16-", 16), ("bytes=5-2", 16), ("bytes=-0", 16), ("bytes=-1", 0)):
+            with self.subTest(header=header, size=size), self.assertRaises(ValueError):
+                parse_range(header, size)
+
+    def test_ranges(self):
+        response, body = self.get(range="bytes=-4")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], "bytes 12-15/16")
+        self.assertEqual(body, b"cdef")
+
+        response, body = self.get(range="bytes=2-5")
+        self.assertEqual((response.status_code, body), (206, b"2345"))
+
+        response, body = self.get(range="bytes=0-1,4-5")
+        self.assertEqual((response.status_code, body), (200, self.CONTENT))
+
+        response, _ = self.get(range="bytes=16-")
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], "bytes */16")
+
+    def test_if_range(self):
+        etag = self.get()[0]["ETag"]
+        response, body = self.get(range="bytes=0-1", if_range=etag)
+        self.assertEqual((response.status_code, body), (206, b"01"))
+        response, body = self.get(range="bytes=0-1", if_range='"stale"')
+        self.assertEqual((response.status_code, body), (200, self.CONTENT))
+
+    def test_not_modified(self):
+        response, body = self.get()
+        self.assertEqual(body, self.CONTENT)
+        etag = response["ETag"]
+        self.assertEqual(etag, f'"{hashlib.sha256(self.CONTENT).hexdigest()}"')
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+
+        for if_none_match in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+            with self.subTest(if_none_match=if_none_match):
+                response, body = self.get(if_none_match=if_none_match)
+                self.assertEqual((response.status_code, body), (304, b""))
+                self.assertEqual(response["ETag"], etag)
+        self.assertEqual(self.get(if_none_match='"other"')[0].status_code, 200)
+        last_modified = response["Last-Modified"]
+        self.assertEqual(self.get(if_modified_since=last_modified)[0].status_code, 304)
+
+    def test_access_by_record(self):
+        for name, expected in (("owner", 200), ("head", 200), ("colleague", 404), ("other-head", 404)):
+            with self.subTest(user=name):
+                self.client.force_authenticate(self.users[name])
+                self.assertEqual(self.get()[0].status_code, expected)
+        self.client.force_authenticate(None)
+        self.assertIn(self.get()[0].status_code, (401, 403))
+
+    def test_access_through_a_work(self):
+        colleague = self.users["colleague"]
+        work = MethodicalWork.objects.create(
+            title="Media",
+            type=MethodicalWork.Types.GUIDE,
+            year="2024-2025",
+            language="UZ",
+            owner=self.users["owner"].profile,
+            department=self.users["owner"].profile.department,
+            is_department_visible=False,
+        )
+        work.file.save("work.txt", ContentFile(b"work content"))
+        self.url = f"/media/{work.file.name}"
+        self.client.force_authenticate(colleague)
+        self.assertEqual(self.get()[0].status_code, 404)
+        work.authors.add(colleague.profile)
+        self.assertEqual(self.get()[1], b"work content")
+
+    def test_partial_uploads_are_private(self):
+        session = UploadSession.objects.create(owner=self.users["owner"].profile, filename="a.txt", size=4)
+        os.makedirs(os.path.dirname(uploads.partial_path(session)))
+        with open(uploads.partial_path(session), "wb") as partial:
+            partial.write(b"part")
+        name = f"{uploads.PARTIAL_DIR}/{session.pk}"
+        # Even a record naming the partial file does not expose it.
+        StoredFile.objects.create(owner=self.users["owner"].profile, file=name, size=4)
+        self.url = f"/media/{name}"
+        self.assertEqual(self.get()[0].status_code, 404)
+
+
+class SignedMediaUrlTests(MediaTestCase):
+    CONTENT = b"signed content"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user("signed-owner", password="pw")
+
+    def setUp(self):
+        super().setUp()
+        self.stored = StoredFile(owner=self.owner.profile)
+        self.stored.file.save("signed.txt", ContentFile(self.CONTENT))
+        self.path = f"/media/{self.stored.file.name}"
+
+    def get(self, path: str, expires, signature):
+        return self.client.get(path, {"expires": expires, "signature": signature})
+
+    def test_signed_url_needs_no_login(self):
+        url = urlsplit(media_url(self.stored.file))
+        self.assertEqual(url.path, self.path)
+        response = self.client.get(f"{url.path}?{url.query}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b"".join(response.streaming_content), self.CONTENT)
+        self.assertEqual(self.client.post(f"{url.path}?{url.query}").status_code, 405)
+
+    def test_api_returns_signed_urls(self):
+        self.client.force_authenticate(self.owner)
+        url = self.client.get("/api/files/").json()["results"][0]["url"]
+        query = parse_qs(urlsplit(url).query)
+        self.client.force_authenticate(None)
+        self.assertEqual(self.get(self.path, query["expires"][0], query["signature"][0]).status_code, 200)
+
+    def test_expired_signature(self):
+        expires, signature = sign_media(self.stored.file.name, now=time.time() - 3 * settings.MEDIA_SIGNED_URL_TTL)
+        self.assertLess(expires, time.time())
+        self.assertEqual(self.get(self.path, expires, signature).status_code, 403)
+
+    def test_tampered_signature(self):
+        expires, signature = sign_media(self.stored.file.name)
+        other = StoredFile(owner=self.owner.profile)
+        other.file.save("other.txt", ContentFile(b"other content"))
+        tampered = (
+            (self.path, expires, signature[:-1] + ("0" if signature[-1] != "0" else "1")),
+            (self.path, expires + settings.MEDIA_SIGNED_URL_TTL, signature),
+            (self.path, "soon", signature),
+            (f"/media/{other.file.name}", expires, signature),
+            (f"/media/blobs/../{self.stored.file.name}", expires, signature),
+        )
+        for path, tampered_expires, tampered_signature in tampered:
+            with self.subTest(path=path, expires=tampered_expires, signature=tampered_signature):
+                self.assertIn(self.get(path, tampered_expires, tampered_signature).status_code, (403, 404))
+        self.assertEqual(self.get(self.path, expires, signature).status_code, 200)
+
+
+WORD = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+DRAWING = "http://schemas.openxmlformats.org/drawingml/2006/main"
+
+
+def office_file(parts: dict[str, str]) -> io.BytesIO:
+    file = io.BytesIO()
+    with zipfile.ZipFile(file, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, xml in parts.items():
+            archive.writestr(name, xml)
+    file.seek(0)
+    return file
+
+
+def docx(body: str, prolog: str = "") -> io.BytesIO:
+    return office_file({"word/document.xml": f'{prolog}<w:document xmlns:w="{WORD}"><w:body>{body}</w:body></w:document>'})
+
+
+def pdf(text: str) -> io.BytesIO:
+    """A one-page PDF showing ``text`` in Helvetica."""
+    stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents 4 0 R"
+        b" /Resources << /Font << /F1 5 0 R >> >> >>",
+        b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    body, offsets = b"%PDF-1.4\n", []
+    for number, content in enumerate(objects, 1):
+        offsets.append(len(body))
+        body += b"%d 0 obj\n%s\nendobj\n" % (number, content)
+    xref = len(body)
+    body += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    body += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    body += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return io.BytesIO(body)
+
+
+class ExtractTextTests(SimpleTestCase):
+    def test_docx(self):
+        file = docx(
+            "<w:p><w:r><w:t>Hello</w:t></w:r><w:r><w:tab/><w:t>world</w:t></w:r></w:p>"
+            "<w:p><w:r><w:t>Second</w:t><w:br/><w:t>line</w:t></w:r></w:p>"
+        )
+        self.assertEqual(extract.extract_text(file, "notes.DOCX"), "Hello world Second line")
+
+    def test_pptx_slides_in_order(self):
+        def slide(text: str) -> str:
+            return f'<p:sld xmlns:p="p" xmlns:a="{DRAWING}"><a:p><a:r><a:t>{text}</a:t></a:r></a:p></p:sld>'
+
+        file = office_file(
+            {
+                "ppt/slides/slide10.xml": slide("ten"),
+                "ppt/slides/slide2.xml": slide("two"),
+                "ppt/slides/slide1.xml": slide("one"),
+                "ppt/slides/_rels/slide1.xml.rels": "<Relationships/>",
+            }
+        )
+        self.assertEqual(extract.extract_text(file, "deck.pptx"), "one two ten")
+
+    def test_pdf(self):
+        self.assertEqual(extract.extract_text(pdf("Hello PDF"), "paper.pdf"), "Hello PDF")
+
+    def test_text_is_capped(self):
+        file = docx("".join(f"<w:p><w:r><w:t>{'x' * 1000}</w:t></w:r></w:p>" for _ in range(10)))
+        with mock.patch.object(extract, "MAX_CHARS", 2500):
+            self.assertEqual(len(extract.extract_text(file, "long.docx")), 2500)
+
+    def test_entities_are_refused(self):
+        prolog = '<!DOCTYPE w:document [<!ENTITY a "aaaaaaaaaa"><!ENTITY b "&a;&a;&a;&a;&a;&a;&a;&a;">]>'
+        with self.assertRaises(DTDForbidden):
+            extract.extract_text(docx("<w:p><w:r><w:t>&b;</w:t></w:r></w:p>", prolog), "bomb.docx")
+        prolog = '<!DOCTYPE w:document SYSTEM "file:///etc/passwd">'
+        with self.assertRaises(DTDForbidden):
+            extract.extract_text(docx("<w:p/>", prolog), "external.docx")
+
+    def test_oversized_part_is_refused(self):
+        file = docx("<w:p><w:r><w:t>" + "0" * 10_000 + "</w:t></w:r></w:p>")
+        with mock.patch.object(extract, "MAX_PART_SIZE", 4096), self.assertRaises(extract.PartTooLarge):
+            extract.extract_text(file, "bomb.docx")
+
+
+class UnsupportedExtractionTests(MediaTestCase):
+    def setUp(self):
+        super().setUp()
+        owner = User.objects.create_user("extract-owner", password="pw").profile
+        self.work = MethodicalWork.objects.create(
+            title="Extract",
+            type=MethodicalWork.Types.GUIDE,
+            year="2024-2025",
+            language="UZ",
+            owner=owner,
+            department=Department.objects.create(name="Extract"),
+        )
+        self.work.file.save("paper.pdf", ContentFile(pdf("Searchable").getvalue()))
+        self.name = self.work.file.name
+        FileText.objects.filter(name=self.name).delete()
+
+    def test_missing_package_marks_file_unsupported(self):
+        with mock.patch.dict(sys.modules, {"pypdf": None}):
+            self.assertFalse(extract.is_supported(self.name))
+            with self.assertLogs("works.tasks", "WARNING"):
+                extract_file_text(self.name)
+            file_text = FileText.objects.get(name=self.name)
+            self.assertTrue(file_text.unsupported)
+            # Skipped, not queued again, while the package is missing.
+            self.assertEqual(file_texts([self.work]), {self.name: ""})
+            self.assertTrue(FileText.objects.filter(name=self.name, unsupported=True).exists())
+
+        # Once it is installed the file is extracted again.
+        self.assertEqual(file_texts([self.work]), {})
+        self.assertFalse(FileText.objects.filter(name=self.name).exists())
+        extract_file_text(self.name)
+        file_text = FileText.objects.get(name=self.name)
+        self.assertFalse(file_text.unsupported)
+        self.assertEqual(file_text.text, "Searchable")
+
+    def test_broken_file_is_stored_empty(self):
+        self.work.file.save("broken.docx", ContentFile(b"not a zip"))
+        with self.assertLogs("works.tasks", "WARNING"):
+            extract_file_text(self.work.file.name)
+        file_text = FileText.objects.get(name=self.work.file.name)
+        self.assertEqual((file_text.unsupported, file_text.text), (False, ""))
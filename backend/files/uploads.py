@@ -0,0 +1,184 @@
+"""
+Resumable uploads: chunks are written straight into a partial file in media
+storage while size and SHA-256 are tracked incrementally, and finalizing
+moves the partial file into place instead of copying it.
+
+When the client announces a SHA-256 and size of content that is already
+stored and that the user can already read, the session starts complete and
+finalizing only adds a storage reference. Anything else must be uploaded:
+knowing a digest does not grant access to the content behind it.
+"""
+import hashlib
+import os
+from collections import OrderedDict
+from collections.abc import Callable
+
+from django.core.files.storage import default_storage
+
+from files.models import StoredFile, UploadSession
+from files.storage import ContentAddressedStorage
+from works.models import WORK_MODELS
+
+PARTIAL_DIR = "uploads/partial"
+READ_SIZE = 1024 * 1024
+MAX_CACHED_HASHERS = 256
+
+# Running SHA-256 per session as (offset, hasher). hashlib state cannot be
+# stored, so a session resumed on another process rehashes its bytes once.
+_hashers: "OrderedDict[str, tuple[int, object]]" = OrderedDict()
+
+
+class OffsetMismatch(Exception):
+    pass
+
+
+class ChunkTooLarge(Exception):
+    pass
+
+
+class ChecksumMismatch(Exception):
+    pass
+
+
+class MissingContent(Exception):
+    """The stored content an instant upload relied on is gone or no longer readable."""
+
+
+def target_field(session: UploadSession):
+    if session.target == UploadSession.STORED_FILE_TARGET:
+        return StoredFile._meta.get_field("file")
+    return WORK_MODELS[session.target]._meta.get_field(session.field)
+
+
+def _readable_blob(session: UploadSession, storage, may_read: Callable[[str], bool]):
+    """The stored blob the session announced, if its size matches and the user may read it."""
+    if not session.sha256 or not isinstance(storage, ContentAddressedStorage):
+        return None
+    blob = storage.stored_blob(session.sha256.lower())
+    if blob is None or blob.size != session.size or not may_read(blob.name):
+        return None
+    return blob
+
+
+def start(session: UploadSession, may_read: Callable[[str], bool]) -> None:
+    """
+    Mark a new session complete when its announced content is already
+    stored with the announced size and ``may_read(name)`` allows the user
+    to read it.
+    """
+    if _readable_blob(session, target_field(session).storage, may_read) is not None:
+        session.offset = session.size
+        session.save(update_fields=["offset", "updated_at"])
+
+
+def partial_path(session: UploadSession) -> str:
+    return default_storage.path(f"{PARTIAL_DIR}/{session.pk}")
+
+
+def _hasher_at(session: UploadSession):
+    cached = _hashers.pop(str(session.pk), None)
+    if cached is not None and cached[0] == session.offset:
+        return cached[1]
+    hasher = hashlib.sha256()
+    remaining = session.offset
+    if remaining:
+        with open(partial_path(session), "rb") as partial:
+            while remaining:
+                block = partial.read(min(READ_SIZE, remaining))
+                if not block:
+                    break
+                hasher.update(block)
+                remaining -= len(block)
+    return hasher
+
+
+def _remember(session: UploadSession, hasher) -> None:
+    _hashers[str(session.pk)] = (session.offset, hasher)
+    while len(_hashers) > MAX_CACHED_HASHERS:
+        _hashers.popitem(last=False)
+
+
+def write_chunk(session: UploadSession, stream, offset: int) -> int:
+    """
+    Append the bytes of ``stream`` at ``offset`` and advance the session.
+
+    ``offset`` must equal the session's offset; bytes a failed earlier chunk
+    left past it are overwritten. Returns the new offset.
+    """
+    if offset != session.offset:
+        raise OffsetMismatch
+    path = partial_path(session)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    hasher = _hasher_at(session)
+
+    remaining = session.size - offset
+    with open(path, "r+b" if os.path.exists(path) else "wb") as partial:
+        partial.seek(offset)
+        partial.truncate()
+        while True:
+            block = stream.read(READ_SIZE) if stream is not None else b""
+            if not block:
+                break
+            if len(block) > remaining:
+                partial.truncate(offset)
+                raise ChunkTooLarge
+            partial.write(block)
+            hasher.update(block)
+            remaining -= len(block)
+            offset += len(block)
+
+    session.offset = offset
+    session.save(update_fields=["offset", "updated_at"])
+    _remember(session, hasher)
+    return offset
+
+
+def finalize(session: UploadSession, instance, field_name: str, may_read: Callable[[str], bool]) -> str:
+    """
+    Move the completed upload into ``instance.<field_name>``'s storage path
+    and return the SHA-256 hex digest. The instance is not saved and the file
+    it replaces is not deleted.
+
+    Call it inside the transaction that saves the instance, so a rollback
+    also drops the storage reference it adds. On ChecksumMismatch the caller
+    discards the session, outside that transaction.
+    """
+    field = instance._meta.get_field(field_name)
+    storage = field.storage
+    path = partial_path(session)
+    extension = os.path.splitext(session.filename)[1]
+
+    if isinstance(storage, ContentAddressedStorage) and session.sha256 and not os.path.exists(path):
+        # Checked again: access or the stored content may have changed since start().
+        blob = _readable_blob(session, storage, may_read)
+        if blob is None or not storage.reference(blob.sha256):
+            raise MissingContent
+        digest, name = blob.sha256, blob.name
+    else:
+        digest = _hasher_at(session).hexdigest()
+        if session.sha256 and session.sha256.lower() != digest:
+            raise ChecksumMismatch
+        if isinstance(storage, ContentAddressedStorage):
+            name = storage.adopt(path, digest, extension)
+        else:
+            name = storage.get_available_name(
+                field.generate_filename(instance, session.filename),
+                max_length=field.max_length,
+            )
+            target = storage.path(name)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(path, target)
+    _hashers.pop(str(session.pk), None)
+
+    setattr(instance, field_name, name)
+    return digest
+
+
+def discard(session: UploadSession) -> None:
+    """Delete the session and its partial file."""
+    _hashers.pop(str(session.pk), None)
+    try:
+        os.remove(partial_path(session))
+    except FileNotFoundError:
+        pass
+    session.delete()
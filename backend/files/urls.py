@@ -1,10 +1,11 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from files.views import StoredFileViewSet
+from files.views import StoredFileViewSet, UploadSessionViewSet
 
 router = DefaultRouter()
 router.register("files", StoredFileViewSet, basename="storedfile")
+router.register("uploads", UploadSessionViewSet, basename="uploadsession")
 
 urlpatterns = [
     path("", include(router.urls)),
@@ -1,14 +1,29 @@
 from django.conf import settings
-from drf_spectacular.utils import extend_schema
+from django.db import transaction
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import mixins, permissions, status, viewsets
-from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
+from rest_framework.generics import get_object_or_404
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
 from rest_framework.response import Response
 
 from accounts.models import Profile
 from accounts.utils import get_user_profile
-from files.models import StoredFile
+from core.media import media_url
+from core.pagination import CursorPaginationOptInMixin
+from files import uploads
+from files.access import can_view_media
+from files.models import StoredFile, UploadSession
 from files.permissions import StoredFileAccessPermission
-from files.serializers import StoredFileListSerializer, StoredFileUploadSerializer
+from files.serializers import StoredFileListSerializer, StoredFileUploadSerializer, UploadSessionSerializer
+from files.tasks import delete_later
+from works.models import WORK_MODELS
+from works.permissions import WorkAccessPermission
+from works.utils import filter_visible_works
+
+UPLOAD_OFFSET_HEADER = "Upload-Offset"
 
 
 @extend_schema(
@@ -16,8 +31,9 @@ from files.serializers import StoredFileListSerializer, StoredFileUploadSerializ
     summary="File storage management",
     description="Upload, list, and delete files. Supports PDF, DOCX, PPTX, PNG, JPG formats.",
 )
-class StoredFileViewSet(mixins.ListModelMixin, mixins.CreateModelMixin, mixins.DestroyModelMixin, viewsets.GenericViewSet):
+class StoredFileViewSet(CursorPaginationOptInMixin, mixins.ListModelMixin, mixins.CreateModelMixin, mixins.DestroyModelMixin, viewsets.GenericViewSet):
     queryset = StoredFile.objects.all().select_related("owner__user", "owner__department")
+    ordering = ("-created_at",)
     permission_classes = [permissions.IsAuthenticated, StoredFileAccessPermission]
     parser_classes = (MultiPartParser, FormParser)
     serializer_class = StoredFileListSerializer
@@ -57,3 +73,147 @@ class StoredFileViewSet(mixins.ListModelMixin, mixins.CreateModelMixin, mixins.D
         )
         headers = self.get_success_headers(read_serializer.data)
         return Response(read_serializer.data, status=status.HTTP_201_CREATED, headers=headers)
+
+
+@extend_schema(
+    tags=["Files"],
+    summary="Resumable uploads",
+    description=(
+        "Upload large files in chunks. POST creates a session for a new stored file "
+        "(`target=file`) or for a work's file field (`target=<kind>`, `work_id`, `field`). "
+        "PATCH appends raw bytes at the `Upload-Offset` header, HEAD/GET report the offset "
+        "to resume from, POST finalize attaches the file and DELETE aborts. A session whose "
+        "`sha256` and `size` match stored content the user can already read starts with "
+        "`offset == size`; finalize it right away without sending the bytes."
+    ),
+)
+class UploadSessionViewSet(
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.DestroyModelMixin,
+    viewsets.GenericViewSet,
+):
+    serializer_class = UploadSessionSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    parser_classes = (JSONParser, FormParser, MultiPartParser)
+
+    def get_queryset(self):
+        profile = get_user_profile(self.request.user)
+        if not profile:
+            return UploadSession.objects.none()
+        return UploadSession.objects.filter(owner=profile)
+
+    def _work_for(self, kind: str, work_id: int):
+        """The work a session writes to, if the user may still change it."""
+        profile = get_user_profile(self.request.user)
+        model = WORK_MODELS[kind]
+        work = filter_visible_works(model.objects.all(), profile).filter(pk=work_id).first()
+        if work is None:
+            raise NotFound("Ish topilmadi.")
+        if not WorkAccessPermission().has_object_permission(self.request, self, work):
+            raise PermissionDenied()
+        return work
+
+    def _may_read(self, name: str) -> bool:
+        return can_view_media(self.request, self, name)
+
+    def perform_create(self, serializer):
+        profile = get_user_profile(self.request.user)
+        if not profile:
+            raise PermissionDenied()
+        data = serializer.validated_data
+        if data.get("target", UploadSession.STORED_FILE_TARGET) != UploadSession.STORED_FILE_TARGET:
+            self._work_for(data["target"], data["work_id"])
+        uploads.start(serializer.save(owner=profile), self._may_read)
+
+    def retrieve(self, request, *args, **kwargs):
+        response = super().retrieve(request, *args, **kwargs)
+        response[UPLOAD_OFFSET_HEADER] = str(response.data["offset"])
+        response["Cache-Control"] = "no-store"
+        return response
+
+    @extend_schema(
+        summary="Upload a chunk",
+        request={"application/offset+octet-stream": OpenApiTypes.BINARY},
+        parameters=[
+            OpenApiParameter(
+                UPLOAD_OFFSET_HEADER,
+                int,
+                location=OpenApiParameter.HEADER,
+                required=True,
+                description="Offset the chunk starts at; must equal the session's current offset.",
+            )
+        ],
+        responses={204: None, 409: OpenApiTypes.OBJECT},
+    )
+    def partial_update(self, request, *args, **kwargs):
+        try:
+            offset = int(request.headers.get(UPLOAD_OFFSET_HEADER, ""))
+        except ValueError:
+            raise ValidationError({UPLOAD_OFFSET_HEADER: "Butun son bo'lishi kerak."})
+
+        with transaction.atomic():
+            session = get_object_or_404(self.get_queryset().select_for_update(), pk=kwargs["pk"])
+            try:
+                offset = uploads.write_chunk(session, request.stream, offset)
+            except uploads.OffsetMismatch:
+                return Response(
+                    {"detail": "Offset mos kelmadi.", "offset": session.offset},
+                    status=status.HTTP_409_CONFLICT,
+                    headers={UPLOAD_OFFSET_HEADER: str(session.offset)},
+                )
+            except uploads.ChunkTooLarge:
+                return Response(
+                    {"detail": "Yuborilgan ma'lumot e'lon qilingan hajmdan katta."},
+                    status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    headers={UPLOAD_OFFSET_HEADER: str(session.offset)},
+                )
+        return Response(status=status.HTTP_204_NO_CONTENT, headers={UPLOAD_OFFSET_HEADER: str(offset)})
+
+    def perform_destroy(self, instance):
+        uploads.discard(instance)
+
+    @extend_schema(summary="Finalize an upload", request=None, responses={201: OpenApiTypes.OBJECT})
+    @action(detail=True, methods=["post"])
+    def finalize(self, request, pk=None):
+        session = self.get_object()
+        if session.offset != session.size:
+            return Response(
+                {"detail": "Yuklash tugallanmagan.", "offset": session.offset},
+                status=status.HTTP_409_CONFLICT,
+                headers={UPLOAD_OFFSET_HEADER: str(session.offset)},
+            )
+
+        if session.target == UploadSession.STORED_FILE_TARGET:
+            instance = StoredFile(owner=session.owner, size=session.size)
+        else:
+            instance = self._work_for(session.target, session.work_id)
+        previous = getattr(instance, session.field)
+        try:
+            # One transaction, so a failed save also drops the blob reference.
+            with transaction.atomic():
+                digest = uploads.finalize(session, instance, session.field, self._may_read)
+                delete_later(previous)
+                if session.target == UploadSession.STORED_FILE_TARGET:
+                    instance.save()
+                else:
+                    instance.save(update_fields=[session.field, "updated_at"])
+                session.delete()
+        except uploads.ChecksumMismatch:
+            uploads.discard(session)
+            return Response({"detail": "SHA-256 mos kelmadi, yuklash bekor qilindi."}, status=400)
+        except uploads.MissingContent:
+            session.offset = 0
+            session.save(update_fields=["offset", "updated_at"])
+            return Response(
+                {"detail": "Fayl qayta yuklanishi kerak.", "offset": 0},
+                status=status.HTTP_409_CONFLICT,
+                headers={UPLOAD_OFFSET_HEADER: "0"},
+            )
+
+        if session.target == UploadSession.STORED_FILE_TARGET:
+            data = StoredFileListSerializer(instance, context=self.get_serializer_context()).data
+        else:
+            url = media_url(getattr(instance, session.field), request)
+            data = {"kind": session.target, "id": instance.pk, "field": session.field, "url": url}
+        return Response({**data, "sha256": digest}, status=status.HTTP_201_CREATED)
@@ -1,3 +1,9 @@
 from django.contrib import admin
 
-# Register your models here.
+from stats.models import WorkStat
+
+
+@admin.register(WorkStat)
+class WorkStatAdmin(admin.ModelAdmin):
+    list_display = ("kind", "department", "profile", "year", "type", "language", "total")
+    list_filter = ("kind", "department", "year")
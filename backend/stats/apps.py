@@ -4,3 +4,9 @@ from django.apps import AppConfig
 class StatsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'stats'
+
+    def ready(self) -> None:  # pragma: no cover
+        from stats import checks  # noqa: F401 (registers the checks)
+        from stats.signals import connect_signals
+
+        connect_signals()
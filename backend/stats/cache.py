@@ -0,0 +1,117 @@
+import time
+from collections import Counter
+from typing import Callable, Iterable
+
+from django.conf import settings
+from django.core.cache import caches
+
+# Scope whose generation is part of every entry; bumping it drops them all.
+ALL = "all"
+GLOBAL = "global"
+DEPARTMENT = "department"
+PROFILE = "profile"
+
+# Per-process hit/miss counters, exposed through cache_counters().
+_counters = Counter()
+
+
+def _cache():
+    return caches[settings.STATS_CACHE_ALIAS]
+
+
+def _generation_key(scope: str, scope_id) -> str:
+    return f"stats:gen:{scope}:{scope_id}"
+
+
+def _entry_key(scope: str, scope_id) -> str:
+    return f"stats:entry:{scope}:{scope_id}"
+
+
+def _new_generation() -> int:
+    # Time-based so a generation evicted from the cache never repeats a
+    # value an older entry may still carry.
+    return time.time_ns()
+
+
+def bump(scope: str, scope_id=None) -> None:
+    """Invalidate every cached stats response of the given scope."""
+    cache = _cache()
+    key = _generation_key(scope, scope_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _new_generation(), timeout=None)
+
+
+def invalidate_all() -> None:
+    bump(ALL)
+
+
+def _current_generation(cache, key: str, found: dict) -> int:
+    generation = found.get(key)
+    if generation is None:
+        generation = _new_generation()
+        if not cache.add(key, generation, timeout=None):
+            generation = cache.get(key, generation)
+    return generation
+
+
+def invalidate_keys(keys: Iterable[tuple]) -> None:
+    """Bump the global, department and profile scopes touched by rollup keys."""
+    departments, profiles = set(), set()
+    for _kind, department_id, profile_id, *_values in keys:
+        departments.add(department_id)
+        if profile_id is not None:
+            profiles.add(profile_id)
+    if not departments:
+        return
+    bump(GLOBAL)
+    for department_id in departments:
+        bump(DEPARTMENT, department_id)
+    for profile_id in profiles:
+        bump(PROFILE, profile_id)
+
+
+def generations(scope: str, scope_id) -> tuple[int, int]:
+    """
+    Current generations a scope's stats are stored under; they change
+    whenever those stats are invalidated, so they make an ETag.
+    """
+    cache = _cache()
+    all_key = _generation_key(ALL, None)
+    scope_key = _generation_key(scope, scope_id)
+    found = cache.get_many([all_key, scope_key])
+    return _current_generation(cache, all_key, found), _current_generation(cache, scope_key, found)
+
+
+def cached_stats(scope: str, scope_id, build: Callable[[], dict]) -> tuple[dict, bool]:
+    """
+    Return ``(stats, hit)`` for a scope, building and storing it on a miss.
+
+    The generation counters and the entry are read in one get_many() call;
+    an entry is only served when it was stored under the current generations.
+    """
+    cache = _cache()
+    all_key = _generation_key(ALL, None)
+    scope_key = _generation_key(scope, scope_id)
+    entry_key = _entry_key(scope, scope_id)
+    found = cache.get_many([all_key, scope_key, entry_key])
+
+    entry = found.get(entry_key)
+    generations = (found.get(all_key), found.get(scope_key))
+    if None not in generations and entry is not None and entry[0] == generations:
+        _counters["hits"] += 1
+        return entry[1], True
+
+    _counters["misses"] += 1
+    generations = (
+        _current_generation(cache, all_key, found),
+        _current_generation(cache, scope_key, found),
+    )
+    stats = build()
+    cache.set(entry_key, (generations, stats), timeout=settings.STATS_CACHE_TIMEOUT)
+    return stats, False
+
+
+def cache_counters() -> dict:
+    return {"hits": _counters["hits"], "misses": _counters["misses"]}
@@ -0,0 +1,33 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+# Backends whose entries live in one process (or nowhere).
+PROCESS_LOCAL_CACHES = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+
+
+@register()
+def check_stats_cache(app_configs, **kwargs):
+    """
+    Stats cache generations are bumped by whichever process writes works
+    (a web worker, ``run_tasks``, ``rebuild_stats``); every process must see
+    the bump, so outside development the cache has to be shared.
+    """
+    if settings.DEBUG:
+        return []
+    backend = settings.CACHES[settings.STATS_CACHE_ALIAS]["BACKEND"]
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [
+        Warning(
+            f"STATS_CACHE_ALIAS uses {backend}, which is not shared between processes.",
+            hint=(
+                "Other workers keep serving stale statistics for up to STATS_CACHE_TIMEOUT. "
+                "Set DJANGO_CACHE_BACKEND to django.core.cache.backends.redis.RedisCache or "
+                "django.core.cache.backends.db.DatabaseCache (after `manage.py createcachetable`)."
+            ),
+            id="stats.W001",
+        )
+    ]
@@ -0,0 +1,71 @@
+"""
+Management command to compare query count and latency of the stats engine
+and the materialized rollup against the legacy per-model aggregation.
+Usage: python manage.py benchmark_stats [--iterations 50]
+"""
+from time import perf_counter
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Count
+from django.test.utils import CaptureQueriesContext
+
+from stats.engine import WORK_MODELS, build_stats
+from stats.rollup import rollup_stats
+
+
+def _legacy_stats() -> dict:
+    """The pre-engine implementation: one count() plus three GROUP BYs per model."""
+
+    def aggregate(qs, field):
+        return list(qs.values(field).annotate(total=Count("id")).order_by(field))
+
+    qs_map = {kind: model.objects.all() for kind, model in WORK_MODELS.items()}
+    return {
+        "totals": {key: qs.count() for key, qs in qs_map.items()},
+        "by_year": {key: aggregate(qs, "year") for key, qs in qs_map.items()},
+        "by_type": {key: aggregate(qs, "type") for key, qs in qs_map.items()},
+        "by_language": {key: aggregate(qs, "language") for key, qs in qs_map.items()},
+    }
+
+
+class Command(BaseCommand):
+    help = "Benchmark the stats engine and rollup against the legacy per-model aggregation"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=50,
+            help="Number of times each implementation is run",
+        )
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+
+        implementations = (
+            ("legacy", _legacy_stats),
+            ("engine", build_stats),
+            ("rollup", lambda: rollup_stats(profile__isnull=True)),
+        )
+        for label, fn in implementations:
+            with CaptureQueriesContext(connection) as ctx:
+                fn()
+            queries = len(ctx.captured_queries)
+
+            started = perf_counter()
+            for _ in range(iterations):
+                fn()
+            elapsed_ms = (perf_counter() - started) * 1000 / iterations
+
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"{label:>8}: {queries} queries, {elapsed_ms:.2f} ms/request"
+                )
+            )
+
+        legacy = _legacy_stats()
+        if legacy != build_stats():
+            self.stdout.write(self.style.WARNING("Engine output differs from legacy output"))
+        if legacy != rollup_stats(profile__isnull=True):
+            self.stdout.write(self.style.WARNING("Rollup output differs from legacy output; run rebuild_stats"))
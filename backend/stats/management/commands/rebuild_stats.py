@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from stats.cache import invalidate_all
+from stats.rollup import rebuild
+
+
+class Command(BaseCommand):
+    help = "Recompute the materialized work statistics rollup from the work tables"
+
+    def handle(self, *args, **options):
+        rows = rebuild()
+        invalidate_all()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt work statistics: {rows} row(s) written"))
@@ -0,0 +1,74 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("accounts", "0004_add_avatar_field"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WorkStat",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("kind", models.CharField(max_length=32)),
+                ("year", models.CharField(max_length=9)),
+                ("type", models.CharField(max_length=32)),
+                ("language", models.CharField(max_length=16)),
+                ("total", models.PositiveIntegerField(default=0)),
+                (
+                    "department",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="work_stats",
+                        to="accounts.department",
+                    ),
+                ),
+                (
+                    "profile",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="work_stats",
+                        to="accounts.profile",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        condition=models.Q(("profile__isnull", True)),
+                        fields=("kind", "department", "year", "type", "language"),
+                        name="unique_department_work_stat",
+                    ),
+                    models.UniqueConstraint(
+                        condition=models.Q(("profile__isnull", False)),
+                        fields=(
+                            "kind",
+                            "department",
+                            "profile",
+                            "year",
+                            "type",
+                            "language",
+                        ),
+                        name="unique_profile_work_stat",
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,57 @@
+from collections import Counter
+
+from django.db import migrations
+from django.db.models import Count, F
+
+# Frozen copy of stats.rollup.rebuild() as of this migration, so later
+# changes to the rollup code cannot break it.
+GROUP_FIELDS = ("department_id", "year", "type", "language")
+WORK_MODELS = {
+    "methodical": "MethodicalWork",
+    "research": "ResearchWork",
+    "certificate": "Certificate",
+    "software_certificate": "SoftwareCertificate",
+}
+
+
+def populate_work_stats(apps, schema_editor):
+    WorkStat = apps.get_model("stats", "WorkStat")
+    rows = []
+    for kind, model_name in WORK_MODELS.items():
+        works = apps.get_model("works", model_name).objects.order_by()
+        for row in works.values(*GROUP_FIELDS).annotate(total=Count("id")):
+            rows.append(WorkStat(kind=kind, profile_id=None, **row))
+
+        participants = Counter()
+        for row in works.values("owner_id", *GROUP_FIELDS).annotate(total=Count("id")):
+            participants[(row["owner_id"], *(row[field] for field in GROUP_FIELDS))] += row["total"]
+
+        # Owners listed among their own authors are already counted above.
+        work_field = model_name.lower()
+        author_fields = [f"{work_field}__{field}" for field in GROUP_FIELDS]
+        through_rows = (
+            works.model.authors.through.objects.exclude(profile_id=F(f"{work_field}__owner_id"))
+            .order_by()
+            .values("profile_id", *author_fields)
+            .annotate(total=Count("id"))
+        )
+        for row in through_rows:
+            participants[(row["profile_id"], *(row[field] for field in author_fields))] += row["total"]
+
+        for (profile_id, *values), total in participants.items():
+            rows.append(WorkStat(kind=kind, profile_id=profile_id, total=total, **dict(zip(GROUP_FIELDS, values))))
+
+    WorkStat.objects.all().delete()
+    WorkStat.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("stats", "0001_initial"),
+        ("works", "0005_alter_certificate_year_alter_methodicalwork_year_and_more"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_work_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations, models
+from django.db.models import F
+
+
+def fill_profile_key(apps, schema_editor):
+    WorkStat = apps.get_model("stats", "WorkStat")
+    WorkStat.objects.filter(profile__isnull=False).update(profile_key=F("profile_id"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("stats", "0002_populate_work_stats"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="workstat",
+            name="profile_key",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_profile_key, migrations.RunPython.noop),
+        migrations.RemoveConstraint(
+            model_name="workstat",
+            name="unique_department_work_stat",
+        ),
+        migrations.RemoveConstraint(
+            model_name="workstat",
+            name="unique_profile_work_stat",
+        ),
+        migrations.AddConstraint(
+            model_name="workstat",
+            constraint=models.UniqueConstraint(
+                fields=("kind", "department", "profile_key", "year", "type", "language"),
+                name="unique_work_stat",
+            ),
+        ),
+    ]
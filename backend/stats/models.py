@@ -1,3 +1,45 @@
 from django.db import models
 
-# Create your models here.
+from accounts.models import Department, Profile
+
+
+class WorkStat(models.Model):
+    """
+    Materialized work counts per (kind, department, profile, year, type, language).
+
+    Rows with an empty ``profile`` count every work of the department once and
+    back the global and department scopes. Rows with a ``profile`` count the
+    works that profile owns or co-authors and back the personal scope.
+    """
+
+    kind = models.CharField(max_length=32)
+    department = models.ForeignKey(
+        Department,
+        on_delete=models.CASCADE,
+        related_name="work_stats",
+    )
+    profile = models.ForeignKey(
+        Profile,
+        on_delete=models.CASCADE,
+        related_name="work_stats",
+        null=True,
+        blank=True,
+    )
+    year = models.CharField(max_length=9)
+    type = models.CharField(max_length=32)
+    language = models.CharField(max_length=16)
+    total = models.PositiveIntegerField(default=0)
+    # ``profile_id``, or 0 on department rows. Unlike the nullable foreign key
+    # it makes one unique key that refreshes can upsert on.
+    profile_key = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=("kind", "department", "profile_key", "year", "type", "language"),
+                name="unique_work_stat",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.kind} {self.year} {self.type} {self.language}: {self.total}"
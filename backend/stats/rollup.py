@@ -0,0 +1,146 @@
+from collections import Counter
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+
+from stats.engine import GROUP_FIELDS, WORK_MODELS, fold_rows
+from stats.models import WorkStat
+
+KIND_BY_MODEL = {model: kind for kind, model in WORK_MODELS.items()}
+
+# (kind, department_id, profile_id, year, type, language); profile_id is None
+# for the department-level row.
+StatKey = tuple
+# WorkStat's unique key, in StatKey order with profile_key for profile_id.
+UNIQUE_FIELDS = ("kind", "department_id", "profile_key", *GROUP_FIELDS)
+
+
+def work_keys(kind: str, work, author_ids: Iterable[int] | None = None) -> set[StatKey]:
+    """
+    Return every rollup row a single work contributes to. Pass ``author_ids``
+    when they are already known to skip the authors query.
+    """
+    values = tuple(getattr(work, field) for field in GROUP_FIELDS)
+    if author_ids is None:
+        author_ids = work.authors.values_list("id", flat=True)
+    participants = {work.owner_id, *author_ids}
+    keys = {(kind, work.department_id, None, *values)}
+    keys.update((kind, work.department_id, profile_id, *values) for profile_id in participants)
+    return keys
+
+
+def _matching(fields, combos) -> Q:
+    """Rows whose ``fields`` equal one of the value tuples in ``combos``."""
+    condition = Q(pk__in=[])
+    for values in combos:
+        condition |= Q(**dict(zip(fields, values)))
+    return condition
+
+
+def _totals(kind: str, model, combos=None, profile_ids=()) -> Counter:
+    """
+    Work counts per rollup key of ``kind``: one grouped query for department
+    rows, one for owners and one for co-authors. ``combos`` of
+    (department_id, year, type, language) and ``profile_ids`` narrow the
+    counts to the keys being refreshed.
+    """
+    fields = ("department_id", *GROUP_FIELDS)
+    work_field = model._meta.model_name
+    author_fields = [f"{work_field}__{field}" for field in fields]
+    works = owners = model.objects.order_by()
+    # Owners listed among their own authors are already counted as owners.
+    authors = model.authors.through.objects.exclude(profile_id=F(f"{work_field}__owner_id")).order_by()
+    if combos is not None:
+        works = works.filter(_matching(fields, combos))
+        owners = works.filter(owner_id__in=profile_ids)
+        authors = authors.filter(_matching(author_fields, combos), profile_id__in=profile_ids)
+
+    def key(profile_id, row, names) -> StatKey:
+        department_id, *values = (row[name] for name in names)
+        return (kind, department_id, profile_id, *values)
+
+    totals = Counter()
+    for row in works.values(*fields).annotate(total=Count("id")):
+        totals[key(None, row, fields)] = row["total"]
+    for row in owners.values("owner_id", *fields).annotate(total=Count("id")):
+        totals[key(row["owner_id"], row, fields)] += row["total"]
+    for row in authors.values("profile_id", *author_fields).annotate(total=Count("id")):
+        totals[key(row["profile_id"], row, author_fields)] += row["total"]
+    return totals
+
+
+def _stat(key: StatKey, total: int) -> WorkStat:
+    kind, department_id, profile_id, *values = key
+    return WorkStat(
+        kind=kind,
+        department_id=department_id,
+        profile_id=profile_id,
+        profile_key=profile_id or 0,
+        total=total,
+        **dict(zip(GROUP_FIELDS, values)),
+    )
+
+
+def refresh_keys(keys: Iterable[StatKey]) -> None:
+    """
+    Recount the given rollup rows from the work tables.
+
+    The number of queries does not grow with the number of keys: three
+    grouped counts per kind, then one upsert of the non-zero totals and one
+    delete of the rows that dropped to zero.
+    """
+    keys = set(keys)
+    if not keys:
+        return
+    totals = Counter()
+    for kind in {key[0] for key in keys}:
+        combos = {(department_id, *values) for key_kind, department_id, _, *values in keys if key_kind == kind}
+        profile_ids = {key[2] for key in keys if key[0] == kind and key[2] is not None}
+        totals.update(_totals(kind, WORK_MODELS[kind], combos, profile_ids))
+
+    counted, emptied = [], []
+    for key in keys:
+        if totals[key]:
+            counted.append(_stat(key, totals[key]))
+        else:
+            kind, department_id, profile_id, *values = key
+            emptied.append((kind, department_id, profile_id or 0, *values))
+    with transaction.atomic():
+        if counted:
+            # Concurrent refreshes of a key both write; the later count wins.
+            WorkStat.objects.bulk_create(
+                counted,
+                update_conflicts=True,
+                unique_fields=UNIQUE_FIELDS,
+                update_fields=["total"],
+            )
+        if emptied:
+            WorkStat.objects.filter(_matching(UNIQUE_FIELDS, emptied)).delete()
+
+
+def rebuild() -> int:
+    """
+    Recompute the whole rollup table from the work tables.
+    Returns the number of rows written.
+    """
+    rows = [
+        _stat(key, total)
+        for kind, model in WORK_MODELS.items()
+        for key, total in _totals(kind, model).items()
+    ]
+    with transaction.atomic():
+        WorkStat.objects.all().delete()
+        WorkStat.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
+
+
+def rollup_stats(**filters) -> dict:
+    """Build the stats response from rollup rows matching ``filters``."""
+    rows = (
+        WorkStat.objects.filter(**filters)
+        .order_by()
+        .values("kind", *GROUP_FIELDS)
+        .annotate(total=Sum("total"))
+    )
+    return fold_rows(rows)
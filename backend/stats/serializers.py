@@ -7,3 +7,7 @@ class StatsResponseSerializer(serializers.Serializer):
     by_type = serializers.DictField()
     by_language = serializers.DictField()
 
+
+class StatsCacheCountersSerializer(serializers.Serializer):
+    hits = serializers.IntegerField()
+    misses = serializers.IntegerField()
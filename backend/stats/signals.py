@@ -0,0 +1,108 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+
+from stats.cache import invalidate_keys
+from stats.rollup import KIND_BY_MODEL, refresh_keys, work_keys
+from works.signals import work_signals_muted
+
+# Rollup rows a work contributed to before the current change; stored on the
+# instance between the pre_* and post_* signals.
+PREVIOUS_KEYS_ATTR = "_stats_previous_keys"
+
+
+def _previous_keys(instance) -> set:
+    return getattr(instance, PREVIOUS_KEYS_ATTR, None) or set()
+
+
+def schedule_refresh(keys: set) -> None:
+    """
+    Refresh rollup rows and invalidate cached stats once the current
+    transaction commits.
+
+    Deferring keeps cascaded deletes (e.g. of a profile) from recreating rows
+    that point at objects removed later in the same transaction.
+    """
+    if not keys:
+        return
+
+    def apply():
+        refresh_keys(keys)
+        invalidate_keys(keys)
+
+    transaction.on_commit(apply)
+
+
+def remember_keys_before_save(sender, instance, raw=False, **kwargs):
+    if raw or work_signals_muted() or instance.pk is None:
+        return
+    previous = sender.objects.filter(pk=instance.pk).first()
+    if previous is not None:
+        setattr(instance, PREVIOUS_KEYS_ATTR, work_keys(KIND_BY_MODEL[sender], previous))
+
+
+def refresh_after_save(sender, instance, raw=False, **kwargs):
+    if raw or work_signals_muted():
+        return
+    keys = _previous_keys(instance) | work_keys(KIND_BY_MODEL[sender], instance)
+    setattr(instance, PREVIOUS_KEYS_ATTR, None)
+    schedule_refresh(keys)
+
+
+def remember_keys_before_delete(sender, instance, **kwargs):
+    if work_signals_muted():
+        return
+    setattr(instance, PREVIOUS_KEYS_ATTR, work_keys(KIND_BY_MODEL[sender], instance))
+
+
+def refresh_after_delete(sender, instance, **kwargs):
+    if work_signals_muted():
+        return
+    schedule_refresh(_previous_keys(instance))
+
+
+def refresh_after_authors_change(sender, instance, action, reverse, model, pk_set, **kwargs):
+    """
+    Keep participant rows current when ``authors`` changes from either side.
+
+    For ``work.authors`` the instance is the work; for ``profile.authored_*``
+    the instance is the profile and ``pk_set`` holds work ids.
+    """
+    if work_signals_muted():
+        return
+    if reverse:
+        kind = KIND_BY_MODEL[model]
+        if action == "pre_clear":
+            works = model.objects.filter(authors=instance)
+        else:
+            works = model.objects.filter(pk__in=pk_set or ())
+    else:
+        kind = KIND_BY_MODEL[type(instance)]
+        works = [instance]
+
+    if action in {"pre_remove", "pre_clear"}:
+        keys = set()
+        for work in works:
+            keys |= work_keys(kind, work)
+        setattr(instance, PREVIOUS_KEYS_ATTR, keys)
+        return
+
+    if action in {"post_add", "post_remove", "post_clear"}:
+        keys = _previous_keys(instance)
+        for work in works:
+            keys |= work_keys(kind, work)
+        setattr(instance, PREVIOUS_KEYS_ATTR, None)
+        schedule_refresh(keys)
+
+
+def connect_signals() -> None:
+    for model in KIND_BY_MODEL:
+        uid = f"stats_rollup_{model._meta.label_lower}"
+        pre_save.connect(remember_keys_before_save, sender=model, dispatch_uid=f"{uid}_pre_save")
+        post_save.connect(refresh_after_save, sender=model, dispatch_uid=f"{uid}_post_save")
+        pre_delete.connect(remember_keys_before_delete, sender=model, dispatch_uid=f"{uid}_pre_delete")
+        post_delete.connect(refresh_after_delete, sender=model, dispatch_uid=f"{uid}_post_delete")
+        m2m_changed.connect(
+            refresh_after_authors_change,
+            sender=model.authors.through,
+            dispatch_uid=f"{uid}_authors",
+        )
@@ -1,3 +1,136 @@
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.db.models import Q
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 
-# Create your tests here.
+from accounts.models import Department
+from stats.engine import build_stats
+from stats.models import WorkStat
+from stats.rollup import rebuild, rollup_stats
+from works.models import Certificate, MethodicalWork, ResearchWork, SoftwareCertificate
+
+User = get_user_model()
+
+
+class RollupRefreshQueryTests(TestCase):
+    def make_work(self, author_count: int) -> MethodicalWork:
+        """A work in a department of its own, so saves of different works touch disjoint rows."""
+        department = Department.objects.create(name=f"Rollup {Department.objects.count()}")
+        profiles = []
+        for _ in range(author_count + 1):
+            profile = User.objects.create_user(f"rollup-{User.objects.count()}", password="pw").profile
+            profile.department = department
+            profile.save()
+            profiles.append(profile)
+        owner, *authors = profiles
+        with self.captureOnCommitCallbacks(execute=True):
+            work = MethodicalWork.objects.create(
+                title="Work",
+                type=MethodicalWork.Types.GUIDE,
+                year="2024-2025",
+                language="UZ",
+                owner=owner,
+                department=department,
+            )
+            work.authors.set(authors)
+        return work
+
+    def save_to_year(self, work: MethodicalWork, year: str) -> None:
+        work.year = year
+        with self.captureOnCommitCallbacks(execute=True):
+            work.save()
+
+    def snapshot(self) -> list:
+        return sorted(
+            WorkStat.objects.values_list("kind", "department_id", "profile_id", "year", "type", "language", "total"),
+            key=repr,
+        )
+
+    def test_refresh_queries_do_not_grow_with_authors(self):
+        single, many = self.make_work(1), self.make_work(15)
+        with CaptureQueriesContext(connection) as single_queries:
+            self.save_to_year(single, "2023-2024")
+        with self.assertNumQueries(len(single_queries.captured_queries)):
+            self.save_to_year(many, "2023-2024")
+
+    def test_refresh_matches_rebuild(self):
+        work = self.make_work(3)
+        self.save_to_year(work, "2023-2024")
+        with self.captureOnCommitCallbacks(execute=True):
+            work.authors.remove(work.authors.first())
+        doomed = self.make_work(15)
+        with self.captureOnCommitCallbacks(execute=True):
+            doomed.delete()
+        refreshed = self.snapshot()
+        rebuild()
+        self.assertEqual(refreshed, self.snapshot())
+
+
+class RollupMatchesEngineTests(TestCase):
+    """rollup_stats() answers every scope the way build_stats() counts the work tables."""
+
+    @classmethod
+    def setUpTestData(cls):
+        departments = [Department.objects.create(name=f"Engine {index}") for index in range(2)]
+        cls.profiles = []
+        for index in range(5):
+            profile = User.objects.create_user(f"engine-{index}", password="pw").profile
+            profile.department = departments[index % 2]
+            profile.save()
+            cls.profiles.append(profile)
+
+        kinds = (
+            (MethodicalWork, (MethodicalWork.Types.GUIDE, MethodicalWork.Types.TEXTBOOK)),
+            (ResearchWork, (ResearchWork.Types.LOCAL_ARTICLE, ResearchWork.Types.FOREIGN_THESIS)),
+            (Certificate, (Certificate.Types.LOCAL, Certificate.Types.INTERNATIONAL)),
+            (SoftwareCertificate, (SoftwareCertificate.Types.DGU, SoftwareCertificate.Types.BGU)),
+        )
+        cls.works = []
+        with cls.captureOnCommitCallbacks(execute=True):
+            for model, types in kinds:
+                for index in range(6):
+                    owner = cls.profiles[index % 5]
+                    work = model.objects.create(
+                        title="Work",
+                        type=types[index % 2],
+                        year=("2023-2024", "2024-2025")[index % 3 == 0],
+                        language=("UZ", "EN")[index % 4 == 0],
+                        owner=owner,
+                        # Works may sit outside their owner's department.
+                        department=departments[index % 3 == 1],
+                    )
+                    # The owner is listed among the authors of some works.
+                    work.authors.set(cls.profiles[index % 3 : index % 3 + 2] + [owner] * (index % 2))
+                    cls.works.append(work)
+
+    def assert_scopes_match(self):
+        self.assertEqual(rollup_stats(profile__isnull=True), build_stats())
+        for department in Department.objects.filter(name__startswith="Engine"):
+            with self.subTest(department=department.name):
+                self.assertEqual(
+                    rollup_stats(profile__isnull=True, department_id=department.id),
+                    build_stats(lambda qs: qs.filter(department=department)),
+                )
+        for profile in self.profiles:
+            with self.subTest(profile=profile.id):
+                self.assertEqual(
+                    rollup_stats(profile=profile),
+                    build_stats(lambda qs: qs.filter(Q(owner=profile) | Q(authors=profile))),
+                )
+
+    def test_scopes_match(self):
+        self.assertTrue(rollup_stats(profile__isnull=True)["totals"]["methodical"])
+        self.assert_scopes_match()
+
+    def test_scopes_match_after_changes(self):
+        first, second, third = self.works[:3]
+        with self.captureOnCommitCallbacks(execute=True):
+            first.year = "2022-2023"
+            first.department = self.profiles[1].department
+            first.save()
+            second.authors.set([self.profiles[4]])
+            third.delete()
+        self.assert_scopes_match()
+        rebuild()
+        self.assert_scopes_match()
@@ -1,10 +1,18 @@
 from django.urls import path
 
-from stats.views import AdminStatsView, DepartmentStatsView, PersonalStatsView
+from stats.views import (
+    AdminStatsView,
+    DepartmentStatsView,
+    PersonalStatsView,
+    StatsCacheView,
+    StatsExportView,
+)
 
 urlpatterns = [
     path("stats/admin/", AdminStatsView.as_view(), name="stats-admin"),
     path("stats/department/", DepartmentStatsView.as_view(), name="stats-department"),
     path("stats/me/", PersonalStatsView.as_view(), name="stats-me"),
+    path("stats/cache/", StatsCacheView.as_view(), name="stats-cache"),
+    path("stats/export/", StatsExportView.as_view(), name="stats-export"),
 ]
 
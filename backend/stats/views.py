@@ -1,50 +1,33 @@
-from typing import Callable, Dict
-
-from django.db.models import Count, QuerySet, Q
-from drf_spectacular.utils import extend_schema
+from django.db.models import Sum
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import permissions
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.generics import GenericAPIView
 from rest_framework.response import Response
 
 from accounts.models import Profile
 from accounts.permissions import IsAdmin, IsHOD, IsTeacher
 from accounts.utils import get_user_profile
-from stats.serializers import StatsResponseSerializer
-from works.models import Certificate, MethodicalWork, ResearchWork, SoftwareCertificate
-
-WorkQueryMap = Dict[str, QuerySet]
-
-
-def _base_queryset_map() -> WorkQueryMap:
-    return {
-        "methodical": MethodicalWork.objects.all(),
-        "research": ResearchWork.objects.all(),
-        "certificate": Certificate.objects.all(),
-        "software_certificate": SoftwareCertificate.objects.all(),
-    }
-
-
-def _aggregate(qs: QuerySet, field: str) -> list[dict]:
-    return list(
-        qs.values(field)
-        .annotate(total=Count("id"))
-        .order_by(field)
-    )
-
+from core.conditional import conditional_response, make_etag
+from core.export import EXPORT_FORMATS, export_format, export_response
+from stats import cache
+from stats.engine import GROUP_FIELDS
+from stats.models import WorkStat
+from stats.rollup import rollup_stats
+from stats.serializers import StatsCacheCountersSerializer, StatsResponseSerializer
 
-def _build_stats(qs_map: WorkQueryMap) -> dict:
-    return {
-        "totals": {key: qs.count() for key, qs in qs_map.items()},
-        "by_year": {key: _aggregate(qs, "year") for key, qs in qs_map.items()},
-        "by_type": {key: _aggregate(qs, "type") for key, qs in qs_map.items()},
-        "by_language": {
-            key: _aggregate(qs, "language") for key, qs in qs_map.items()
-        },
-    }
 
+def _stats_response(request, scope: str, scope_id, **filters):
+    def respond() -> Response:
+        stats, hit = cache.cached_stats(scope, scope_id, lambda: rollup_stats(**filters))
+        response = Response(stats)
+        response["X-Stats-Cache"] = "HIT" if hit else "MISS"
+        return response
 
-def _filtered_map(filter_fn: Callable[[QuerySet], QuerySet]) -> WorkQueryMap:
-    return {key: filter_fn(qs) for key, qs in _base_queryset_map().items()}
+    # The cache generations change whenever the scope's stats may have.
+    etag = make_etag(request, scope, scope_id, *cache.generations(scope, scope_id))
+    return conditional_response(request, etag, respond)
 
 
 @extend_schema(
@@ -58,8 +41,7 @@ class AdminStatsView(GenericAPIView):
     serializer_class = StatsResponseSerializer
 
     def get(self, request):
-        stats = _build_stats(_filtered_map(lambda qs: qs))
-        return Response(stats)
+        return _stats_response(request, cache.GLOBAL, None, profile__isnull=True)
 
 
 @extend_schema(
@@ -77,11 +59,13 @@ class DepartmentStatsView(GenericAPIView):
         if not profile or not profile.department_id:
             return Response({"detail": "Kafedra aniqlanmadi."}, status=400)
 
-        def filter_department(qs: QuerySet) -> QuerySet:
-            return qs.filter(department_id=profile.department_id)
-
-        stats = _build_stats(_filtered_map(filter_department))
-        return Response(stats)
+        return _stats_response(
+            request,
+            cache.DEPARTMENT,
+            profile.department_id,
+            profile__isnull=True,
+            department_id=profile.department_id,
+        )
 
 
 @extend_schema(
@@ -99,10 +83,75 @@ class PersonalStatsView(GenericAPIView):
         if not profile:
             return Response({"detail": "Profil topilmadi."}, status=400)
 
-        def filter_personal(qs: QuerySet) -> QuerySet:
-            return qs.filter(
-                Q(owner=profile) | Q(authors=profile)
-            ).distinct()
+        return _stats_response(request, cache.PROFILE, profile.id, profile=profile)
+
+
+@extend_schema(
+    tags=["Statistics"],
+    summary="Statistics cache counters",
+    description="Get hit/miss counters of the statistics response cache for this server process. Only accessible by administrators.",
+    responses={200: StatsCacheCountersSerializer},
+)
+class StatsCacheView(GenericAPIView):
+    permission_classes = [permissions.IsAuthenticated, IsAdmin]
+    serializer_class = StatsCacheCountersSerializer
+
+    def get(self, request):
+        return Response(cache.cache_counters())
+
+
+# Export scope -> permission of the matching JSON statistics view.
+EXPORT_SCOPES = {"admin": IsAdmin, "department": IsHOD, "me": IsTeacher}
+DEFAULT_EXPORT_SCOPE = {
+    Profile.Roles.ADMIN: "admin",
+    Profile.Roles.HOD: "department",
+    Profile.Roles.TEACHER: "me",
+}
+STATS_EXPORT_HEADER = ("kind", "department", *GROUP_FIELDS, "total")
+
+
+@extend_schema(
+    tags=["Statistics"],
+    summary="Export statistics",
+    description=(
+        "Stream work counts per kind, department, year, type and language as CSV (default) "
+        "or XLSX (`?output=xlsx`). `scope` defaults to the user's role: all works for "
+        "administrators, the department for HODs and the user's own works for teachers."
+    ),
+    parameters=[
+        OpenApiParameter("output", str, enum=list(EXPORT_FORMATS)),
+        OpenApiParameter("scope", str, enum=list(EXPORT_SCOPES)),
+    ],
+    responses={(200, content_type): OpenApiTypes.BINARY for content_type in EXPORT_FORMATS.values()},
+)
+class StatsExportView(GenericAPIView):
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        output = export_format(request)
+        profile = get_user_profile(request.user)
+        if not profile:
+            return Response({"detail": "Profil topilmadi."}, status=400)
 
-        stats = _build_stats(_filtered_map(filter_personal))
-        return Response(stats)
+        scope = request.query_params.get("scope") or DEFAULT_EXPORT_SCOPE.get(profile.role)
+        if scope not in EXPORT_SCOPES:
+            raise ValidationError({"scope": f"Qo'llab-quvvatlanadigan qiymatlar: {', '.join(EXPORT_SCOPES)}"})
+        if not EXPORT_SCOPES[scope]().has_permission(request, self):
+            raise PermissionDenied()
+
+        if scope == "admin":
+            filters = {"profile__isnull": True}
+        elif scope == "department":
+            if not profile.department_id:
+                return Response({"detail": "Kafedra aniqlanmadi."}, status=400)
+            filters = {"profile__isnull": True, "department_id": profile.department_id}
+        else:
+            filters = {"profile": profile}
+
+        rows = (
+            WorkStat.objects.filter(**filters)
+            .order_by("kind", "department__name", *GROUP_FIELDS)
+            .values_list("kind", "department__name", *GROUP_FIELDS)
+            .annotate(total=Sum("total"))
+        )
+        return export_response(output, f"stats_{scope}", STATS_EXPORT_HEADER, rows.iterator(chunk_size=1000))
@@ -0,0 +1,16 @@
+from django.contrib import admin
+from django.utils import timezone
+
+from tasks.models import Task
+
+
+@admin.register(Task)
+class TaskAdmin(admin.ModelAdmin):
+    list_display = ("name", "status", "attempts", "max_attempts", "run_after", "locked_by", "updated_at")
+    list_filter = ("status", "name")
+    search_fields = ("name", "last_error")
+    actions = ["retry"]
+
+    @admin.action(description="Retry selected tasks")
+    def retry(self, request, queryset):
+        queryset.update(status=Task.Status.QUEUED, attempts=0, run_after=timezone.now(), locked_until=None)
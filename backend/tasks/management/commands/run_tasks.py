@@ -0,0 +1,44 @@
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from tasks.queue import run_next, worker_id
+
+
+class Command(BaseCommand):
+    help = "Run queued background tasks until stopped (SIGINT/SIGTERM finish the current task first)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="Exit when no task is due instead of polling")
+        parser.add_argument("--max-tasks", type=int, default=0, help="Exit after running this many tasks")
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=settings.TASKS_POLL_INTERVAL,
+            help="Seconds to wait between polls of an empty queue",
+        )
+
+    def handle(self, *args, **options):
+        worker = worker_id()
+        self.stopping = False
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, self._stop)
+
+        count = 0
+        while not self.stopping:
+            close_old_connections()
+            if run_next(worker):
+                count += 1
+                if options["max_tasks"] and count >= options["max_tasks"]:
+                    break
+            elif options["once"]:
+                break
+            else:
+                time.sleep(options["sleep"])
+        self.stdout.write(self.style.SUCCESS(f"Worker {worker} ran {count} task(s)"))
+
+    def _stop(self, signum, frame):
+        self.stopping = True
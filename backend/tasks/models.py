@@ -0,0 +1,36 @@
+from django.db import models
+
+
+class Task(models.Model):
+    """
+    A queued call of a registered task function (see ``tasks.queue``).
+
+    Workers claim a row by setting ``locked_until``; a row still ``RUNNING``
+    after that time belongs to a worker that died and is claimed again.
+    Successful tasks are deleted, failed ones are kept for inspection.
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = "QUEUED", "Queued"
+        RUNNING = "RUNNING", "Running"
+        FAILED = "FAILED", "Failed"
+
+    name = models.CharField(max_length=128)
+    args = models.JSONField(default=list, blank=True)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=16, choices=Status.choices, default=Status.QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField()
+    locked_until = models.DateTimeField(null=True, blank=True)
+    locked_by = models.CharField(max_length=128, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["run_after", "id"]
+        indexes = [models.Index(fields=("status", "run_after"), name="task_due_idx")]
+
+    def __str__(self) -> str:
+        return f"{self.name} #{self.pk} ({self.status})"
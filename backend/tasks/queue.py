@@ -0,0 +1,171 @@
+"""
+Database-backed task queue.
+
+Functions decorated with ``@task`` in an app's ``tasks.py`` are queued with
+``func.enqueue(*args, **kwargs)``, which inserts a Task row in the current
+transaction: the call is only visible to workers once the data it refers to
+is committed, and is dropped with a rolled back transaction. Arguments must
+be JSON serializable.
+
+``manage.py run_tasks`` workers claim due rows with a conditional update, so
+any number of workers can share the table on every database backend. A
+claimed row is invisible to other workers for the task's ``timeout``;
+failures are retried with exponential backoff up to ``max_attempts``.
+
+With ``TASKS_EAGER`` set, calls run in-process after the transaction commits
+instead, for development without a worker.
+"""
+import logging
+import os
+import socket
+import traceback
+import uuid
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Callable
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from tasks.models import Task
+
+logger = logging.getLogger(__name__)
+
+# Rows considered per claim attempt; other workers may win some of them.
+CLAIM_BATCH = 10
+
+
+@dataclass(frozen=True)
+class TaskDefinition:
+    name: str
+    func: Callable
+    max_attempts: int
+    timeout: int
+    retry_delay: int
+
+
+_registry: dict[str, TaskDefinition] = {}
+
+
+def task(func=None, *, name: str | None = None, max_attempts: int = 3, timeout: int = 300, retry_delay: int = 30):
+    """
+    Register ``func`` as a task and give it an ``enqueue`` method.
+
+    ``timeout`` is the visibility timeout in seconds: a call still running
+    after it is handed to another worker. Retries wait ``retry_delay``
+    seconds, doubled after every failed attempt.
+    """
+
+    def register(func):
+        definition = TaskDefinition(
+            name=name or f"{func.__module__}.{func.__name__}",
+            func=func,
+            max_attempts=max_attempts,
+            timeout=timeout,
+            retry_delay=retry_delay,
+        )
+        _registry[definition.name] = definition
+        func.task_name = definition.name
+        func.enqueue = lambda *args, **kwargs: enqueue(definition.name, args, kwargs)
+        return func
+
+    return register(func) if func is not None else register
+
+
+def get_task(name: str) -> TaskDefinition | None:
+    return _registry.get(name)
+
+
+def enqueue(name: str, args=(), kwargs=None, delay: int = 0) -> Task | None:
+    """Queue a call of the task ``name``; returns None in eager mode."""
+    definition = _registry[name]
+    args, kwargs = list(args), dict(kwargs or {})
+    if settings.TASKS_EAGER:
+        transaction.on_commit(lambda: _run_eagerly(definition, args, kwargs))
+        return None
+    return Task.objects.create(
+        name=name,
+        args=args,
+        kwargs=kwargs,
+        max_attempts=definition.max_attempts,
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def _run_eagerly(definition: TaskDefinition, args: list, kwargs: dict) -> None:
+    try:
+        definition.func(*args, **kwargs)
+    except Exception:
+        logger.exception("Task %s failed", definition.name)
+
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def claim(worker: str) -> Task | None:
+    """Lock the next due task for ``worker``, or return None when none is due."""
+    now = timezone.now()
+    Task.objects.filter(status=Task.Status.RUNNING, locked_until__lt=now, attempts__gte=F("max_attempts")).update(
+        status=Task.Status.FAILED,
+        locked_until=None,
+        last_error="Visibility timeout expired on the last attempt.",
+        updated_at=now,
+    )
+    due = Task.objects.filter(
+        Q(status=Task.Status.QUEUED, run_after__lte=now)
+        # Visibility timeout: the worker running it has died or hung.
+        | Q(status=Task.Status.RUNNING, locked_until__lt=now)
+    ).order_by("run_after", "id")
+    for candidate in due[:CLAIM_BATCH]:
+        definition = _registry.get(candidate.name)
+        timeout = definition.timeout if definition else 0
+        claimed = Task.objects.filter(
+            pk=candidate.pk, status=candidate.status, locked_until=candidate.locked_until
+        ).update(
+            status=Task.Status.RUNNING,
+            locked_until=now + timedelta(seconds=timeout),
+            locked_by=worker,
+            attempts=F("attempts") + 1,
+            updated_at=now,
+        )
+        if claimed:
+            candidate.refresh_from_db()
+            return candidate
+    return None
+
+
+def execute(task_row: Task, worker: str) -> bool:
+    """Run a claimed task and record the outcome. Returns whether it succeeded."""
+    definition = _registry.get(task_row.name)
+    try:
+        if definition is None:
+            raise LookupError(f"Unknown task {task_row.name!r}")
+        definition.func(*task_row.args, **task_row.kwargs)
+    except Exception:
+        error = traceback.format_exc()
+        logger.warning("Task %s #%s failed (attempt %s)", task_row.name, task_row.pk, task_row.attempts, exc_info=True)
+        now = timezone.now()
+        if definition is None or task_row.attempts >= task_row.max_attempts:
+            changes = {"status": Task.Status.FAILED, "run_after": now}
+        else:
+            delay = definition.retry_delay * 2 ** (task_row.attempts - 1)
+            changes = {"status": Task.Status.QUEUED, "run_after": now + timedelta(seconds=delay)}
+        # A worker that overran the visibility timeout no longer owns the row.
+        Task.objects.filter(pk=task_row.pk, locked_by=worker).update(
+            locked_until=None, last_error=error, updated_at=now, **changes
+        )
+        return False
+    Task.objects.filter(pk=task_row.pk, locked_by=worker).delete()
+    return True
+
+
+def run_next(worker: str) -> bool:
+    """Claim and run one due task. Returns False when the queue has none."""
+    task_row = claim(worker)
+    if task_row is None:
+        return False
+    execute(task_row, worker)
+    return True
@@ -0,0 +1,111 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from tasks.models import Task
+from tasks.queue import claim, enqueue, execute, run_next, task
+
+calls = []
+
+
+@task(name="tasks.tests.record", timeout=60)
+def record(value):
+    calls.append(value)
+
+
+@task(name="tasks.tests.fail", max_attempts=3, retry_delay=10)
+def fail():
+    raise RuntimeError("boom")
+
+
+@override_settings(TASKS_EAGER=False)
+class TaskQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def assert_around(self, value, expected, seconds: float = 5):
+        self.assertLess(abs((value - expected).total_seconds()), seconds)
+
+    def expire(self, row: Task, *fields: str) -> None:
+        """Move a row's lock or due time into the past."""
+        Task.objects.filter(pk=row.pk).update(**{field: timezone.now() - timedelta(seconds=1) for field in fields})
+
+    def test_claim(self):
+        first, second = record.enqueue(1), record.enqueue(2)
+        enqueue("tasks.tests.record", [3], delay=60)
+
+        claimed = claim("worker-a")
+        self.assertEqual(claimed.pk, first.pk)
+        self.assertEqual((claimed.status, claimed.locked_by, claimed.attempts), (Task.Status.RUNNING, "worker-a", 1))
+        self.assert_around(claimed.locked_until, timezone.now() + timedelta(seconds=60))
+        self.assertEqual(claim("worker-b").pk, second.pk)
+        # The rest are locked or not due yet.
+        self.assertIsNone(claim("worker-c"))
+
+        self.assertTrue(execute(claimed, "worker-a"))
+        self.assertEqual(calls, [1])
+        self.assertFalse(Task.objects.filter(pk=first.pk).exists())
+
+    def test_visibility_timeout_reclaim(self):
+        row = record.enqueue(1)
+        stale = claim("worker-a")
+        self.assertIsNone(claim("worker-b"))
+
+        self.expire(row, "locked_until")
+        reclaimed = claim("worker-b")
+        self.assertEqual(reclaimed.pk, row.pk)
+        self.assertEqual((reclaimed.locked_by, reclaimed.attempts), ("worker-b", 2))
+
+        # The worker that overran its timeout no longer owns the row.
+        execute(stale, "worker-a")
+        self.assertTrue(Task.objects.filter(pk=row.pk, locked_by="worker-b").exists())
+        self.assertTrue(execute(reclaimed, "worker-b"))
+        self.assertFalse(Task.objects.filter(pk=row.pk).exists())
+
+    def test_retry_backoff(self):
+        row = fail.enqueue()
+        for attempt, delay in ((1, 10), (2, 20)):
+            with self.assertLogs("tasks.queue", "WARNING"):
+                self.assertTrue(run_next("worker"))
+            row.refresh_from_db()
+            self.assertEqual((row.status, row.attempts), (Task.Status.QUEUED, attempt))
+            self.assertIn("RuntimeError: boom", row.last_error)
+            self.assertIsNone(row.locked_until)
+            self.assert_around(row.run_after, timezone.now() + timedelta(seconds=delay))
+            self.assertFalse(run_next("worker"))
+            self.expire(row, "run_after")
+
+        with self.assertLogs("tasks.queue", "WARNING"):
+            self.assertTrue(run_next("worker"))
+        row.refresh_from_db()
+        self.assertEqual((row.status, row.attempts), (Task.Status.FAILED, 3))
+        self.expire(row, "run_after")
+        self.assertFalse(run_next("worker"))
+
+    def test_timeout_on_last_attempt_fails(self):
+        row = enqueue("tasks.tests.record", [1])
+        Task.objects.filter(pk=row.pk).update(max_attempts=1)
+        claim("worker-a")
+        self.expire(row, "locked_until")
+        self.assertIsNone(claim("worker-b"))
+        row.refresh_from_db()
+        self.assertEqual(row.status, Task.Status.FAILED)
+        self.assertIn("Visibility timeout", row.last_error)
+        self.assertEqual(calls, [])
+
+    def test_unknown_task_fails(self):
+        row = Task.objects.create(name="tasks.tests.missing", run_after=timezone.now())
+        with self.assertLogs("tasks.queue", "WARNING"):
+            self.assertTrue(run_next("worker"))
+        row.refresh_from_db()
+        self.assertEqual(row.status, Task.Status.FAILED)
+        self.assertIn("Unknown task", row.last_error)
+
+    @override_settings(TASKS_EAGER=True)
+    def test_eager_mode_runs_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertIsNone(record.enqueue(1))
+            self.assertEqual(calls, [])
+        self.assertEqual(calls, [1])
+        self.assertFalse(Task.objects.exists())
@@ -22,3 +22,7 @@ class WorksConfig(AppConfig):
             ]
             for directory in directories:
                 directory.mkdir(parents=True, exist_ok=True)
+
+        from works.signals import connect_signals
+
+        connect_signals()
@@ -0,0 +1,260 @@
+import json
+
+from django.db import models, transaction
+from django.utils import timezone
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+from rest_framework.response import Response
+
+from accounts.models import Department, Profile
+from accounts.utils import get_user_profile
+from files.tasks import delete_later
+from stats.signals import schedule_refresh
+from works.search import remove_works
+from works.serializers import WorkBulkResponseSerializer
+from works.signals import mute_work_signals
+from works.writes import BATCH_SIZE, refresh_works, set_authors, stats_keys
+
+# Multipart bulk creates send the items as JSON in this field; file fields of
+# an item name the multipart part holding the file, e.g. {"file": "file_3"}.
+MANIFEST_FIELD = "manifest"
+
+
+def _error(index: int, errors, pk=None) -> dict:
+    return {"index": index, "id": pk, "status": "error", "errors": errors}
+
+
+class BulkWorkMixin:
+    """
+    ``/bulk/`` endpoint for work viewsets: POST creates, PATCH updates and
+    DELETE removes up to ``bulk_max_items`` works in one request.
+
+    Items are validated with the viewset's write serializer one by one, but
+    written with bulk_create/bulk_update and bulk through-table inserts.
+    Valid items are saved even when others fail; the response reports the
+    outcome of every item by its position in the request.
+    """
+
+    bulk_max_items = 1000
+
+    @extend_schema(
+        summary="Bulk create, update or delete",
+        description=(
+            "POST: a JSON array of works, or multipart with a `manifest` JSON array whose "
+            "file fields name other multipart parts. PATCH: an array of partial works with `id`. "
+            "DELETE: an array of ids. Returns 201/200 when every item succeeds, 207 on partial "
+            "failure and 400 when every item fails."
+        ),
+        request=OpenApiTypes.OBJECT,
+        responses={200: WorkBulkResponseSerializer, 207: WorkBulkResponseSerializer},
+    )
+    @action(
+        detail=False,
+        methods=["post", "patch", "delete"],
+        url_path="bulk",
+        parser_classes=[JSONParser, MultiPartParser, FormParser],
+    )
+    def bulk(self, request, *args, **kwargs):
+        items = self._bulk_items(request)
+        if request.method == "POST":
+            results, success_status = self._bulk_create(items), status.HTTP_201_CREATED
+        elif request.method == "PATCH":
+            results, success_status = self._bulk_update(items), status.HTTP_200_OK
+        else:
+            results, success_status = self._bulk_delete(items), status.HTTP_200_OK
+
+        results.sort(key=lambda result: result["index"])
+        failed = sum(result["status"] == "error" for result in results)
+        if not failed:
+            response_status = success_status
+        elif failed == len(results):
+            response_status = status.HTTP_400_BAD_REQUEST
+        else:
+            response_status = status.HTTP_207_MULTI_STATUS
+        return Response(
+            {"succeeded": len(results) - failed, "failed": failed, "results": results},
+            status=response_status,
+        )
+
+    def _bulk_items(self, request) -> list:
+        data = request.data
+        if not isinstance(data, list) and MANIFEST_FIELD in data:
+            try:
+                data = json.loads(data[MANIFEST_FIELD])
+            except ValueError:
+                raise ValidationError({MANIFEST_FIELD: ["JSON massiv bo'lishi kerak."]})
+        elif isinstance(data, dict) and "items" in data:
+            data = data["items"]
+        if not isinstance(data, list) or not data:
+            raise ValidationError({"detail": "Bo'sh bo'lmagan massiv kutilgan."})
+        if len(data) > self.bulk_max_items:
+            raise ValidationError({"detail": f"Bir so'rovda ko'pi bilan {self.bulk_max_items} ta element."})
+        return data
+
+    def _file_fields(self) -> set[str]:
+        return {field.name for field in self.model._meta.fields if isinstance(field, models.FileField)}
+
+    def _attach_files(self, item: dict) -> dict:
+        """Swap file part names in a manifest item for the uploaded files."""
+        item = dict(item)
+        for name in self._file_fields() & item.keys():
+            if isinstance(item[name], str) and item[name] in self.request.FILES:
+                item[name] = self.request.FILES[item[name]]
+        return item
+
+    def _bulk_context(self, items: list) -> dict:
+        """Serializer context with every referenced author loaded in one query."""
+        author_ids = set()
+        for item in items:
+            authors = item.get("authors") if isinstance(item, dict) else None
+            for author_id in authors if isinstance(authors, list) else ():
+                if isinstance(author_id, int) or (isinstance(author_id, str) and author_id.isdigit()):
+                    author_ids.add(int(author_id))
+        profiles = Profile.objects.select_related("user").in_bulk(author_ids)
+        return {**self.get_serializer_context(), "profiles_by_id": profiles}
+
+    def _bulk_create(self, items: list) -> list[dict]:
+        profile = get_user_profile(self.request.user)
+        serializer_class = self.serializer_action_classes["create"]
+        context = self._bulk_context(items)
+
+        results, valid = [], []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                results.append(_error(index, {"detail": "Obyekt kutilgan."}))
+                continue
+            serializer = serializer_class(data=self._attach_files(item), context=context)
+            if serializer.is_valid():
+                valid.append((index, dict(serializer.validated_data)))
+            else:
+                results.append(_error(index, serializer.errors))
+        if not valid:
+            return results
+
+        default_department = profile.department or Department.objects.filter(name=Department.DEFAULT_NAME).first()
+        instances, authors = [], []
+        for _, data in valid:
+            authors.append(data.pop("authors", []))
+            data.setdefault("owner", profile)
+            if not data.get("department"):
+                data["department"] = default_department
+            instances.append(self.model(**data))
+
+        with transaction.atomic():
+            created = self.model.objects.bulk_create(instances, batch_size=BATCH_SIZE)
+            set_authors(self.model, {work.pk: work_authors for work, work_authors in zip(created, authors) if work_authors})
+            refresh_works(self.model, [work.pk for work in created])
+
+        results.extend(
+            {"index": index, "id": work.pk, "status": "created"} for (index, _), work in zip(valid, created)
+        )
+        return results
+
+    def _visible_objects(self, items: list, results: list) -> dict[int, tuple[int, object]]:
+        """
+        Resolve ``items`` to works the user may change, keyed by id with the
+        item position. Unknown, hidden and forbidden works become errors.
+        """
+        ids = {}
+        for index, item in enumerate(items):
+            pk = item.get("id") if isinstance(item, dict) else item
+            if isinstance(pk, bool) or not isinstance(pk, (int, str)) or not str(pk).isdigit():
+                results.append(_error(index, {"id": ["Butun son bo'lishi kerak."]}))
+            elif int(pk) in ids:
+                results.append(_error(index, {"id": ["Takrorlangan id."]}, int(pk)))
+            else:
+                ids[int(pk)] = index
+
+        objects = self.get_queryset().in_bulk(list(ids))
+        found = {}
+        for pk, index in ids.items():
+            obj = objects.get(pk)
+            if obj is None:
+                results.append(_error(index, {"detail": "Topilmadi."}, pk))
+                continue
+            try:
+                self.check_object_permissions(self.request, obj)
+            except PermissionDenied as exc:
+                results.append(_error(index, {"detail": str(exc.detail)}, pk))
+                continue
+            found[pk] = (index, obj)
+        return found
+
+    def _bulk_update(self, items: list) -> list[dict]:
+        results = []
+        found = self._visible_objects(items, results)
+        serializer_class = self.serializer_action_classes["update"]
+        context = self._bulk_context(items)
+        file_fields = self._file_fields()
+
+        valid = []
+        for pk, (index, obj) in found.items():
+            data = self._attach_files({key: value for key, value in items[index].items() if key != "id"})
+            serializer = serializer_class(obj, data=data, partial=True, context=context)
+            if serializer.is_valid():
+                valid.append((index, obj, dict(serializer.validated_data)))
+            else:
+                results.append(_error(index, serializer.errors, pk))
+        if not valid:
+            return results
+
+        # Authors come from the viewset's prefetch_related("authors__user").
+        previous_keys = stats_keys(
+            self.model,
+            [obj for _, obj, _ in valid],
+            {obj.pk: {author.pk for author in obj.authors.all()} for _, obj, _ in valid},
+        )
+        changed_fields, authors = {"updated_at"}, {}
+        now = timezone.now()
+        objects = [obj for _, obj, _ in valid]
+        # Replaced files are queued for deletion in the same transaction, so a
+        # failed update keeps them.
+        with transaction.atomic():
+            for _, obj, data in valid:
+                if "authors" in data:
+                    authors[obj.pk] = data.pop("authors")
+                if "department" in data and not data["department"]:
+                    del data["department"]
+                for name in file_fields & data.keys():
+                    upload = data.pop(name)
+                    delete_later(getattr(obj, name))
+                    if upload:
+                        getattr(obj, name).save(upload.name, upload, save=False)
+                    else:
+                        setattr(obj, name, None)
+                    changed_fields.add(name)
+                for attr, value in data.items():
+                    setattr(obj, attr, value)
+                changed_fields.update(data)
+                obj.updated_at = now
+
+            self.model.objects.bulk_update(objects, sorted(changed_fields), batch_size=BATCH_SIZE)
+            set_authors(self.model, authors)
+            refresh_works(self.model, [obj.pk for obj in objects], previous_keys)
+
+        results.extend({"index": index, "id": obj.pk, "status": "updated"} for index, obj, _ in valid)
+        return results
+
+    def _bulk_delete(self, items: list) -> list[dict]:
+        results = []
+        found = self._visible_objects(items, results)
+        if not found:
+            return results
+
+        objects = [obj for _, obj in found.values()]
+        keys = stats_keys(
+            self.model,
+            objects,
+            {obj.pk: {author.pk for author in obj.authors.all()} for obj in objects},
+        )
+        with transaction.atomic(), mute_work_signals():
+            self.model.objects.filter(pk__in=list(found)).delete()
+            remove_works(self.model, list(found))
+            schedule_refresh(keys)
+
+        results.extend({"index": index, "id": pk, "status": "deleted"} for pk, (index, _) in found.items())
+        return results
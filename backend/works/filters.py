@@ -0,0 +1,32 @@
+from rest_framework.filters import BaseFilterBackend
+
+from works.search import search_queryset
+
+
+class WorkFullTextFilter(BaseFilterBackend):
+    """
+    ``?q=`` full-text search over titles, descriptions, venues, publishers,
+    author names and the text of attached PDF/DOCX/PPTX files. Results are ordered by relevance unless ``?ordering=`` is given.
+    """
+
+    search_param = "q"
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, "").strip()
+        if not query:
+            return queryset
+        queryset = search_queryset(queryset, query)
+        if not request.query_params.get("ordering"):
+            queryset = queryset.order_by("-search_rank", *(getattr(view, "ordering", None) or ()))
+        return queryset
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.search_param,
+                "required": False,
+                "in": "query",
+                "description": "Full-text search over title, description, publisher, venue, author names and attached file text.",
+                "schema": {"type": "string"},
+            }
+        ]
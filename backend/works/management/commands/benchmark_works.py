@@ -0,0 +1,272 @@
+"""
+Management command to measure work list latency per role, optionally seeding
+synthetic works first.
+Usage: python manage.py benchmark_works [--seed 100000] [--iterations 20]
+
+``--serializers`` measures list serialization throughput instead: the
+generated work serializers' fast path against DRF's field-by-field
+``ModelSerializer.to_representation`` over the same prefetched works.
+``--fast-list`` compares the regular list path (model instances, JSONRenderer)
+with the ``?fast=1`` mode (values() rows, orjson) side by side at page sizes
+of 20, 100 and 1000, queries and rendering included. ``--explain`` prints the
+database's plan of the first list page per role and endpoint.
+
+To compare index changes, run it once before and once after the migration
+(e.g. ``migrate works 0005`` / ``migrate works``) against the same data.
+"""
+from random import Random
+from statistics import mean
+from time import perf_counter
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.serializers import ModelSerializer
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from accounts.models import Department, Profile
+from core.renderers import FastJSONRenderer
+from stats.cache import invalidate_all
+from stats.rollup import rebuild
+from works.fastlist import fast_list_queryset
+from works.models import WorkLanguage
+from works.views import (
+    CertificateViewSet,
+    MethodicalWorkViewSet,
+    ResearchWorkViewSet,
+    SoftwareCertificateViewSet,
+)
+
+User = get_user_model()
+
+BENCHMARK_DEPARTMENTS = ("Benchmark A", "Benchmark B")
+BENCHMARK_TEACHERS = 40
+YEARS = [f"{year}-{year + 1}" for year in range(2015, 2026)]
+FAST_LIST_PAGE_SIZES = (20, 100, 1000)
+
+VIEWSETS = (
+    ("methodical", MethodicalWorkViewSet, {}),
+    ("research", ResearchWorkViewSet, {"venue": "Benchmark venue"}),
+    ("certificate", CertificateViewSet, {}),
+    ("software_certificate", SoftwareCertificateViewSet, {}),
+)
+
+
+class Command(BaseCommand):
+    help = "Measure work list latency for admin, HOD and teacher users"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Create this many synthetic works per type before measuring",
+        )
+        parser.add_argument(
+            "--iterations",
+            type=int,
+            default=20,
+            help="Number of list requests per role and endpoint",
+        )
+        parser.add_argument(
+            "--cursor",
+            action="store_true",
+            help="Measure the cursor pagination mode instead of page numbers",
+        )
+        parser.add_argument(
+            "--serializers",
+            action="store_true",
+            help="Measure list serialization throughput instead of request latency",
+        )
+        parser.add_argument(
+            "--fast-list",
+            action="store_true",
+            help="Compare the regular and ?fast=1 list modes at several page sizes",
+        )
+        parser.add_argument(
+            "--explain",
+            action="store_true",
+            help="Print the query plan of each role's first list page instead of timing it",
+        )
+        parser.add_argument(
+            "--batch",
+            type=int,
+            default=500,
+            help="Works serialized per iteration with --serializers",
+        )
+
+    def handle(self, *args, **options):
+        profiles = self._benchmark_profiles()
+        if options["seed"]:
+            self._seed(options["seed"], profiles)
+
+        if options["serializers"]:
+            self._benchmark_serializers(profiles["admin"], options["batch"], options["iterations"])
+            return
+        if options["fast_list"]:
+            self._benchmark_fast_list(profiles["admin"], options["iterations"])
+            return
+        if options["explain"]:
+            self._explain(profiles)
+            return
+
+        params = {"pagination": "cursor"} if options["cursor"] else {}
+        factory = APIRequestFactory()
+        for role, profile in (
+            ("admin", profiles["admin"]),
+            ("hod", profiles["hod"]),
+            ("teacher", profiles["teachers"][0]),
+        ):
+            for kind, viewset, _extra in VIEWSETS:
+                view = viewset.as_view({"get": "list"})
+                timings = []
+                for _ in range(options["iterations"]):
+                    request = factory.get("/", params)
+                    force_authenticate(request, user=profile.user)
+                    with CaptureQueriesContext(connection) as ctx:
+                        started = perf_counter()
+                        view(request).render()
+                        timings.append((perf_counter() - started) * 1000)
+                timings.sort()
+                p95 = timings[int(len(timings) * 0.95) - 1] if len(timings) > 1 else timings[0]
+                self.stdout.write(
+                    f"{role:>8} {kind:>21}: {mean(timings):7.2f} ms mean, "
+                    f"{p95:7.2f} ms p95, {len(ctx.captured_queries)} queries"
+                )
+
+    def _benchmark_serializers(self, profile: Profile, batch: int, iterations: int) -> None:
+        request = APIRequestFactory().get("/")
+        request.user = profile.user
+        for kind, viewset, _extra in VIEWSETS:
+            serializer_class = viewset.serializer_action_classes["list"]
+            works = list(
+                viewset.model.objects.select_related("owner__user", "department")
+                .prefetch_related("authors__user")
+                .order_by("-year", "-created_at")[:batch]
+            )
+            if not works:
+                continue
+
+            serializer = serializer_class(works, many=True, context={"request": request})
+            child = serializer.child
+            modes = (
+                ("drf", lambda: [ModelSerializer.to_representation(child, work) for work in works]),
+                ("fast", lambda: serializer.to_representation(works)),
+            )
+            rates = {}
+            for mode, serialize in modes:
+                started = perf_counter()
+                for _ in range(iterations):
+                    serialize()
+                rates[mode] = len(works) * iterations / (perf_counter() - started)
+            self.stdout.write(
+                f"{kind:>21}: {rates['drf']:9.0f} works/s drf, {rates['fast']:9.0f} works/s fast "
+                f"({rates['fast'] / rates['drf']:.1f}x, {len(works)} works)"
+            )
+
+    def _benchmark_fast_list(self, profile: Profile, iterations: int) -> None:
+        request = Request(APIRequestFactory().get("/"))
+        request.user = profile.user
+        for kind, viewset, _extra in VIEWSETS:
+            view = viewset(request=request, action="list", format_kwarg=None, kwargs={})
+            queryset = view.filter_queryset(view.get_queryset())
+            for page_size in FAST_LIST_PAGE_SIZES:
+                modes = (
+                    ("regular", JSONRenderer(), lambda: view.get_serializer(list(queryset[:page_size]), many=True).data),
+                    ("fast", FastJSONRenderer(), lambda: view.fast_list_data(fast_list_queryset(queryset)[:page_size])),
+                )
+                results = {}
+                for mode, renderer, serialize in modes:
+                    timings = []
+                    for _ in range(iterations):
+                        with CaptureQueriesContext(connection) as ctx:
+                            started = perf_counter()
+                            renderer.render(serialize())
+                            timings.append((perf_counter() - started) * 1000)
+                    results[mode] = (mean(timings), len(ctx.captured_queries))
+                (regular, regular_queries), (fast, fast_queries) = results["regular"], results["fast"]
+                self.stdout.write(
+                    f"{kind:>21} {page_size:>5}: {regular:8.2f} ms regular ({regular_queries} queries), "
+                    f"{fast:8.2f} ms fast ({fast_queries} queries), {regular / fast:.1f}x"
+                )
+
+    def _explain(self, profiles: dict) -> None:
+        for role, profile in (
+            ("admin", profiles["admin"]),
+            ("hod", profiles["hod"]),
+            ("teacher", profiles["teachers"][0]),
+        ):
+            request = Request(APIRequestFactory().get("/"))
+            request.user = profile.user
+            for kind, viewset, _extra in VIEWSETS:
+                view = viewset(request=request, action="list", format_kwarg=None, kwargs={})
+                queryset = view.filter_queryset(view.get_queryset())[: view.paginator.page_size]
+                self.stdout.write(f"{role} {kind}:\n{queryset.explain()}\n")
+
+    def _benchmark_profiles(self) -> dict:
+        departments = [Department.objects.get_or_create(name=name)[0] for name in BENCHMARK_DEPARTMENTS]
+
+        def profile_for(username: str, role: str, department: Department) -> Profile:
+            user, created = User.objects.get_or_create(username=username)
+            if created:
+                user.set_unusable_password()
+                user.save()
+            profile = user.profile
+            profile.role = role
+            profile.department = department
+            profile.save()
+            return profile
+
+        return {
+            "departments": departments,
+            "admin": profile_for("bench_admin", Profile.Roles.ADMIN, departments[0]),
+            "hod": profile_for("bench_hod", Profile.Roles.HOD, departments[0]),
+            "teachers": [
+                profile_for(f"bench_teacher_{index}", Profile.Roles.TEACHER, departments[index % 2])
+                for index in range(BENCHMARK_TEACHERS)
+            ],
+        }
+
+    def _seed(self, count: int, profiles: dict) -> None:
+        rng = Random(42)
+        teachers = profiles["teachers"]
+        languages = [choice for choice, _ in WorkLanguage.choices]
+
+        for kind, viewset, extra in VIEWSETS:
+            model = viewset.model
+            types = [choice for choice, _ in model.Types.choices]
+            self.stdout.write(f"Seeding {count} {model.__name__} rows...")
+
+            with transaction.atomic():
+                for start in range(0, count, 5000):
+                    batch = []
+                    for index in range(start, min(start + 5000, count)):
+                        owner = rng.choice(teachers)
+                        batch.append(
+                            model(
+                                title=f"Benchmark {kind} {index}",
+                                year=rng.choice(YEARS),
+                                language=rng.choice(languages),
+                                type=rng.choice(types),
+                                owner=owner,
+                                department_id=owner.department_id,
+                                is_department_visible=rng.random() < 0.7,
+                                **extra,
+                            )
+                        )
+                    created = model.objects.bulk_create(batch)
+
+                    through = model.authors.through
+                    work_field = f"{model._meta.model_name}_id"
+                    links = []
+                    for work in created:
+                        for author in rng.sample(teachers, rng.randint(0, 3)):
+                            links.append(through(**{work_field: work.id, "profile_id": author.id}))
+                    through.objects.bulk_create(links, ignore_conflicts=True)
+
+        # bulk_create bypasses the stats signals.
+        rebuild()
+        invalidate_all()
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from works.search import rebuild_index
+
+
+class Command(BaseCommand):
+    help = (
+        "Recreate the full-text search documents of all works and queue text extraction "
+        "of work files not extracted yet"
+    )
+
+    def handle(self, *args, **options):
+        documents = rebuild_index()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {documents} work(s)"))
@@ -0,0 +1,168 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:00
+
+from django.db import migrations, models
+
+# Auto-created authors through-tables only carry a (work, profile) unique
+# index; a (profile, work) index serves "works of this author" semi-joins.
+AUTHOR_TABLES = (
+    ("methodical", "works_methodicalwork_authors", "methodicalwork_id"),
+    ("research", "works_researchwork_authors", "researchwork_id"),
+    ("certificate", "works_certificate_authors", "certificate_id"),
+    ("softcert", "works_softwarecertificate_authors", "softwarecertificate_id"),
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0004_add_avatar_field"),
+        ("works", "0005_alter_certificate_year_alter_methodicalwork_year_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="certificate",
+            index=models.Index(
+                fields=["department", "-year", "-created_at"],
+                name="certificate_dept_year_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="certificate",
+            index=models.Index(
+                condition=models.Q(("is_department_visible", True)),
+                fields=["department", "-year", "-created_at"],
+                name="certificate_dept_visible_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="certificate",
+            index=models.Index(
+                fields=["owner", "-year", "-created_at"],
+                name="certificate_owner_year_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="certificate",
+            index=models.Index(
+                fields=["-year", "-created_at"], name="certificate_year_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="certificate",
+            index=models.Index(
+                fields=["department", "year", "type", "language"],
+                name="certificate_stats_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="methodicalwork",
+            index=models.Index(
+                fields=["department", "-year", "-created_at"],
+                name="methodical_dept_year_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="methodicalwork",
+            index=models.Index(
+                condition=models.Q(("is_department_visible", True)),
+                fields=["department", "-year", "-created_at"],
+                name="methodical_dept_visible_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="methodicalwork",
+            index=models.Index(
+                fields=["owner", "-year", "-created_at"],
+                name="methodical_owner_year_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="methodicalwork",
+            index=models.Index(
+                fields=["-year", "-created_at"], name="methodical_year_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="methodicalwork",
+            index=models.Index(
+                fields=["department", "year", "type", "language"],
+                name="methodical_stats_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="researchwork",
+            index=models.Index(
+                fields=["department", "-year", "-created_at"],
+                name="research_dept_year_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="researchwork",
+            index=models.Index(
+                condition=models.Q(("is_department_visible", True)),
+                fields=["department", "-year", "-created_at"],
+                name="research_dept_visible_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="researchwork",
+            index=models.Index(
+                fields=["owner", "-year", "-created_at"], name="research_owner_year_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="researchwork",
+            index=models.Index(
+                fields=["-year", "-created_at"], name="research_year_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="researchwork",
+            index=models.Index(
+                fields=["department", "year", "type", "language"],
+                name="research_stats_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="softwarecertificate",
+            index=models.Index(
+                fields=["department", "-year", "-created_at"],
+                name="softcert_dept_year_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="softwarecertificate",
+            index=models.Index(
+                condition=models.Q(("is_department_visible", True)),
+                fields=["department", "-year", "-created_at"],
+                name="softcert_dept_visible_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="softwarecertificate",
+            index=models.Index(
+                fields=["owner", "-year", "-created_at"], name="softcert_owner_year_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="softwarecertificate",
+            index=models.Index(
+                fields=["-year", "-created_at"], name="softcert_year_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="softwarecertificate",
+            index=models.Index(
+                fields=["department", "year", "type", "language"],
+                name="softcert_stats_idx",
+            ),
+        ),
+        *(
+            migrations.RunSQL(
+                sql=f"CREATE INDEX {prefix}_author_profile_idx ON {table} (profile_id, {work_column})",
+                reverse_sql=f"DROP INDEX {prefix}_author_profile_idx",
+            )
+            for prefix, table, work_column in AUTHOR_TABLES
+        ),
+    ]
@@ -0,0 +1,131 @@
+# Generated by Django 5.2.18 on 2026-10-18 11:02
+
+from django.db import migrations, models
+
+# Frozen copies of what works.search looked like when this migration was
+# written; migrations must not follow later changes to that module.
+DOCUMENT_TABLE = "works_worksearchdocument"
+FTS_TABLE = "works_search_fts"
+DOCUMENT_FIELDS = ("title", "description", "publisher", "venue", "issued_by", "cert_number")
+
+SQLITE_SETUP = (
+    f"""
+    CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        document,
+        content='{DOCUMENT_TABLE}',
+        content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON {DOCUMENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, document) VALUES (new.id, new.document);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON {DOCUMENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, document) VALUES ('delete', old.id, old.document);
+    END
+    """,
+    f"""
+    CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE ON {DOCUMENT_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, document) VALUES ('delete', old.id, old.document);
+        INSERT INTO {FTS_TABLE}(rowid, document) VALUES (new.id, new.document);
+    END
+    """,
+)
+SQLITE_TEARDOWN = (
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+)
+POSTGRES_SETUP = (
+    f"CREATE INDEX works_search_document_gin ON {DOCUMENT_TABLE} USING GIN (to_tsvector('simple', document))",
+)
+POSTGRES_TEARDOWN = ("DROP INDEX IF EXISTS works_search_document_gin",)
+
+WORK_MODELS = {
+    "methodical": "MethodicalWork",
+    "research": "ResearchWork",
+    "certificate": "Certificate",
+    "software_certificate": "SoftwareCertificate",
+}
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {"sqlite": SQLITE_SETUP, "postgresql": POSTGRES_SETUP}.get(vendor, ())
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {"sqlite": SQLITE_TEARDOWN, "postgresql": POSTGRES_TEARDOWN}.get(vendor, ())
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def _names(profile) -> list[str]:
+    names = [profile.user.first_name, profile.user.last_name]
+    for name in profile.names.all():
+        names.extend([name.first_name, name.last_name, name.father_name])
+    return names
+
+
+def populate_search_documents(apps, schema_editor):
+    document_model = apps.get_model("works", "WorkSearchDocument")
+    documents = []
+    for kind, model_name in WORK_MODELS.items():
+        works = (
+            apps.get_model("works", model_name)
+            .objects.select_related("owner__user")
+            .prefetch_related("owner__names", "authors__user", "authors__names")
+        )
+        for work in works.iterator(chunk_size=500):
+            parts = [getattr(work, field, "") for field in DOCUMENT_FIELDS]
+            profiles = {work.owner_id: work.owner, **{author.id: author for author in work.authors.all()}}
+            for profile in profiles.values():
+                parts.extend(_names(profile))
+            document = " ".join(part for part in parts if part)
+            documents.append(document_model(kind=kind, work_id=work.pk, document=document))
+    document_model.objects.bulk_create(documents, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0003_add_employment_profilename_models"),
+        ("works", "0006_work_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WorkSearchDocument",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("kind", models.CharField(max_length=32)),
+                ("work_id", models.PositiveBigIntegerField()),
+                ("document", models.TextField(blank=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("kind", "work_id"), name="unique_work_search_document"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+        migrations.RunPython(populate_search_documents, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:13
+
+import files.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("works", "0007_work_search"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="certificate",
+            name="file",
+            field=models.FileField(
+                blank=True,
+                null=True,
+                storage=files.storage.content_storage,
+                upload_to="works/certificates/",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="methodicalwork",
+            name="file",
+            field=models.FileField(
+                blank=True,
+                null=True,
+                storage=files.storage.content_storage,
+                upload_to="works/methodical/",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="methodicalwork",
+            name="permission_file",
+            field=models.FileField(
+                blank=True,
+                null=True,
+                storage=files.storage.content_storage,
+                upload_to="works/methodical/permissions/",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="researchwork",
+            name="file",
+            field=models.FileField(
+                blank=True,
+                null=True,
+                storage=files.storage.content_storage,
+                upload_to="works/research/",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="softwarecertificate",
+            name="file",
+            field=models.FileField(
+                blank=True,
+                null=True,
+                storage=files.storage.content_storage,
+                upload_to="works/software-certificates/",
+            ),
+        ),
+    ]
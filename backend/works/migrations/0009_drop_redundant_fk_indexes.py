@@ -0,0 +1,95 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0005_profile_avatar_thumbnails"),
+        ("works", "0008_content_storage"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="certificate",
+            name="department",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_items",
+                to="accounts.department",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="certificate",
+            name="owner",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="owned_%(class)s",
+                to="accounts.profile",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="methodicalwork",
+            name="department",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_items",
+                to="accounts.department",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="methodicalwork",
+            name="owner",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="owned_%(class)s",
+                to="accounts.profile",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="researchwork",
+            name="department",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_items",
+                to="accounts.department",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="researchwork",
+            name="owner",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="owned_%(class)s",
+                to="accounts.profile",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="softwarecertificate",
+            name="department",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="%(class)s_items",
+                to="accounts.department",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="softwarecertificate",
+            name="owner",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="owned_%(class)s",
+                to="accounts.profile",
+            ),
+        ),
+    ]
@@ -0,0 +1,160 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0006_profile_name_updated_at"),
+        ("works", "0009_drop_redundant_fk_indexes"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="certificate",
+            name="certificate_dept_year_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="certificate",
+            name="certificate_dept_visible_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="certificate",
+            name="certificate_owner_year_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="certificate",
+            name="certificate_year_created_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="methodicalwork",
+            name="methodical_dept_year_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="methodicalwork",
+            name="methodical_dept_visible_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="methodicalwork",
+            name="methodical_owner_year_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="methodicalwork",
+            name="methodical_year_created_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="researchwork",
+            name="research_dept_year_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="researchwork",
+            name="research_dept_visible_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="researchwork",
+            name="research_owner_year_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="researchwork",
+            name="research_year_created_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="softwarecertificate",
+            name="softcert_dept_year_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="softwarecertificate",
+            name="softcert_dept_visible_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="softwarecertificate",
+            name="softcert_owner_year_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="softwarecertificate",
+            name="softcert_year_created_idx",
+        ),
+        migrations.AddIndex(
+            model_name="certificate",
+            index=models.Index(
+                fields=["department", "-year", "-created_at", "-id"],
+                name="certificate_dept_year_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="certificate",
+            index=models.Index(
+                fields=["owner", "-year", "-created_at", "-id"],
+                name="certificate_owner_year_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="certificate",
+            index=models.Index(
+                fields=["-year", "-created_at", "-id"],
+                name="certificate_year_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="methodicalwork",
+            index=models.Index(
+                fields=["department", "-year", "-created_at", "-id"],
+                name="methodical_dept_year_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="methodicalwork",
+            index=models.Index(
+                fields=["owner", "-year", "-created_at", "-id"],
+                name="methodical_owner_year_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="methodicalwork",
+            index=models.Index(
+                fields=["-year", "-created_at", "-id"],
+                name="methodical_year_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="researchwork",
+            index=models.Index(
+                fields=["department", "-year", "-created_at", "-id"],
+                name="research_dept_year_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="researchwork",
+            index=models.Index(
+                fields=["owner", "-year", "-created_at", "-id"],
+                name="research_owner_year_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="researchwork",
+            index=models.Index(
+                fields=["-year", "-created_at", "-id"], name="research_year_created_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="softwarecertificate",
+            index=models.Index(
+                fields=["department", "-year", "-created_at", "-id"],
+                name="softcert_dept_year_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="softwarecertificate",
+            index=models.Index(
+                fields=["owner", "-year", "-created_at", "-id"],
+                name="softcert_owner_year_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="softwarecertificate",
+            index=models.Index(
+                fields=["-year", "-created_at", "-id"], name="softcert_year_created_idx"
+            ),
+        ),
+    ]
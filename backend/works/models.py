@@ -1,6 +1,7 @@
 from django.db import models
 
 from accounts.models import Department, Profile
+from files.storage import content_storage
 
 
 class WorkLanguage(models.TextChoices):
@@ -10,6 +11,35 @@ class WorkLanguage(models.TextChoices):
     OTHER = "OTHER", "Boshqa"
 
 
+def work_indexes(prefix: str) -> list[models.Index]:
+    """
+    Indexes matching the list filters and (-year, -created_at, -id) ordering
+    of a work model; ``id`` breaks ties for cursor and page-number lists.
+
+    Teachers' lists are not indexed by department visibility: their filter
+    ORs it with ownership and authorship (an EXISTS), so no plan can use an
+    index for one branch, and they scan ``<prefix>_year_created_idx``.
+    """
+    return [
+        models.Index(
+            fields=["department", "-year", "-created_at", "-id"],
+            name=f"{prefix}_dept_year_idx",
+        ),
+        models.Index(
+            fields=["owner", "-year", "-created_at", "-id"],
+            name=f"{prefix}_owner_year_idx",
+        ),
+        models.Index(
+            fields=["-year", "-created_at", "-id"],
+            name=f"{prefix}_year_created_idx",
+        ),
+        models.Index(
+            fields=["department", "year", "type", "language"],
+            name=f"{prefix}_stats_idx",
+        ),
+    ]
+
+
 class WorkBase(models.Model):
     title = models.CharField(max_length=255)
     year = models.CharField(max_length=9, help_text="O'quv yili formatida (masalan: 2024-2025)")
@@ -23,15 +53,19 @@ class WorkBase(models.Model):
         related_name="authored_%(class)s",
         blank=True,
     )
+    # No single-column indexes: the work_indexes() composites lead with
+    # owner and department and serve those lookups (and cascades) too.
     owner = models.ForeignKey(
         Profile,
         on_delete=models.CASCADE,
         related_name="owned_%(class)s",
+        db_index=False,
     )
     department = models.ForeignKey(
         Department,
         on_delete=models.CASCADE,
         related_name="%(class)s_items",
+        db_index=False,
     )
     is_department_visible = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
@@ -54,14 +88,18 @@ class MethodicalWork(WorkBase):
 
     publisher = models.CharField(max_length=255, blank=True)
     type = models.CharField(max_length=32, choices=Types.choices)
-    file = models.FileField(upload_to="works/methodical/", null=True, blank=True)
+    file = models.FileField(upload_to="works/methodical/", storage=content_storage, null=True, blank=True)
     permission_file = models.FileField(
         upload_to="works/methodical/permissions/",
+        storage=content_storage,
         blank=True,
         null=True,
     )
     description = models.TextField(blank=True)
 
+    class Meta(WorkBase.Meta):
+        indexes = work_indexes("methodical")
+
 
 class ResearchWork(WorkBase):
     class Types(models.TextChoices):
@@ -74,9 +112,12 @@ class ResearchWork(WorkBase):
 
     venue = models.CharField(max_length=255)
     type = models.CharField(max_length=32, choices=Types.choices)
-    file = models.FileField(upload_to="works/research/", blank=True, null=True)
+    file = models.FileField(upload_to="works/research/", storage=content_storage, blank=True, null=True)
     link = models.URLField(blank=True)
 
+    class Meta(WorkBase.Meta):
+        indexes = work_indexes("research")
+
 
 class Certificate(WorkBase):
     class Types(models.TextChoices):
@@ -85,9 +126,12 @@ class Certificate(WorkBase):
 
     publisher = models.CharField(max_length=255, blank=True)
     type = models.CharField(max_length=32, choices=Types.choices)
-    file = models.FileField(upload_to="works/certificates/", null=True, blank=True)
+    file = models.FileField(upload_to="works/certificates/", storage=content_storage, null=True, blank=True)
     description = models.TextField(blank=True)
 
+    class Meta(WorkBase.Meta):
+        indexes = work_indexes("certificate")
+
 
 class SoftwareCertificate(WorkBase):
     class Types(models.TextChoices):
@@ -98,4 +142,39 @@ class SoftwareCertificate(WorkBase):
     approval_date = models.DateField(null=True, blank=True)
     cert_number = models.CharField(max_length=255, blank=True)
     type = models.CharField(max_length=32, choices=Types.choices)
-    file = models.FileField(upload_to="works/software-certificates/", null=True, blank=True)
+    file = models.FileField(upload_to="works/software-certificates/", storage=content_storage, null=True, blank=True)
+
+    class Meta(WorkBase.Meta):
+        indexes = work_indexes("softcert")
+
+
+# Work kinds as exposed by the stats and feed endpoints.
+WORK_MODELS = {
+    "methodical": MethodicalWork,
+    "research": ResearchWork,
+    "certificate": Certificate,
+    "software_certificate": SoftwareCertificate,
+}
+
+
+class WorkSearchDocument(models.Model):
+    """
+    Denormalized search text of one work (its text fields, author names and
+    the text extracted from its files).
+
+    Indexed by a GIN expression index on PostgreSQL and mirrored into the
+    ``works_search_fts`` FTS5 table on SQLite; see works.search.
+    """
+
+    kind = models.CharField(max_length=32)
+    work_id = models.PositiveBigIntegerField()
+    document = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=("kind", "work_id"), name="unique_work_search_document"),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.kind} #{self.work_id}"
@@ -0,0 +1,42 @@
+import base64
+import json
+from datetime import datetime
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+
+INVALID_CURSOR_MESSAGE = "Invalid cursor"
+
+# Feed position: (year, created_at, id, kind) of the last row on a page.
+FeedPosition = tuple[str, datetime, int, str]
+
+
+def encode_feed_cursor(position: FeedPosition) -> str:
+    year, created_at, pk, kind = position
+    payload = json.dumps([year, created_at.isoformat(), pk, kind], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def decode_feed_cursor(cursor: str) -> FeedPosition:
+    try:
+        year, created_at, pk, kind = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return str(year), datetime.fromisoformat(created_at), int(pk), str(kind)
+    except (TypeError, ValueError):
+        raise NotFound(INVALID_CURSOR_MESSAGE)
+
+
+def feed_after(kind: str, position: FeedPosition) -> Q:
+    """
+    Rows of ``kind`` that follow ``position`` in (-year, -created_at, id, kind) order.
+
+    ``kind`` breaks ties between rows of different models sharing an id.
+    """
+    year, created_at, pk, position_kind = position
+    condition = (
+        Q(year__lt=year)
+        | Q(year=year, created_at__lt=created_at)
+        | Q(year=year, created_at=created_at, id__gt=pk)
+    )
+    if kind > position_kind:
+        condition |= Q(year=year, created_at=created_at, id=pk)
+    return condition
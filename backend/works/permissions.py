@@ -4,6 +4,20 @@ from accounts.models import Profile
 from accounts.utils import get_user_profile
 
 
+def is_work_author(obj, profile: Profile) -> bool:
+    """
+    Whether ``profile`` is among ``obj``'s authors, preferring the ``is_author``
+    annotation or prefetched authors over a query.
+    """
+    is_author = getattr(obj, "is_author", None)
+    if is_author is not None:
+        return is_author
+    prefetched = getattr(obj, "_prefetched_objects_cache", {}).get("authors")
+    if prefetched is not None:
+        return any(author.id == profile.id for author in prefetched)
+    return obj.authors.filter(id=profile.id).exists()
+
+
 class WorkAccessPermission(BasePermission):
     def has_permission(self, request, view) -> bool:
         return bool(get_user_profile(request.user))
@@ -22,15 +36,13 @@ class WorkAccessPermission(BasePermission):
             return request.method in SAFE_METHODS and obj.is_department_visible
 
         if profile.role == Profile.Roles.TEACHER:
-            owns = obj.owner_id == profile.id
-            is_author = obj.authors.filter(id=profile.id).exists()
-            if request.method in SAFE_METHODS:
-                in_department = (
-                    obj.department_id == profile.department_id
-                    and obj.is_department_visible
-                )
-                return owns or is_author or in_department
-            return owns or is_author
+            if obj.owner_id == profile.id or is_work_author(obj, profile):
+                return True
+            return (
+                request.method in SAFE_METHODS
+                and obj.department_id == profile.department_id
+                and obj.is_department_visible
+            )
 
         return False
 
@@ -0,0 +1,194 @@
+import re
+from itertools import islice
+
+from django.db import connection, transaction
+from django.db.models import FileField, FloatField, Q, QuerySet, Value
+from django.db.models.expressions import RawSQL
+
+from files.extract import is_extractable, is_supported
+from files.models import FileText
+from tasks.queue import enqueue
+from works.models import WORK_MODELS, WorkSearchDocument
+
+KIND_BY_MODEL = {model: kind for kind, model in WORK_MODELS.items()}
+
+# Text fields folded into the search document when a model has them.
+DOCUMENT_FIELDS = ("title", "description", "publisher", "venue", "issued_by", "cert_number")
+# Queued by name to avoid importing works.tasks, which imports this module.
+EXTRACT_TASK = "works.extract_file_text"
+
+# Created with its sync triggers by migration 0007 on SQLite; PostgreSQL
+# searches a GIN expression index on the document table instead.
+FTS_TABLE = "works_search_fts"
+DOCUMENT_TABLE = WorkSearchDocument._meta.db_table
+
+
+def _author_names(profile) -> list[str]:
+    names = [profile.user.first_name, profile.user.last_name]
+    for name in profile.names.all():
+        names.extend([name.first_name, name.last_name, name.father_name])
+    return names
+
+
+def _file_names(work) -> list[str]:
+    return [
+        getattr(work, field.name).name
+        for field in work._meta.fields
+        if isinstance(field, FileField) and getattr(work, field.name)
+    ]
+
+
+def file_texts(works) -> dict[str, str]:
+    """
+    Extracted text of the works' files by file name. Files not extracted
+    yet are queued for extraction; their works are reindexed afterwards.
+    Files marked unsupported are skipped until their extractor's package
+    is installed.
+    """
+    names = {name for work in works for name in _file_names(work) if is_extractable(name)}
+    if not names:
+        return {}
+    texts, retry = {}, []
+    for file_text in FileText.objects.filter(name__in=names):
+        if not file_text.unsupported:
+            texts[file_text.name] = file_text.text
+        elif is_supported(file_text.name):
+            retry.append(file_text.name)
+        else:
+            texts[file_text.name] = ""
+    if retry:
+        FileText.objects.filter(name__in=retry, unsupported=True).delete()
+    for name in names - texts.keys():
+        enqueue(EXTRACT_TASK, [name])
+    return texts
+
+
+def _document(work, authors, texts: dict[str, str]) -> str:
+    parts = [getattr(work, field, "") for field in DOCUMENT_FIELDS]
+    profiles = {work.owner_id: work.owner, **{author.id: author for author in authors}}
+    for profile in profiles.values():
+        parts.extend(_author_names(profile))
+    parts.extend(texts.get(name, "") for name in _file_names(work))
+    return " ".join(part for part in parts if part)
+
+
+def build_document(work) -> str:
+    """
+    Concatenate the work's text fields, every spelling of its authors' names
+    and the text extracted from its files.
+    """
+    return _document(work, work.authors.select_related("user").prefetch_related("names"), file_texts([work]))
+
+
+def index_work(work) -> None:
+    WorkSearchDocument.objects.update_or_create(
+        kind=KIND_BY_MODEL[type(work)],
+        work_id=work.pk,
+        defaults={"document": build_document(work)},
+    )
+
+
+def remove_work(model, work_id: int) -> None:
+    WorkSearchDocument.objects.filter(kind=KIND_BY_MODEL[model], work_id=work_id).delete()
+
+
+def _documents(kind: str, works: QuerySet) -> list:
+    works = works.select_related("owner__user").prefetch_related(
+        "owner__names", "authors__user", "authors__names"
+    )
+    documents = []
+    rows = works.iterator(chunk_size=500)
+    while chunk := list(islice(rows, 500)):
+        texts = file_texts(chunk)
+        documents.extend(
+            WorkSearchDocument(kind=kind, work_id=work.pk, document=_document(work, work.authors.all(), texts))
+            for work in chunk
+        )
+    return documents
+
+
+def index_works(model, work_ids) -> None:
+    """Rewrite the search documents of many works of one model at once."""
+    kind = KIND_BY_MODEL[model]
+    work_ids = list(work_ids)
+    documents = _documents(kind, model.objects.filter(pk__in=work_ids))
+    with transaction.atomic():
+        remove_works(model, work_ids)
+        WorkSearchDocument.objects.bulk_create(documents, batch_size=500)
+
+
+def remove_works(model, work_ids) -> None:
+    WorkSearchDocument.objects.filter(kind=KIND_BY_MODEL[model], work_id__in=list(work_ids)).delete()
+
+
+def reindex_file(name: str) -> None:
+    """Reindex every work whose files include ``name``."""
+    for model in WORK_MODELS.values():
+        lookup = Q()
+        for field in model._meta.fields:
+            if isinstance(field, FileField):
+                lookup |= Q(**{field.name: name})
+        work_ids = list(model.objects.filter(lookup).values_list("id", flat=True))
+        if work_ids:
+            index_works(model, work_ids)
+
+
+def rebuild_index() -> int:
+    """Recreate every search document. Returns the number written."""
+    WorkSearchDocument.objects.all().delete()
+    documents = []
+    for kind, model in WORK_MODELS.items():
+        documents.extend(_documents(kind, model.objects.all()))
+    WorkSearchDocument.objects.bulk_create(documents, batch_size=500)
+    return len(documents)
+
+
+def _terms(query: str) -> list[str]:
+    return re.findall(r"\w+", query.lower())
+
+
+def search_queryset(queryset: QuerySet, query: str) -> QuerySet:
+    """
+    Filter a work queryset to full-text matches of ``query``, annotated with
+    ``search_rank`` (higher is better). Every term is prefix-matched so the
+    filter works while the user is still typing.
+    """
+    terms = _terms(query)
+    if not terms:
+        return queryset
+    kind = KIND_BY_MODEL[queryset.model]
+    work_table = queryset.model._meta.db_table
+
+    if connection.vendor == "postgresql":
+        tsquery = " & ".join(f"{term}:*" for term in terms)
+        match = "to_tsvector('simple', d.document) @@ to_tsquery('simple', %s)"
+        ids = RawSQL(f"SELECT d.work_id FROM {DOCUMENT_TABLE} d WHERE d.kind = %s AND {match}", (kind, tsquery))
+        rank = RawSQL(
+            f"SELECT ts_rank(to_tsvector('simple', d.document), to_tsquery('simple', %s)) "
+            f"FROM {DOCUMENT_TABLE} d WHERE d.kind = %s AND d.work_id = {work_table}.id",
+            (tsquery, kind),
+            output_field=FloatField(),
+        )
+    elif connection.vendor == "sqlite":
+        fts_query = " ".join(f'"{term}"*' for term in terms)
+        ids = RawSQL(
+            f"SELECT d.work_id FROM {FTS_TABLE} JOIN {DOCUMENT_TABLE} d ON d.id = {FTS_TABLE}.rowid "
+            f"WHERE {FTS_TABLE} MATCH %s AND d.kind = %s",
+            (fts_query, kind),
+        )
+        # bm25() is lower for better matches.
+        rank = RawSQL(
+            f"SELECT -bm25({FTS_TABLE}) FROM {FTS_TABLE} JOIN {DOCUMENT_TABLE} d ON d.id = {FTS_TABLE}.rowid "
+            f"WHERE {FTS_TABLE} MATCH %s AND d.kind = %s AND d.work_id = {work_table}.id",
+            (fts_query, kind),
+            output_field=FloatField(),
+        )
+    else:
+        documents = WorkSearchDocument.objects.filter(kind=kind)
+        for term in terms:
+            documents = documents.filter(document__icontains=term)
+        return queryset.filter(id__in=documents.values("work_id")).annotate(
+            search_rank=Value(0.0, output_field=FloatField())
+        )
+
+    return queryset.filter(id__in=ids).annotate(search_rank=rank)
@@ -1,12 +1,23 @@
+from functools import cached_property
+from operator import attrgetter, itemgetter
 from typing import Any, Dict
 
-from django.db import transaction
-from rest_framework import serializers
+from django.db import models, transaction
+from django.db.models import FileField
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema_field
+from rest_framework import ISO_8601, serializers
+from rest_framework.relations import MANY_RELATION_KWARGS
+from rest_framework.settings import api_settings
 
 from accounts.models import Department, Profile
-from accounts.serializers import DepartmentSerializer, ProfileShortSerializer
+from accounts.serializers import DepartmentSerializer, ProfileShortSerializer, profile_short_data
 from accounts.utils import get_user_profile
+from core.media import media_url, media_urls
+from files.tasks import delete_later
 from works.models import Certificate, MethodicalWork, ResearchWork, SoftwareCertificate
+from works.signals import mute_work_signals
+from works.writes import current_author_ids, refresh_works, stats_keys, sync_authors
 
 # Utility functions for academic year handling
 def format_academic_year(year: int) -> str:
@@ -45,162 +56,87 @@ class AcademicYearField(serializers.CharField):
         return str(value)
 
     def to_internal_value(self, data):
-        return parse_academic_year(data)
+        try:
+            return parse_academic_year(data)
+        except ValueError as exc:
+            raise serializers.ValidationError(str(exc))
+
+class WorkAuthorsListField(serializers.ManyRelatedField):
+    """Resolves a list of author ids with one ``id__in`` query."""
+
+    def to_internal_value(self, data):
+        if isinstance(data, str) or not hasattr(data, "__iter__"):
+            self.fail("not_a_list", input_type=type(data).__name__)
+        if not self.allow_empty and len(data) == 0:
+            self.fail("empty")
+
+        child = self.child_relation
+        ids = []
+        for item in data:
+            if isinstance(item, bool):
+                child.fail("incorrect_type", data_type=type(item).__name__)
+            try:
+                ids.append(int(item))
+            except (TypeError, ValueError):
+                child.fail("incorrect_type", data_type=type(item).__name__)
+        ids = list(dict.fromkeys(ids))
+
+        # Bulk requests resolve every author id up front (see works.bulk).
+        profiles = dict(self.context.get("profiles_by_id") or {})
+        missing = [pk for pk in ids if pk not in profiles]
+        if missing:
+            profiles.update(child.get_queryset().select_related("user").in_bulk(missing))
+        for pk in ids:
+            if pk not in profiles:
+                child.fail("does_not_exist", pk_value=pk)
+        return [profiles[pk] for pk in ids]
+
 
 class WorkAuthorsField(serializers.PrimaryKeyRelatedField):
     def __init__(self, **kwargs):
         kwargs.setdefault('queryset', Profile.objects.all())
         super().__init__(**kwargs)
 
-# Methodical Work Serializers
-class MethodicalWorkWriteSerializer(serializers.ModelSerializer):
-    year = AcademicYearField()
-    authors = WorkAuthorsField(many=True)
-    department = serializers.PrimaryKeyRelatedField(
-        queryset=Department.objects.all(),
-        required=False,
-        allow_null=True,
-    )
-    owner = serializers.PrimaryKeyRelatedField(
-        queryset=Profile.objects.all(),
-        required=False,
-    )
-
-    class Meta:
-        model = MethodicalWork
-        fields = (
-            "title",
-            "year",
-            "language",
-            "type",
-            "publisher",
-            "file",
-            "permission_file",
-            "description",
-            "authors",
-            "owner",
-            "department",
-            "is_department_visible",
-        )
-        extra_kwargs = {
-            "file": {"required": False, "allow_null": True},
-            "permission_file": {"required": False, "allow_null": True},
-            "publisher": {"required": False, "allow_blank": True},
-        }
+    @classmethod
+    def many_init(cls, *args, **kwargs):
+        list_kwargs = {"child_relation": cls(*args, **kwargs)}
+        for key in kwargs:
+            if key in MANY_RELATION_KWARGS:
+                list_kwargs[key] = kwargs[key]
+        return WorkAuthorsListField(**list_kwargs)
 
-    def create(self, validated_data):
-        authors = validated_data.pop("authors", [])
-        request = self.context.get("request")
-        profile = get_user_profile(request.user) if request else None
+WORK_HEAD_FIELDS = ("title", "year", "language", "type")
+WORK_TAIL_FIELDS = ("authors", "owner", "department", "is_department_visible")
 
-        if not profile:
-            raise serializers.ValidationError("User profile not found.")
-
-        if "owner" not in validated_data:
-            validated_data["owner"] = profile
-
-        if "department" not in validated_data or not validated_data["department"]:
-            validated_data["department"] = profile.department or Department.objects.filter(
-                name=Department.DEFAULT_NAME
-            ).first()
-
-        # Get file from request.FILES if not in validated_data
-        if request and hasattr(request, "FILES"):
-            if "file" not in validated_data and "file" in request.FILES:
-                validated_data["file"] = request.FILES["file"]
-            if "permission_file" not in validated_data and "permission_file" in request.FILES:
-                validated_data["permission_file"] = request.FILES["permission_file"]
-
-        with transaction.atomic():
-            instance = MethodicalWork.objects.create(**validated_data)
-            if authors:
-                instance.authors.set(authors)
-            return instance
-
-    def update(self, instance, validated_data):
-        authors = validated_data.pop("authors", None)
-        request = self.context.get("request")
-        
-        # Get file from request.FILES if not in validated_data
-        if request and hasattr(request, "FILES"):
-            if "file" not in validated_data and "file" in request.FILES:
-                validated_data["file"] = request.FILES["file"]
-            if "permission_file" not in validated_data and "permission_file" in request.FILES:
-                validated_data["permission_file"] = request.FILES["permission_file"]
-        
-        # Handle file updates
-        if "file" in validated_data and instance.file:
-            instance.file.delete(save=False)
-        if "permission_file" in validated_data and instance.permission_file:
-            instance.permission_file.delete(save=False)
-        
-        with transaction.atomic():
-            for attr, value in validated_data.items():
-                setattr(instance, attr, value)
-            instance.save()
-            if authors is not None:
-                instance.authors.set(authors)
-        return instance
-
-    def to_representation(self, instance):
-        """Override to properly serialize authors field for output."""
-        representation = super().to_representation(instance)
-        # Convert authors ManyRelatedManager to list of IDs
-        representation['authors'] = [author.id for author in instance.authors.all()]
-        return representation
+# Read fields whose DRF representation of a stored value is the value itself.
+PASSTHROUGH_FIELDS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+    serializers.URLField,
+    AcademicYearField,
+)
 
 
-class MethodicalWorkListSerializer(serializers.ModelSerializer):
-    year = AcademicYearField()
-    authors = ProfileShortSerializer(many=True, read_only=True)
-    owner = ProfileShortSerializer(read_only=True)
-    department = DepartmentSerializer(read_only=True)
-    file_url = serializers.SerializerMethodField()
-    permission_file_url = serializers.SerializerMethodField()
+@extend_schema_field(OpenApiTypes.STR)
+class MediaURLField(serializers.Field):
+    """Signed URL of the file field named by ``source``."""
 
-    class Meta:
-        model = MethodicalWork
-        fields = (
-            "id",
-            "title",
-            "year",
-            "language",
-            "type",
-            "publisher",
-            "file_url",
-            "permission_file_url",
-            "description",
-            "authors",
-            "owner",
-            "department",
-            "is_department_visible",
-            "created_at",
-            "updated_at",
-        )
-
-    def get_file_url(self, obj: MethodicalWork) -> str | None:
-        if obj.file:
-            request = self.context.get("request")
-            if request:
-                return request.build_absolute_uri(obj.file.url)
-            return obj.file.url
-        return None
+    def __init__(self, **kwargs):
+        kwargs.update(read_only=True, allow_null=True)
+        super().__init__(**kwargs)
 
-    def get_permission_file_url(self, obj: MethodicalWork) -> str | None:
-        if obj.permission_file:
-            request = self.context.get("request")
-            if request:
-                return request.build_absolute_uri(obj.permission_file.url)
-            return obj.permission_file.url
-        return None
+    def to_representation(self, value):
+        return media_url(value, self.context.get("request"))
 
 
-class MethodicalWorkDetailSerializer(MethodicalWorkListSerializer):
-    pass
+# Base classes of the generated serializers (see ``work_serializers``); their
+# docstrings would end up in every generated schema component, hence comments.
 
 
-# Research Work Serializers
-class ResearchWorkWriteSerializer(serializers.ModelSerializer):
+# Create and update of any WorkBase subclass.
+class WorkWriteSerializer(serializers.ModelSerializer):
     year = AcademicYearField()
     authors = WorkAuthorsField(many=True)
     department = serializers.PrimaryKeyRelatedField(
@@ -213,23 +149,19 @@ class ResearchWorkWriteSerializer(serializers.ModelSerializer):
         required=False,
     )
 
-    class Meta:
-        model = ResearchWork
-        fields = (
-            "title",
-            "year",
-            "language",
-            "type",
-            "venue",
-            "file",
-            "link",
-            "authors",
-            "owner",
-            "department",
-            "is_department_visible",
-        )
+    def _file_fields(self) -> list[str]:
+        return [name for name in self.Meta.fields if isinstance(self.Meta.model._meta.get_field(name), FileField)]
+
+    def _add_request_files(self, validated_data) -> None:
+        # Get files from request.FILES if not in validated_data
+        request = self.context.get("request")
+        if request and hasattr(request, "FILES"):
+            for name in self._file_fields():
+                if name not in validated_data and name in request.FILES:
+                    validated_data[name] = request.FILES[name]
 
     def create(self, validated_data):
+        model = self.Meta.model
         authors = validated_data.pop("authors", [])
         request = self.context.get("request")
         profile = get_user_profile(request.user) if request else None
@@ -245,344 +177,237 @@ class ResearchWorkWriteSerializer(serializers.ModelSerializer):
                 name=Department.DEFAULT_NAME
             ).first()
 
-        # Get file from request.FILES if not in validated_data
-        if request and hasattr(request, "FILES"):
-            if "file" not in validated_data and "file" in request.FILES:
-                validated_data["file"] = request.FILES["file"]
+        self._add_request_files(validated_data)
 
-        with transaction.atomic():
-            instance = ResearchWork.objects.create(**validated_data)
-            if authors:
-                instance.authors.set(authors)
-            return instance
+        # Signals are muted so the authors can be written as one insert; stats
+        # and search are refreshed once afterwards.
+        with transaction.atomic(), mute_work_signals():
+            instance = model.objects.create(**validated_data)
+            sync_authors(instance, authors, set())
+            refresh_works(model, [instance.pk])
+        return instance
 
     def update(self, instance, validated_data):
         authors = validated_data.pop("authors", None)
-        request = self.context.get("request")
-        
-        # Get file from request.FILES if not in validated_data
-        if request and hasattr(request, "FILES"):
-            if "file" not in validated_data and "file" in request.FILES:
-                validated_data["file"] = request.FILES["file"]
-        
-        # Handle file updates - delete old file if new one is provided
-        if "file" in validated_data and instance.file:
-            # Delete old file
-            instance.file.delete(save=False)
-        
-        with transaction.atomic():
+        self._add_request_files(validated_data)
+
+        previous_ids = current_author_ids(instance)
+        previous_keys = stats_keys(type(instance), [instance], {instance.pk: previous_ids})
+        with transaction.atomic(), mute_work_signals():
+            # Replaced files are deleted by a background task after commit
+            for name in self._file_fields():
+                if name in validated_data:
+                    delete_later(getattr(instance, name))
             for attr, value in validated_data.items():
                 setattr(instance, attr, value)
             instance.save()
             if authors is not None:
-                instance.authors.set(authors)
+                sync_authors(instance, authors, previous_ids)
+            refresh_works(type(instance), [instance.pk], previous_keys)
         return instance
 
     def to_representation(self, instance):
         """Override to properly serialize authors field for output."""
         representation = super().to_representation(instance)
-        # Convert authors ManyRelatedManager to list of IDs
+        # Authors cached by sync_authors() or the viewset's prefetch; no query.
         representation['authors'] = [author.id for author in instance.authors.all()]
         return representation
 
 
-class ResearchWorkListSerializer(serializers.ModelSerializer):
+class WorkReadListSerializer(serializers.ListSerializer):
+    """Serializes a page of works with one media URL builder for all of them."""
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.manager.BaseManager) else data
+        urls = media_urls(self.context.get("request"))
+        return [self.child.to_dict(item, urls) for item in iterable]
+
+
+# List and detail output of any WorkBase subclass. The declared fields define
+# the output and the schema, but works are emitted through ``to_dict``: each
+# field is compiled once per serializer into a reader, so plain values, media
+# URLs and nested profiles skip DRF's per-field dispatch. Fields without a fast
+# reader fall back to DRF.
+class WorkReadSerializer(serializers.ModelSerializer):
     year = AcademicYearField()
     authors = ProfileShortSerializer(many=True, read_only=True)
     owner = ProfileShortSerializer(read_only=True)
     department = DepartmentSerializer(read_only=True)
-    file_url = serializers.SerializerMethodField()
 
-    class Meta:
-        model = ResearchWork
-        fields = (
-            "id",
-            "title",
-            "year",
-            "language",
-            "type",
-            "venue",
-            "file_url",
-            "link",
-            "authors",
-            "owner",
-            "department",
-            "is_department_visible",
-            "created_at",
-            "updated_at",
-        )
-
-    def get_file_url(self, obj: ResearchWork) -> str | None:
-        if obj.file:
-            request = self.context.get("request")
-            if request:
-                return request.build_absolute_uri(obj.file.url)
-            return obj.file.url
+    def to_representation(self, instance):
+        return self.to_dict(instance, media_urls(self.context.get("request")))
+
+    def _compile(self, rows: bool) -> list:
+        attnames = {field.name: field.attname for field in self.Meta.model._meta.concrete_fields}
+        return [(field.field_name, _reader(field, attnames, rows)) for field in self._readable_fields]
+
+    @cached_property
+    def _readers(self) -> list:
+        return self._compile(rows=False)
+
+    @cached_property
+    def _row_readers(self) -> list:
+        return self._compile(rows=True)
+
+    def to_dict(self, instance, urls) -> dict:
+        """Output for ``instance``; ``urls`` is a ``core.media.media_urls`` builder."""
+        return {name: read(instance, urls) for name, read in self._readers}
+
+    def row_to_dict(self, row: dict, urls) -> dict:
+        """Output for a ``works.fastlist`` row, with nested objects already built."""
+        return {name: read(row, urls) for name, read in self._row_readers}
+
+
+def _is_nested(field) -> bool:
+    if isinstance(field, serializers.ListSerializer):
+        field = field.child
+    return type(field) in (ProfileShortSerializer, DepartmentSerializer)
+
+
+def _reader(field, attnames: dict[str, str], rows: bool = False):
+    """
+    ``read(item, urls)`` giving the representation of ``field`` for a work,
+    or with ``rows`` for a ``values()`` row keyed by field name.
+    ``attnames`` maps the model's concrete fields to their attributes.
+    """
+    if len(field.source_attrs) == 1:
+        source = field.source_attrs[0]
+        get = itemgetter(source) if rows else attrgetter(source)
+        if isinstance(field, MediaURLField):
+            return lambda item, urls: urls(get(item))
+        if rows and (_is_nested(field) or isinstance(field, (serializers.RelatedField, serializers.ManyRelatedField))):
+            # Built by works.fastlist.build_rows().
+            return lambda item, urls: get(item)
+        if isinstance(field, serializers.ListSerializer) and type(field.child) is ProfileShortSerializer:
+            return lambda item, urls: [profile_short_data(profile) for profile in get(item).all()]
+        if type(field) is ProfileShortSerializer:
+            return lambda item, urls: _optional(get(item), profile_short_data)
+        if type(field) is DepartmentSerializer:
+            return lambda item, urls: _optional(get(item), _department_data)
+        if type(field) in PASSTHROUGH_FIELDS:
+            return lambda item, urls: get(item)
+        if type(field) is serializers.DateTimeField and (timezone := _iso_timezone(field)) is not None:
+            return lambda item, urls: _iso_datetime(get(item), timezone, field)
+        if type(field) is serializers.PrimaryKeyRelatedField and field.pk_field is None and source in attnames:
+            # An unexpanded relation is its key column; reading the relation
+            # would load the related row.
+            get_key = attrgetter(attnames[source])
+            return lambda item, urls: get_key(item)
+        if source in attnames:
+            # Other dates still need DRF's formatting, but not its lookup.
+            return lambda item, urls: _optional(get(item), field.to_representation)
+    return lambda item, urls: _optional(field.get_attribute(item), field.to_representation)
+
+
+def _iso_timezone(field):
+    """Output time zone of an ISO 8601 DateTimeField, resolved once per serializer."""
+    if getattr(field, "format", api_settings.DATETIME_FORMAT) != ISO_8601:
         return None
+    return field.timezone if hasattr(field, "timezone") else field.default_timezone()
 
 
-class ResearchWorkDetailSerializer(ResearchWorkListSerializer):
-    pass
-
-
-# Certificate Serializers
-class CertificateWriteSerializer(serializers.ModelSerializer):
-    year = AcademicYearField()
-    authors = WorkAuthorsField(many=True)
-    department = serializers.PrimaryKeyRelatedField(
-        queryset=Department.objects.all(),
-        required=False,
-        allow_null=True,
-    )
-    owner = serializers.PrimaryKeyRelatedField(
-        queryset=Profile.objects.all(),
-        required=False,
-    )
-
-    class Meta:
-        model = Certificate
-        fields = (
-            "title",
-            "year",
-            "language",
-            "type",
-            "publisher",
-            "file",
-            "description",
-            "authors",
-            "owner",
-            "department",
-            "is_department_visible",
-        )
-        extra_kwargs = {
-            "file": {"required": False, "allow_null": True},
-            "publisher": {"required": False, "allow_blank": True},
-        }
-
-    def create(self, validated_data):
-        authors = validated_data.pop("authors", [])
-        request = self.context.get("request")
-        profile = get_user_profile(request.user) if request else None
+def _iso_datetime(value, timezone, field):
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return field.to_representation(value)
+    value = value.astimezone(timezone).isoformat()
+    return value[:-6] + "Z" if value.endswith("+00:00") else value
 
-        if not profile:
-            raise serializers.ValidationError("User profile not found.")
 
-        if "owner" not in validated_data:
-            validated_data["owner"] = profile
+def _optional(value, convert):
+    return None if value is None else convert(value)
 
-        if "department" not in validated_data or not validated_data["department"]:
-            validated_data["department"] = profile.department or Department.objects.filter(
-                name=Department.DEFAULT_NAME
-            ).first()
 
-        # Get file from request.FILES if not in validated_data
-        if request and hasattr(request, "FILES"):
-            if "file" not in validated_data and "file" in request.FILES:
-                validated_data["file"] = request.FILES["file"]
+def _department_data(department: Department) -> dict:
+    return {"id": department.id, "name": department.name}
 
-        with transaction.atomic():
-            instance = Certificate.objects.create(**validated_data)
-            if authors:
-                instance.authors.set(authors)
-            return instance
 
-    def update(self, instance, validated_data):
-        authors = validated_data.pop("authors", None)
-        request = self.context.get("request")
-        
-        # Get file from request.FILES if not in validated_data
-        if request and hasattr(request, "FILES"):
-            if "file" not in validated_data and "file" in request.FILES:
-                validated_data["file"] = request.FILES["file"]
-        
-        # Handle file updates - delete old file if new one is provided
-        if "file" in validated_data and instance.file:
-            instance.file.delete(save=False)
-        
-        with transaction.atomic():
-            for attr, value in validated_data.items():
-                setattr(instance, attr, value)
-            instance.save()
-            if authors is not None:
-                instance.authors.set(authors)
-        return instance
+def work_serializers(model, fields: tuple[str, ...], extra_kwargs: dict | None = None) -> tuple[type, type, type]:
+    """
+    Write, list and detail serializers of the WorkBase subclass ``model``.
 
-    def to_representation(self, instance):
-        """Override to properly serialize authors field for output."""
-        representation = super().to_representation(instance)
-        # Convert authors ManyRelatedManager to list of IDs
-        representation['authors'] = [author.id for author in instance.authors.all()]
-        return representation
-
-
-class CertificateListSerializer(serializers.ModelSerializer):
-    year = AcademicYearField()
-    authors = ProfileShortSerializer(many=True, read_only=True)
-    owner = ProfileShortSerializer(read_only=True)
-    department = DepartmentSerializer(read_only=True)
-    file_url = serializers.SerializerMethodField()
+    ``fields`` are the model's own fields in API order; they go between the
+    common head (title, year, ...) and tail (authors, owner, ...) fields.
+    File fields are written as uploads and read as signed ``<name>_url``s.
+    """
+    name = model.__name__
+    file_fields = {field for field in fields if isinstance(model._meta.get_field(field), FileField)}
 
-    class Meta:
-        model = Certificate
-        fields = (
+    write_meta = type("Meta", (), {
+        "model": model,
+        "fields": (*WORK_HEAD_FIELDS, *fields, *WORK_TAIL_FIELDS),
+        "extra_kwargs": extra_kwargs or {},
+    })
+    read_meta = type("Meta", (), {
+        "model": model,
+        "fields": (
             "id",
-            "title",
-            "year",
-            "language",
-            "type",
-            "publisher",
-            "file_url",
-            "description",
-            "authors",
-            "owner",
-            "department",
-            "is_department_visible",
+            *WORK_HEAD_FIELDS,
+            *(f"{field}_url" if field in file_fields else field for field in fields),
+            *WORK_TAIL_FIELDS,
             "created_at",
             "updated_at",
-        )
-
-    def get_file_url(self, obj: Certificate) -> str | None:
-        if obj.file:
-            request = self.context.get("request")
-            if request:
-                return request.build_absolute_uri(obj.file.url)
-            return obj.file.url
-        return None
-
-
-class CertificateDetailSerializer(CertificateListSerializer):
-    pass
-
-
-# Software Certificate Serializers
-class SoftwareCertificateWriteSerializer(serializers.ModelSerializer):
-    year = AcademicYearField()
-    authors = WorkAuthorsField(many=True)
-    department = serializers.PrimaryKeyRelatedField(
-        queryset=Department.objects.all(),
-        required=False,
-        allow_null=True,
-    )
-    owner = serializers.PrimaryKeyRelatedField(
-        queryset=Profile.objects.all(),
-        required=False,
-    )
-
-    class Meta:
-        model = SoftwareCertificate
-        fields = (
-            "title",
-            "year",
-            "language",
-            "type",
-            "issued_by",
-            "approval_date",
-            "cert_number",
-            "file",
-            "authors",
-            "owner",
-            "department",
-            "is_department_visible",
-        )
-        extra_kwargs = {
+        ),
+        "list_serializer_class": WorkReadListSerializer,
+    })
+
+    attrs = {"__module__": __name__}
+    write = type(f"{name}WriteSerializer", (WorkWriteSerializer,), {**attrs, "Meta": write_meta})
+    url_fields = {f"{field}_url": MediaURLField(source=field) for field in file_fields}
+    read = type(f"{name}ListSerializer", (WorkReadSerializer,), {**attrs, **url_fields, "Meta": read_meta})
+    detail = type(f"{name}DetailSerializer", (read,), attrs)
+    return write, read, detail
+
+
+MethodicalWorkWriteSerializer, MethodicalWorkListSerializer, MethodicalWorkDetailSerializer = work_serializers(
+    MethodicalWork,
+    ("publisher", "file", "permission_file", "description"),
+    extra_kwargs={
+        "file": {"required": False, "allow_null": True},
+        "permission_file": {"required": False, "allow_null": True},
+        "publisher": {"required": False, "allow_blank": True},
+    },
+)
+ResearchWorkWriteSerializer, ResearchWorkListSerializer, ResearchWorkDetailSerializer = work_serializers(
+    ResearchWork,
+    ("venue", "file", "link"),
+)
+CertificateWriteSerializer, CertificateListSerializer, CertificateDetailSerializer = work_serializers(
+    Certificate,
+    ("publisher", "file", "description"),
+    extra_kwargs={
+        "file": {"required": False, "allow_null": True},
+        "publisher": {"required": False, "allow_blank": True},
+    },
+)
+SoftwareCertificateWriteSerializer, SoftwareCertificateListSerializer, SoftwareCertificateDetailSerializer = (
+    work_serializers(
+        SoftwareCertificate,
+        ("issued_by", "approval_date", "cert_number", "file"),
+        extra_kwargs={
             "file": {"required": False, "allow_null": True},
             "issued_by": {"required": False, "allow_blank": True},
             "approval_date": {"required": False, "allow_null": True},
             "cert_number": {"required": False, "allow_blank": True},
-        }
-
-    def create(self, validated_data):
-        authors = validated_data.pop("authors", [])
-        request = self.context.get("request")
-        profile = get_user_profile(request.user) if request else None
-
-        if not profile:
-            raise serializers.ValidationError("User profile not found.")
-
-        if "owner" not in validated_data:
-            validated_data["owner"] = profile
-
-        if "department" not in validated_data or not validated_data["department"]:
-            validated_data["department"] = profile.department or Department.objects.filter(
-                name=Department.DEFAULT_NAME
-            ).first()
-
-        # Get file from request.FILES if not in validated_data
-        if request and hasattr(request, "FILES"):
-            if "file" not in validated_data and "file" in request.FILES:
-                validated_data["file"] = request.FILES["file"]
-
-        with transaction.atomic():
-            instance = SoftwareCertificate.objects.create(**validated_data)
-            if authors:
-                instance.authors.set(authors)
-            return instance
-
-    def update(self, instance, validated_data):
-        authors = validated_data.pop("authors", None)
-        request = self.context.get("request")
-        
-        # Get file from request.FILES if not in validated_data
-        if request and hasattr(request, "FILES"):
-            if "file" not in validated_data and "file" in request.FILES:
-                validated_data["file"] = request.FILES["file"]
-        
-        # Handle file updates - delete old file if new one is provided
-        if "file" in validated_data and instance.file:
-            # Delete old file
-            instance.file.delete(save=False)
-        
-        with transaction.atomic():
-            for attr, value in validated_data.items():
-                setattr(instance, attr, value)
-            instance.save()
-            if authors is not None:
-                instance.authors.set(authors)
-        return instance
+        },
+    )
+)
 
-    def to_representation(self, instance):
-        """Override to properly serialize authors field for output."""
-        representation = super().to_representation(instance)
-        # Convert authors ManyRelatedManager to list of IDs
-        representation['authors'] = [author.id for author in instance.authors.all()]
-        return representation
 
+class WorkFeedPageSerializer(serializers.Serializer):
+    next = serializers.URLField(allow_null=True)
+    results = serializers.ListField(child=serializers.DictField())
 
-class SoftwareCertificateListSerializer(serializers.ModelSerializer):
-    year = AcademicYearField()
-    authors = ProfileShortSerializer(many=True, read_only=True)
-    owner = ProfileShortSerializer(read_only=True)
-    department = DepartmentSerializer(read_only=True)
-    file_url = serializers.SerializerMethodField()
 
-    class Meta:
-        model = SoftwareCertificate
-        fields = (
-            "id",
-            "title",
-            "year",
-            "language",
-            "type",
-            "issued_by",
-            "approval_date",
-            "cert_number",
-            "file_url",
-            "authors",
-            "owner",
-            "department",
-            "is_department_visible",
-            "created_at",
-            "updated_at",
-        )
-
-    def get_file_url(self, obj: SoftwareCertificate) -> str | None:
-        if obj.file:
-            request = self.context.get("request")
-            if request:
-                return request.build_absolute_uri(obj.file.url)
-            return obj.file.url
-        return None
+class WorkBulkItemResultSerializer(serializers.Serializer):
+    index = serializers.IntegerField()
+    id = serializers.IntegerField(allow_null=True)
+    status = serializers.ChoiceField(choices=("created", "updated", "deleted", "error"))
+    errors = serializers.JSONField(required=False)
 
 
-class SoftwareCertificateDetailSerializer(SoftwareCertificateListSerializer):
-    pass
\ No newline at end of file
+class WorkBulkResponseSerializer(serializers.Serializer):
+    succeeded = serializers.IntegerField()
+    failed = serializers.IntegerField()
+    results = WorkBulkItemResultSerializer(many=True)
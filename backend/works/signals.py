@@ -0,0 +1,134 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.utils import timezone
+
+from accounts.models import Profile, ProfileName
+from works.models import WORK_MODELS
+from works.search import index_work, remove_work
+from works.utils import owned_or_authored
+
+User = get_user_model()
+
+# Works whose authors were cleared; stored between pre_clear and post_clear.
+CLEARED_WORKS_ATTR = "_search_cleared_works"
+
+_muted = ContextVar("work_signals_muted", default=False)
+
+
+@contextmanager
+def mute_work_signals():
+    """
+    Skip the per-work search and stats handlers inside the block. Bulk
+    operations use it and refresh both once for the whole batch.
+    """
+    token = _muted.set(True)
+    try:
+        yield
+    finally:
+        _muted.reset(token)
+
+
+def work_signals_muted() -> bool:
+    return _muted.get()
+
+
+def index_after_save(sender, instance, raw=False, **kwargs):
+    if not raw and not work_signals_muted():
+        index_work(instance)
+
+
+def remove_after_delete(sender, instance, **kwargs):
+    if not work_signals_muted():
+        remove_work(sender, instance.pk)
+
+
+def index_after_authors_change(sender, instance, action, reverse, model, pk_set, **kwargs):
+    if work_signals_muted():
+        return
+    if not reverse:
+        if action in {"post_add", "post_remove", "post_clear"}:
+            index_work(instance)
+        return
+
+    if action == "pre_clear":
+        setattr(instance, CLEARED_WORKS_ATTR, list(model.objects.filter(authors=instance)))
+    elif action == "post_clear":
+        for work in getattr(instance, CLEARED_WORKS_ATTR, None) or ():
+            index_work(work)
+        setattr(instance, CLEARED_WORKS_ATTR, None)
+    elif action in {"post_add", "post_remove"}:
+        for work in model.objects.filter(pk__in=pk_set or ()):
+            index_work(work)
+
+
+def touch_after_authors_change(sender, instance, action, reverse, model, pk_set, **kwargs):
+    """
+    Move ``updated_at`` of works whose authors changed, so their list and
+    detail ETags change with them.
+    """
+    if work_signals_muted():
+        return
+    if not reverse:
+        if action in {"post_add", "post_remove", "post_clear"}:
+            instance.updated_at = timezone.now()
+            type(instance).objects.filter(pk=instance.pk).update(updated_at=instance.updated_at)
+    elif action == "pre_clear":
+        model.objects.filter(authors=instance).update(updated_at=timezone.now())
+    elif action in {"post_add", "post_remove"}:
+        model.objects.filter(pk__in=pk_set or ()).update(updated_at=timezone.now())
+
+
+def touch_authored_works_before_profile_delete(sender, instance, **kwargs):
+    # The cascade removes the profile's author rows without m2m_changed.
+    for model in WORK_MODELS.values():
+        model.objects.filter(authors=instance).update(updated_at=timezone.now())
+
+
+def reindex_profile_works(profile_id: int) -> None:
+    for model in WORK_MODELS.values():
+        for work in model.objects.filter(owned_or_authored(model, profile_id)):
+            index_work(work)
+
+
+def reindex_after_user_save(sender, instance, created=False, update_fields=None, raw=False, **kwargs):
+    # Logins save last_login only; skip anything that cannot change names.
+    if raw or created:
+        return
+    if update_fields is not None and not {"first_name", "last_name"} & set(update_fields):
+        return
+    profile = getattr(instance, "profile", None)
+    if profile is not None:
+        reindex_profile_works(profile.id)
+
+
+def reindex_after_name_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        reindex_profile_works(instance.profile_id)
+
+
+def connect_signals() -> None:
+    for model in WORK_MODELS.values():
+        uid = f"works_search_{model._meta.label_lower}"
+        post_save.connect(index_after_save, sender=model, dispatch_uid=f"{uid}_post_save")
+        post_delete.connect(remove_after_delete, sender=model, dispatch_uid=f"{uid}_post_delete")
+        m2m_changed.connect(
+            index_after_authors_change,
+            sender=model.authors.through,
+            dispatch_uid=f"{uid}_authors",
+        )
+        m2m_changed.connect(
+            touch_after_authors_change,
+            sender=model.authors.through,
+            dispatch_uid=f"works_touch_{model._meta.label_lower}_authors",
+        )
+    pre_delete.connect(
+        touch_authored_works_before_profile_delete,
+        sender=Profile,
+        dispatch_uid="works_touch_authored_works",
+    )
+    post_save.connect(reindex_after_user_save, sender=User, dispatch_uid="works_search_user_names")
+    post_save.connect(reindex_after_name_change, sender=ProfileName, dispatch_uid="works_search_profile_names")
+    post_delete.connect(reindex_after_name_change, sender=ProfileName, dispatch_uid="works_search_profile_names_delete")
@@ -0,0 +1,38 @@
+import logging
+import os
+
+from files.extract import ExtractionUnavailable, extract_text
+from files.models import FileText
+from files.storage import content_storage
+from tasks.queue import task
+from works.search import reindex_file
+
+logger = logging.getLogger(__name__)
+
+
+@task(name="works.extract_file_text", timeout=600)
+def extract_file_text(name: str) -> None:
+    """Store the text of a work file and add it to the works' search documents."""
+    storage = content_storage()
+    if FileText.objects.filter(name=name).exists() or not storage.exists(name):
+        return
+    try:
+        with storage.open(name, "rb") as source:
+            text = extract_text(source, name)
+    except ExtractionUnavailable as exc:
+        # Recorded so reindexing does not queue the file again until the
+        # package is installed; see works.search.file_texts.
+        logger.warning("Text of %s not extracted: %s", name, exc)
+        file_text = FileText(name=name, unsupported=True)
+        file_text.text = ""
+        FileText.objects.bulk_create([file_text], ignore_conflicts=True)
+        return
+    except Exception:
+        # A corrupt or encrypted document; index the work without its text.
+        logger.warning("Text extraction failed for %s", name, exc_info=True)
+        text = ""
+    file_text = FileText(name=name)
+    file_text.text = text
+    FileText.objects.bulk_create([file_text], ignore_conflicts=True)
+    if text:
+        reindex_file(name)
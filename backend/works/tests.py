@@ -1,3 +1,522 @@
-from django.test import TestCase
+import datetime
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from core.conditional import ConditionalGetMixin
+
+from accounts.models import Department, Profile
+from works import serializers as work_serializers
+from works.models import Certificate, MethodicalWork, ResearchWork, SoftwareCertificate
+from works.utils import filter_visible_works
+
+User = get_user_model()
+
+
+class CursorPaginationOrderingTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        department = Department.objects.create(name="Cursor")
+        cls.user = User.objects.create_user("cursor-admin", password="pw")
+        cls.user.profile.role = Profile.Roles.ADMIN
+        cls.user.profile.department = department
+        cls.user.profile.save()
+        owners = []
+        for index in range(3):
+            profile = User.objects.create_user(f"cursor-owner-{index}", password="pw").profile
+            profile.department = department
+            profile.save()
+            owners.append(profile)
+        for index in range(7):
+            owner = owners[index % 3]
+            common = {"year": "2024-2025", "language": "UZ", "owner": owner, "department": department}
+            MethodicalWork.objects.create(title=f"Work {index}", type=MethodicalWork.Types.GUIDE, **common)
+            SoftwareCertificate.objects.create(
+                title=f"Certificate {index}",
+                type=SoftwareCertificate.Types.DGU,
+                # Every other certificate has no approval date.
+                approval_date=None if index % 2 else datetime.date(2024, 1, 1 + index // 4),
+                **common,
+            )
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def walk(self, url: str) -> tuple[list, list]:
+        """Ids of every page following ``next``, then back again following ``previous``."""
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        forward, body = [], response.json()
+        while True:
+            forward += [item["id"] for item in body["results"]]
+            if not body["next"]:
+                break
+            body = self.client.get(body["next"]).json()
+        backward = [item["id"] for item in body["results"]]
+        while body["previous"]:
+            body = self.client.get(body["previous"]).json()
+            backward = [item["id"] for item in body["results"]] + backward
+        return forward, backward
+
+    def assert_walks(self, base: str, model, ordering: str):
+        for fast in ("0", "1"):
+            with self.subTest(ordering=ordering, fast=fast):
+                forward, backward = self.walk(f"{base}?pagination=cursor&page_size=2&ordering={ordering}&fast={fast}")
+                self.assertCountEqual(forward, model.objects.values_list("id", flat=True))
+                self.assertEqual(backward, forward)
+
+    def test_foreign_key_ordering(self):
+        for ordering in ("owner", "-owner", "department,-owner"):
+            self.assert_walks("/api/methodical/", MethodicalWork, ordering)
+
+    def test_nullable_ordering(self):
+        for ordering in ("approval_date", "-approval_date", "-approval_date,title"):
+            self.assert_walks("/api/software-certificates/", SoftwareCertificate, ordering)
+
+    def test_nulls_sort_last_ascending(self):
+        forward, _ = self.walk("/api/software-certificates/?pagination=cursor&page_size=2&ordering=approval_date")
+        dates = dict(SoftwareCertificate.objects.values_list("id", "approval_date"))
+        ordered = [dates[pk] for pk in forward]
+        self.assertEqual(ordered, sorted(ordered, key=lambda value: (value is None, value)))
+
+    def test_many_valued_ordering_is_refused(self):
+        response = self.client.get("/api/methodical/?pagination=cursor&ordering=authors")
+        self.assertEqual(response.status_code, 400)
+
+
+class SparseFieldsetQueryTests(APITestCase):
+    URLS = (
+        "/api/methodical/?fast=0&expand=",
+        "/api/methodical/?fast=0&expand=authors",
+        "/api/methodical/?fast=0&fields=id,title,owner,department",
+    )
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("sparse-admin", password="pw")
+        cls.user.profile.role = Profile.Roles.ADMIN
+        cls.user.profile.save()
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def add_works(self, count: int):
+        for index in range(count):
+            department = Department.objects.create(name=f"Sparse {Department.objects.count()}")
+            owner = User.objects.create_user(f"sparse-{User.objects.count()}", password="pw").profile
+            work = MethodicalWork.objects.create(
+                title=f"Work {index}",
+                type=MethodicalWork.Types.GUIDE,
+                year="2024-2025",
+                language="UZ",
+                owner=owner,
+                department=department,
+            )
+            work.authors.add(owner)
+
+    def test_unexpanded_relations_do_not_load_rows(self):
+        self.add_works(1)
+        counts = {}
+        for url in self.URLS:
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.client.get(url).status_code, 200)
+            counts[url] = len(queries.captured_queries)
+        self.add_works(10)
+        for url in self.URLS:
+            with self.subTest(url=url), self.assertNumQueries(counts[url]):
+                response = self.client.get(url)
+            self.assertEqual(len(response.json()["results"]), 11)
+
+        row = self.client.get(self.URLS[0]).json()["results"][0]
+        work = MethodicalWork.objects.get(pk=row["id"])
+        self.assertEqual((row["owner"], row["department"]), (work.owner_id, work.department_id))
+
+
+class ConditionalGetTests(APITestCase):
+    URL = "/api/methodical/"
+
+    @classmethod
+    def setUpTestData(cls):
+        department = Department.objects.create(name="Conditional")
+        cls.user = User.objects.create_user("conditional-admin", password="pw")
+        cls.user.profile.role = Profile.Roles.ADMIN
+        cls.user.profile.department = department
+        cls.user.profile.save()
+        cls.owner = User.objects.create_user("conditional-owner", password="pw")
+        cls.coauthor = User.objects.create_user("conditional-coauthor", password="pw").profile
+        cls.works = [
+            MethodicalWork.objects.create(
+                title=f"Work {index}",
+                type=MethodicalWork.Types.GUIDE,
+                year="2024-2025",
+                language="UZ",
+                owner=cls.owner.profile,
+                department=department,
+            )
+            for index in range(3)
+        ]
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+        self.etag = self.client.get(self.URL, HTTP_IF_NONE_MATCH='"stale"')["ETag"]
+
+    def revalidate(self, url: str = URL, etag: str | None = None):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=etag or self.etag)
+
+    def assert_changed(self):
+        response = self.revalidate()
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], self.etag)
+        self.assertNotIn("Last-Modified", response)
+        return response
+
+    def test_unchanged_list_and_detail_are_not_modified(self):
+        self.assertEqual(self.revalidate().status_code, 304)
+        detail = f"{self.URL}{self.works[0].pk}/"
+        etag = self.client.get(detail, HTTP_IF_NONE_MATCH='"stale"')["ETag"]
+        self.assertEqual(self.revalidate(detail, etag).status_code, 304)
+
+    def test_unconditional_requests_skip_validators(self):
+        with mock.patch.object(ConditionalGetMixin, "list_validators", side_effect=AssertionError):
+            response = self.client.get(self.URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Last-Modified", response)
+        # The body hash is a valid ETag too; the 304 hands out the validator one.
+        response = self.revalidate(etag=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], self.etag)
+
+    def test_edit_invalidates(self):
+        self.works[1].title = "Renamed"
+        self.works[1].save()
+        self.assert_changed()
+
+    def test_authors_change_invalidates(self):
+        self.coauthor.authored_methodicalwork.add(self.works[1])
+        self.etag = self.assert_changed()["ETag"]
+        self.client.delete(f"/api/users/{self.coauthor.user_id}/")
+        self.assert_changed()
+
+    def test_owner_rename_invalidates(self):
+        self.owner.first_name = "Renamed"
+        self.owner.save()
+        self.assert_changed()
+
+    def test_delete_invalidates(self):
+        # The oldest work: deleting it does not move MAX(updated_at).
+        self.works[0].delete()
+        self.assertEqual(self.assert_changed().json()["count"], 2)
+        self.assertEqual(self.client.get(self.URL, HTTP_IF_MODIFIED_SINCE="Fri, 01 Jan 2100 00:00:00 GMT").status_code, 200)
+
+
+class TeacherVisibilityQueryTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        department, other = Department.objects.create(name="Visible"), Department.objects.create(name="Hidden")
+        cls.teacher = User.objects.create_user("visibility-teacher", password="pw")
+        cls.teacher.profile.department = department
+        cls.teacher.profile.save()
+        colleagues = [User.objects.create_user(f"visibility-{index}", password="pw").profile for index in range(3)]
+
+        def work(owner, department, visible=False, authors=()):
+            work = MethodicalWork.objects.create(
+                title="Work",
+                type=MethodicalWork.Types.GUIDE,
+                year="2024-2025",
+                language="UZ",
+                owner=owner,
+                department=department,
+                is_department_visible=visible,
+            )
+            work.authors.set(authors)
+
+        teacher = cls.teacher.profile
+        work(teacher, department, authors=[teacher, *colleagues])
+        work(colleagues[0], other, authors=[teacher, *colleagues[1:]])
+        work(colleagues[0], department, visible=True, authors=colleagues)
+        work(colleagues[1], department, visible=True, authors=[teacher])
+        work(colleagues[1], department, visible=False, authors=colleagues)
+        work(colleagues[2], other, visible=True)
+
+    def test_teacher_queryset_uses_exists_without_distinct(self):
+        sql = str(filter_visible_works(MethodicalWork.objects.all(), self.teacher.profile).query).upper()
+        self.assertIn("EXISTS", sql)
+        self.assertNotIn("DISTINCT", sql)
+
+    def test_same_rows_as_join_filter(self):
+        profile = self.teacher.profile
+        ids = list(filter_visible_works(MethodicalWork.objects.all(), profile).values_list("id", flat=True))
+        # The filter it replaced: a join on authors, made unique with DISTINCT.
+        joined = MethodicalWork.objects.filter(
+            Q(owner=profile) | Q(authors=profile) | Q(is_department_visible=True, department=profile.department)
+        ).distinct()
+        self.assertEqual(len(ids), len(set(ids)))
+        self.assertCountEqual(ids, joined.values_list("id", flat=True))
+        self.assertEqual(len(ids), 4)
+
+    def test_list_request_runs_no_distinct(self):
+        self.client.force_authenticate(self.teacher)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/methodical/")
+        self.assertEqual(response.json()["count"], 4)
+        self.assertFalse([query["sql"] for query in queries.captured_queries if "DISTINCT" in query["sql"].upper()])
+
+
+class BulkWorkTests(APITestCase):
+    URL = "/api/methodical/bulk/"
+
+    @classmethod
+    def setUpTestData(cls):
+        department, other = Department.objects.create(name="Bulk"), Department.objects.create(name="Bulk other")
+        cls.teacher = User.objects.create_user("bulk-teacher", password="pw")
+        cls.teacher.profile.department = department
+        cls.teacher.profile.save()
+        cls.colleagues = []
+        for index in range(3):
+            profile = User.objects.create_user(f"bulk-{index}", password="pw").profile
+            profile.department = department
+            profile.save()
+            cls.colleagues.append(profile)
+
+        def work(title, owner, department, visible=False, authors=()):
+            work = MethodicalWork.objects.create(
+                title=title,
+                type=MethodicalWork.Types.GUIDE,
+                year="2024-2025",
+                language="UZ",
+                owner=owner,
+                department=department,
+                is_department_visible=visible,
+            )
+            work.authors.set(authors)
+            return work
+
+        teacher = cls.teacher.profile
+        cls.own = work("Own", teacher, department)
+        cls.coauthored = work("Coauthored", cls.colleagues[0], department, authors=[teacher])
+        # Readable by the teacher, but not theirs to change.
+        cls.foreign = work("Foreign", cls.colleagues[0], department, visible=True)
+        cls.hidden = work("Hidden", cls.colleagues[1], other)
+
+    def setUp(self):
+        self.client.force_authenticate(self.teacher)
+
+    def item(self, title: str, **extra) -> dict:
+        return {
+            "title": title,
+            "type": MethodicalWork.Types.GUIDE,
+            "year": "2024-2025",
+            "language": "UZ",
+            "authors": [self.teacher.profile.pk],
+            **extra,
+        }
+
+    def send(self, method: str, items: list, expected_status: int) -> list[dict]:
+        response = getattr(self.client, method)(self.URL, items, format="json")
+        self.assertEqual(response.status_code, expected_status, response.content)
+        body = response.json()
+        self.assertEqual([result["index"] for result in body["results"]], list(range(len(items))))
+        self.assertEqual(body["failed"], sum(result["status"] == "error" for result in body["results"]))
+        return body["results"]
+
+    def test_create_statuses(self):
+        results = self.send("post", [self.item("New 1"), self.item("New 2")], 201)
+        self.assertEqual({result["status"] for result in results}, {"created"})
+        created = MethodicalWork.objects.filter(pk__in=[result["id"] for result in results])
+        self.assertEqual(sorted(created.values_list("title", flat=True)), ["New 1", "New 2"])
+        self.assertEqual({work.owner_id for work in created}, {self.teacher.profile.pk})
+
+        results = self.send("post", [self.item("Mixed"), self.item("Broken", type="UNKNOWN"), "not an object"], 207)
+        self.assertEqual([result["status"] for result in results], ["created", "error", "error"])
+        self.assertIn("type", results[1]["errors"])
+        self.assertIsNone(results[1]["id"])
+
+        results = self.send("post", [self.item(""), self.item("Bad year", language="XX")], 400)
+        self.assertEqual({result["status"] for result in results}, {"error"})
+        self.assertFalse(MethodicalWork.objects.filter(title__in=["Broken", "Bad year"]).exists())
+
+    def test_create_writes_authors(self):
+        colleagues = self.colleagues
+        results = self.send(
+            "post",
+            [self.item("Pair", authors=[colleagues[0].pk, colleagues[1].pk]), self.item("Solo")],
+            201,
+        )
+        pair, solo = (MethodicalWork.objects.get(pk=result["id"]) for result in results)
+        self.assertCountEqual(pair.authors.values_list("pk", flat=True), [colleagues[0].pk, colleagues[1].pk])
+        self.assertEqual(list(solo.authors.values_list("pk", flat=True)), [self.teacher.profile.pk])
+
+    def test_update_replaces_authors(self):
+        colleagues = self.colleagues
+        self.send("patch", [{"id": self.own.pk, "authors": [colleagues[2].pk]}], 200)
+        self.assertEqual(list(self.own.authors.values_list("pk", flat=True)), [colleagues[2].pk])
+
+    def test_update_reports_forbidden_items(self):
+        items = [
+            {"id": self.own.pk, "title": "Own renamed"},
+            {"id": self.coauthored.pk, "title": "Coauthored renamed"},
+            {"id": self.foreign.pk, "title": "Foreign renamed"},
+            {"id": self.hidden.pk, "title": "Hidden renamed"},
+            {"id": "x"},
+        ]
+        results = self.send("patch", items, 207)
+        self.assertEqual([result["status"] for result in results], ["updated", "updated", "error", "error", "error"])
+        self.assertEqual(results[2]["id"], self.foreign.pk)
+        self.assertEqual(results[3]["errors"], {"detail": "Topilmadi."})
+        titles = dict(MethodicalWork.objects.values_list("pk", "title"))
+        self.assertEqual(titles[self.own.pk], "Own renamed")
+        self.assertEqual(titles[self.coauthored.pk], "Coauthored renamed")
+        self.assertEqual(titles[self.foreign.pk], "Foreign")
+        self.assertEqual(titles[self.hidden.pk], "Hidden")
+
+        results = self.send("patch", [{"id": self.foreign.pk, "title": "Again"}], 400)
+        self.assertEqual(results[0]["status"], "error")
+
+    def test_failed_items_leave_no_partial_writes(self):
+        items = [
+            {"id": self.own.pk, "title": "Own renamed", "authors": [self.colleagues[1].pk]},
+            # A valid title and authors next to an invalid type: none of it is written.
+            {"id": self.coauthored.pk, "title": "Leaked", "type": "UNKNOWN", "authors": [self.colleagues[2].pk]},
+        ]
+        results = self.send("patch", items, 207)
+        self.assertEqual([result["status"] for result in results], ["updated", "error"])
+        self.coauthored.refresh_from_db()
+        self.assertEqual(self.coauthored.title, "Coauthored")
+        self.assertEqual(self.coauthored.type, MethodicalWork.Types.GUIDE)
+        self.assertEqual(list(self.coauthored.authors.values_list("pk", flat=True)), [self.teacher.profile.pk])
+        self.assertEqual(list(self.own.authors.values_list("pk", flat=True)), [self.colleagues[1].pk])
+
+    def test_delete_statuses(self):
+        results = self.send("delete", [self.own.pk, self.foreign.pk, self.own.pk], 207)
+        self.assertEqual([result["status"] for result in results], ["deleted", "error", "error"])
+        self.assertFalse(MethodicalWork.objects.filter(pk=self.own.pk).exists())
+        self.assertTrue(MethodicalWork.objects.filter(pk=self.foreign.pk).exists())
+        self.send("delete", [self.hidden.pk], 400)
+        self.assertTrue(MethodicalWork.objects.filter(pk=self.hidden.pk).exists())
+
+
+class GeneratedSerializerTests(APITestCase):
+    """The generated serializers keep the fields of the hand-written ones they replaced."""
+
+    WRITE_FIELDS = {
+        "MethodicalWork": ("publisher", "file", "permission_file", "description"),
+        "ResearchWork": ("venue", "file", "link"),
+        "Certificate": ("publisher", "file", "description"),
+        "SoftwareCertificate": ("issued_by", "approval_date", "cert_number", "file"),
+    }
+    READ_FIELDS = {
+        "MethodicalWork": ("publisher", "file_url", "permission_file_url", "description"),
+        "ResearchWork": ("venue", "file_url", "link"),
+        "Certificate": ("publisher", "file_url", "description"),
+        "SoftwareCertificate": ("issued_by", "approval_date", "cert_number", "file_url"),
+    }
+    REQUIRED_FIELDS = {
+        "MethodicalWork": {"title", "year", "type", "authors"},
+        "ResearchWork": {"title", "year", "type", "venue", "authors"},
+        "Certificate": {"title", "year", "type", "authors"},
+        "SoftwareCertificate": {"title", "year", "type", "authors"},
+    }
+    HEAD = ("title", "year", "language", "type")
+    TAIL = ("authors", "owner", "department", "is_department_visible")
+
+    def serializer(self, name: str, kind: str):
+        return getattr(work_serializers, f"{name}{kind}Serializer")()
+
+    def test_write_fields(self):
+        for name, fields in self.WRITE_FIELDS.items():
+            with self.subTest(name):
+                serializer = self.serializer(name, "Write")
+                self.assertEqual(tuple(serializer.fields), (*self.HEAD, *fields, *self.TAIL))
+                required = {field_name for field_name, field in serializer.fields.items() if field.required}
+                self.assertEqual(required, self.REQUIRED_FIELDS[name])
+
+    def test_read_fields(self):
+        for name, fields in self.READ_FIELDS.items():
+            expected = ("id", *self.HEAD, *fields, *self.TAIL, "created_at", "updated_at")
+            for kind in ("List", "Detail"):
+                with self.subTest(name, kind=kind):
+                    serializer = self.serializer(name, kind)
+                    self.assertEqual(tuple(serializer.fields), expected)
+
+    def test_nested_read_fields(self):
+        fields = self.serializer("MethodicalWork", "List").fields
+        self.assertEqual(tuple(fields["owner"].fields), ("id", "full_name", "role", "user_id_str"))
+        self.assertEqual(tuple(fields["authors"].child.fields), ("id", "full_name", "role", "user_id_str"))
+        self.assertEqual(tuple(fields["department"].fields), ("id", "name"))
+
+
+class FastListParityTests(APITestCase):
+    """``?fast=1`` renders the same lists as the serializer path."""
+
+    URLS = ("/api/methodical/", "/api/research/", "/api/certificates/", "/api/software-certificates/")
+    QUERIES = (
+        "",
+        "expand=",
+        "expand=authors",
+        "fields=id,title,authors,file_url",
+        "year=2024-2025",
+        "pagination=cursor&page_size=2&ordering=-year,title",
+        # Ties on the owner are broken by id in both modes.
+        "ordering=owner",
+        "ordering=-owner&search=Parity",
+    )
+
+    @classmethod
+    def setUpTestData(cls):
+        department = Department.objects.create(name="Parity")
+        cls.user = User.objects.create_user("parity-admin", password="pw", first_name="Ada", last_name="Admin")
+        cls.user.profile.role = Profile.Roles.ADMIN
+        cls.user.profile.department = department
+        cls.user.profile.save()
+        people = []
+        for index, (first, last) in enumerate((("Bek", "Berdi"), ("", ""), ("Cho", ""))):
+            profile = User.objects.create_user(f"parity-{index}", password="pw", first_name=first, last_name=last).profile
+            profile.department = department
+            profile.save()
+            people.append(profile)
+
+        kinds = (
+            (MethodicalWork, {"type": MethodicalWork.Types.GUIDE, "publisher": "Press", "permission_file": "p/a.pdf"}),
+            (ResearchWork, {"type": ResearchWork.Types.LOCAL_ARTICLE, "venue": "Journal", "link": "https://e.org/a"}),
+            (Certificate, {"type": Certificate.Types.LOCAL, "description": "Text"}),
+            (SoftwareCertificate, {"type": SoftwareCertificate.Types.DGU, "approval_date": datetime.date(2024, 5, 1)}),
+        )
+        for model, extra in kinds:
+            for index in range(5):
+                work = model.objects.create(
+                    title=f"Parity {index}",
+                    year="2024-2025" if index % 2 else "2023-2024",
+                    language="UZ",
+                    owner=people[index % 3],
+                    department=department,
+                    is_department_visible=bool(index % 2),
+                    # Every third work has no file.
+                    file="" if index % 3 == 0 else f"works/{index}.pdf",
+                    **extra,
+                )
+                work.authors.set(people[: index % 4])
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def get(self, url: str) -> dict:
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def test_same_output(self):
+        for url in self.URLS:
+            for query in self.QUERIES:
+                with self.subTest(url=url, query=query):
+                    slow = self.get(f"{url}?fast=0&{query}")
+                    fast = self.get(f"{url}?fast=1&{query}")
+                    self.assertTrue(slow["results"])
+                    for link in ("next", "previous"):
+                        if slow.get(link):
+                            self.assertEqual(fast[link].replace("fast=1", "fast=0"), slow[link])
+                            slow[link] = fast[link] = None
+                    self.assertEqual(fast, slow)
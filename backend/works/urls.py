@@ -6,6 +6,8 @@ from works.views import (
     MethodicalWorkViewSet,
     ResearchWorkViewSet,
     SoftwareCertificateViewSet,
+    WorkExportView,
+    WorkFeedView,
 )
 
 router = DefaultRouter()
@@ -15,6 +17,8 @@ router.register("certificates", CertificateViewSet, basename="certificate")
 router.register("software-certificates", SoftwareCertificateViewSet, basename="softwarecertificate")
 
 urlpatterns = [
+    path("works/feed/", WorkFeedView.as_view(), name="works-feed"),
+    path("works/export/", WorkExportView.as_view(), name="works-export"),
     path("", include(router.urls)),
 ]
 
@@ -0,0 +1,46 @@
+from django.db.models import Exists, OuterRef, Q, QuerySet
+
+from accounts.models import Profile
+
+
+def authored_by(model, **profile_lookup) -> Exists:
+    """
+    Semi-join on the ``authors`` through-table, e.g. ``authored_by(model, profile_id=1)``.
+
+    Unlike filtering on ``authors=...`` this never duplicates rows, so
+    callers need no DISTINCT.
+    """
+    through = model.authors.through
+    return Exists(
+        through.objects.filter(
+            **{f"{model._meta.model_name}_id": OuterRef("pk")},
+            **profile_lookup,
+        )
+    )
+
+
+def owned_or_authored(model, profile_id: int) -> Q:
+    return Q(owner_id=profile_id) | Q(authored_by(model, profile_id=profile_id))
+
+
+def filter_visible_works(queryset: QuerySet, profile: Profile | None) -> QuerySet:
+    """Limit a work queryset to the rows the profile's role may see."""
+    if not profile:
+        return queryset.none()
+
+    if profile.role == Profile.Roles.ADMIN:
+        return queryset
+
+    if profile.role == Profile.Roles.HOD:
+        return queryset.filter(department=profile.department)
+
+    if profile.role == Profile.Roles.TEACHER:
+        return queryset.filter(
+            owned_or_authored(queryset.model, profile.id)
+            | Q(
+                is_department_visible=True,
+                department=profile.department,
+            )
+        )
+
+    return queryset.none()
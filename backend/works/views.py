@@ -1,17 +1,36 @@
-from django.db.models import Q
-from drf_spectacular.utils import extend_schema
-from rest_framework import permissions, viewsets
+from django.db.models import CharField, Q, Value
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
+from rest_framework import permissions, serializers, viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import GenericAPIView
 from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
 
-from accounts.models import Profile
+from accounts.models import Department, Profile
 from accounts.utils import get_user_profile
+from core.conditional import ConditionalGetMixin, conditional_get
+from core.export import EXPORT_FORMATS, export_format, export_response
+from core.fieldsets import FIELDSET_PARAMETERS, SparseFieldsetMixin, is_expanded
+from core.media import media_urls
+from core.pagination import CursorPaginationOptInMixin
+from core.renderers import FastJSONRenderer
+from works.bulk import BulkWorkMixin
 from works.models import (
+    WORK_MODELS,
     Certificate,
     MethodicalWork,
     ResearchWork,
     SoftwareCertificate,
 )
+from works.fastlist import build_rows, fast_list_queryset, use_fast_list
+from works.filters import WorkFullTextFilter
+from works.pagination import decode_feed_cursor, encode_feed_cursor, feed_after
 from works.permissions import WorkAccessPermission
+from works.utils import authored_by, filter_visible_works
 from works.serializers import (
     CertificateDetailSerializer,
     CertificateListSerializer,
@@ -25,52 +44,117 @@ from works.serializers import (
     SoftwareCertificateDetailSerializer,
     SoftwareCertificateListSerializer,
     SoftwareCertificateWriteSerializer,
+    WorkFeedPageSerializer,
 )
 
 
-class WorkViewSet(viewsets.ModelViewSet):
+@extend_schema_view(
+    list=extend_schema(parameters=FIELDSET_PARAMETERS),
+    retrieve=extend_schema(parameters=FIELDSET_PARAMETERS),
+)
+class WorkViewSet(
+    ConditionalGetMixin, SparseFieldsetMixin, BulkWorkMixin, CursorPaginationOptInMixin, viewsets.ModelViewSet
+):
     permission_classes = [permissions.IsAuthenticated, WorkAccessPermission]
+    filter_backends = [*api_settings.DEFAULT_FILTER_BACKENDS, WorkFullTextFilter]
     filterset_fields = ("year", "language", "type")
     search_fields = ("title",)
     ordering = ("-year", "-created_at")
     serializer_action_classes = {}
     model = None
     parser_classes = (MultiPartParser, FormParser)
+    # Without ?expand=owner etc. these render the ids the write endpoints take.
+    expandable_fields = {
+        "owner": lambda: serializers.PrimaryKeyRelatedField(read_only=True),
+        "authors": lambda: serializers.PrimaryKeyRelatedField(read_only=True, many=True),
+        "department": lambda: serializers.PrimaryKeyRelatedField(read_only=True),
+    }
+    # Owner, author and department names are rendered, and file URLs are signed.
+    conditional_dependencies = (Profile, Department)
+    conditional_media = True
 
     def get_queryset(self):
         profile = get_user_profile(self.request.user)
         if not profile:
             return self.model.objects.none()
 
-        queryset = (
-            self.model.objects.all()
-            .select_related("owner__user", "department")
-            .prefetch_related("authors__user")
-        )
-
-        if profile.role == Profile.Roles.ADMIN:
-            return queryset
-
-        if profile.role == Profile.Roles.HOD:
-            return queryset.filter(department=profile.department)
-
-        if profile.role == Profile.Roles.TEACHER:
-            return queryset.filter(
-                Q(owner=profile)
-                | Q(authors=profile)
-                | Q(
-                    is_department_visible=True,
-                    department=profile.department,
-                )
-            ).distinct()
+        if self.fieldset is None:
+            queryset = (
+                self.model.objects.all()
+                .select_related("owner__user", "department")
+                .prefetch_related("authors__user")
+            )
+        else:
+            queryset = self._sparse_queryset()
+        if self.detail and profile.role == Profile.Roles.TEACHER:
+            # Lets WorkAccessPermission check authorship without a query.
+            queryset = queryset.annotate(is_author=authored_by(self.model, profile_id=profile.id))
+        return filter_visible_works(queryset, profile)
 
-        return queryset.none()
+    def _sparse_queryset(self):
+        """Only the columns, joins and prefetches the requested fields need."""
+        fields = self.output_fields()
+        columns = {field.name for field in self.model._meta.concrete_fields}
+        ordering = [*self.ordering, *self.request.query_params.get("ordering", "").split(",")]
+        # Access checks and pagination cursors read these.
+        needed = {"id", "owner", "department", "is_department_visible"}
+        needed.update(name.lstrip("-") for name in ordering if name.lstrip("-") in columns)
+        needed.update(field.source for field in fields.values() if field.source in columns)
+
+        queryset = self.model.objects.only(*needed)
+        if is_expanded(fields.get("owner")):
+            queryset = queryset.select_related("owner__user")
+        if is_expanded(fields.get("department")):
+            queryset = queryset.select_related("department")
+        if "authors" in fields:
+            queryset = queryset.prefetch_related("authors__user" if is_expanded(fields["authors"]) else "authors")
+        return queryset
 
     def get_serializer_class(self):
         if hasattr(self, "serializer_action_classes"):
             return self.serializer_action_classes.get(self.action, super().get_serializer_class())
         return super().get_serializer_class()
 
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        # Rows tied on the requested ordering would come back in whatever order
+        # the plan yields, which differs between pages and ?fast= modes.
+        ordering = queryset.query.order_by
+        names = [name.lstrip("-") for name in ordering if isinstance(name, str)]
+        if ordering and not {"id", "pk"} & set(names):
+            last = ordering[-1]
+            queryset = queryset.order_by(*ordering, "-id" if isinstance(last, str) and last.startswith("-") else "id")
+        return queryset
+
+    def use_fast_list(self) -> bool:
+        return self.action == "list" and use_fast_list(self.request)
+
+    def get_renderers(self):
+        renderers = super().get_renderers()
+        if self.use_fast_list():
+            renderers = [FastJSONRenderer() if type(renderer) is JSONRenderer else renderer for renderer in renderers]
+        return renderers
+
+    @conditional_get("list_validators")
+    def list(self, request, *args, **kwargs):
+        if not self.use_fast_list():
+            return super().list(request, *args, **kwargs)
+        queryset = fast_list_queryset(self.filter_queryset(self.get_queryset()), self.output_fields())
+        page = self.paginate_queryset(queryset)
+        data = self.fast_list_data(queryset if page is None else page)
+        return Response(data) if page is None else self.get_paginated_response(data)
+
+    @conditional_get("object_validators")
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    def fast_list_data(self, rows):
+        """List output for rows of ``fast_list_queryset()``."""
+        serializer = self.get_serializer(many=True).child
+        urls = media_urls(self.request)
+        rows = build_rows(self.model, list(rows), serializer.fields)
+        return [serializer.row_to_dict(row, urls) for row in rows]
+
 
 @extend_schema(
     tags=["Methodical Works"],
@@ -138,3 +222,197 @@ class SoftwareCertificateViewSet(WorkViewSet):
         "update": SoftwareCertificateWriteSerializer,
         "partial_update": SoftwareCertificateWriteSerializer,
     }
+
+
+FEED_SERIALIZERS = {
+    "methodical": MethodicalWorkListSerializer,
+    "research": ResearchWorkListSerializer,
+    "certificate": CertificateListSerializer,
+    "software_certificate": SoftwareCertificateListSerializer,
+}
+FEED_ORDERING = ("-year", "-created_at", "id", "kind")
+
+
+class WorkQueryParamsMixin:
+    """``kind``, ``year``, ``language``, ``type`` and ``user`` filters shared by cross-kind views."""
+
+    def _get_kinds(self) -> list[str]:
+        requested = self.request.query_params.get("kind")
+        if not requested:
+            return list(WORK_MODELS)
+        kinds = [kind.strip() for kind in requested.split(",") if kind.strip()]
+        unknown = [kind for kind in kinds if kind not in WORK_MODELS]
+        if unknown or not kinds:
+            raise ValidationError({"kind": f"Noma'lum tur: {', '.join(unknown)}"})
+        return kinds
+
+    def _filter(self, queryset):
+        params = self.request.query_params
+        for field in ("year", "language", "type"):
+            if params.get(field):
+                queryset = queryset.filter(**{field: params[field]})
+        if params.get("user"):
+            try:
+                user_id = int(params["user"])
+            except ValueError:
+                raise ValidationError({"user": "Butun son bo'lishi kerak."})
+            queryset = queryset.filter(
+                Q(owner__user_id=user_id) | Q(authored_by(queryset.model, profile__user_id=user_id))
+            )
+        return queryset
+
+
+@extend_schema(
+    tags=["Works Feed"],
+    summary="Unified works feed",
+    description=(
+        "Methodical works, research works, certificates and software certificates "
+        "merged into one list ordered by year and creation time, with cursor pagination. "
+        "Each item carries a `kind` field and the fields of its list serializer."
+    ),
+    parameters=[
+        OpenApiParameter("cursor", str, description="Cursor from the previous page's `next` link."),
+        OpenApiParameter("page_size", int, description="Items per page (max 100)."),
+        OpenApiParameter("kind", str, description="Comma-separated kinds: " + ", ".join(WORK_MODELS)),
+        OpenApiParameter("user", int, description="Only works owned or co-authored by this user id."),
+        OpenApiParameter("year", str),
+        OpenApiParameter("language", str),
+        OpenApiParameter("type", str),
+    ],
+    responses={200: WorkFeedPageSerializer},
+)
+class WorkFeedView(WorkQueryParamsMixin, GenericAPIView):
+    permission_classes = [permissions.IsAuthenticated, WorkAccessPermission]
+    serializer_class = WorkFeedPageSerializer
+    max_page_size = 100
+
+    def get(self, request):
+        profile = get_user_profile(request.user)
+        page_size = self._get_page_size()
+        cursor = request.query_params.get("cursor")
+        position = decode_feed_cursor(cursor) if cursor else None
+
+        parts = []
+        for kind in self._get_kinds():
+            queryset = self._filter(filter_visible_works(WORK_MODELS[kind].objects.all(), profile))
+            if position:
+                queryset = queryset.filter(feed_after(kind, position))
+            parts.append(
+                queryset.order_by()
+                .annotate(kind=Value(kind, output_field=CharField()))
+                .values("kind", "id", "year", "created_at")
+            )
+        first, *rest = parts
+        rows = list(first.union(*rest, all=True).order_by(*FEED_ORDERING)[: page_size + 1])
+
+        page = rows[:page_size]
+        next_url = None
+        if len(rows) > page_size:
+            last = page[-1]
+            next_cursor = encode_feed_cursor((last["year"], last["created_at"], last["id"], last["kind"]))
+            next_url = replace_query_param(request.build_absolute_uri(), "cursor", next_cursor)
+
+        return Response({"next": next_url, "results": self._serialize(page)})
+
+    def _get_page_size(self) -> int:
+        try:
+            page_size = int(self.request.query_params.get("page_size", api_settings.PAGE_SIZE))
+        except ValueError:
+            raise ValidationError({"page_size": "Butun son bo'lishi kerak."})
+        return max(1, min(page_size, self.max_page_size))
+
+    def _serialize(self, page: list[dict]) -> list[dict]:
+        ids_by_kind = {}
+        for row in page:
+            ids_by_kind.setdefault(row["kind"], []).append(row["id"])
+
+        objects = {}
+        for kind, ids in ids_by_kind.items():
+            queryset = (
+                WORK_MODELS[kind].objects.filter(id__in=ids)
+                .select_related("owner__user", "department")
+                .prefetch_related("authors__user")
+            )
+            objects.update({(kind, obj.id): obj for obj in queryset})
+
+        context = self.get_serializer_context()
+        serializers = {kind: FEED_SERIALIZERS[kind](context=context) for kind in ids_by_kind}
+        urls = media_urls(self.request)
+        return [
+            {"kind": row["kind"], **serializers[row["kind"]].to_dict(objects[(row["kind"], row["id"])], urls)}
+            for row in page
+        ]
+
+
+EXPORT_HEADER = (
+    "kind",
+    "id",
+    "title",
+    "year",
+    "language",
+    "type",
+    "owner",
+    "authors",
+    "department",
+    "is_department_visible",
+    "created_at",
+    "updated_at",
+)
+
+
+def _display_name(profile: Profile) -> str:
+    return profile.user.get_full_name().strip() or profile.user.username
+
+
+@extend_schema(
+    tags=["Works Feed"],
+    summary="Export works",
+    description=(
+        "Stream every work the user may see as CSV (default) or XLSX (`?output=xlsx`), "
+        "with resolved owner and author names. Accepts the same filters as the feed."
+    ),
+    parameters=[
+        OpenApiParameter("output", str, enum=list(EXPORT_FORMATS)),
+        OpenApiParameter("kind", str, description="Comma-separated kinds: " + ", ".join(WORK_MODELS)),
+        OpenApiParameter("user", int, description="Only works owned or co-authored by this user id."),
+        OpenApiParameter("year", str),
+        OpenApiParameter("language", str),
+        OpenApiParameter("type", str),
+    ],
+    responses={(200, content_type): OpenApiTypes.BINARY for content_type in EXPORT_FORMATS.values()},
+)
+class WorkExportView(WorkQueryParamsMixin, GenericAPIView):
+    permission_classes = [permissions.IsAuthenticated, WorkAccessPermission]
+    chunk_size = 1000
+
+    def get(self, request):
+        output = export_format(request)
+        profile = get_user_profile(request.user)
+        querysets = [
+            (kind, self._filter(filter_visible_works(WORK_MODELS[kind].objects.all(), profile)))
+            for kind in self._get_kinds()
+        ]
+        return export_response(output, "works", EXPORT_HEADER, self._rows(querysets))
+
+    def _rows(self, querysets):
+        for kind, queryset in querysets:
+            queryset = (
+                queryset.select_related("owner__user", "department")
+                .prefetch_related("authors__user")
+                .order_by("-year", "-created_at", "id")
+            )
+            for work in queryset.iterator(chunk_size=self.chunk_size):
+                yield (
+                    kind,
+                    work.id,
+                    work.title,
+                    work.year,
+                    work.language,
+                    work.type,
+                    _display_name(work.owner),
+                    "; ".join(_display_name(author) for author in work.authors.all()),
+                    work.department.name,
+                    work.is_department_visible,
+                    work.created_at,
+                    work.updated_at,
+                )
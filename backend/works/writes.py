@@ -0,0 +1,95 @@
+"""
+Writing works without the per-work model signals.
+
+Bulk endpoints and the write serializers save works and their authors inside
+``mute_work_signals()`` with direct through-table writes, then refresh the
+stats rollup and search documents once with ``refresh_works``. This keeps the
+query count of a save independent of the number of authors.
+"""
+from stats.rollup import KIND_BY_MODEL, work_keys
+from stats.signals import schedule_refresh
+from works.search import index_works
+
+BATCH_SIZE = 500
+
+
+def author_ids_by_work(model, work_ids) -> dict[int, set[int]]:
+    """Author profile ids of many works in one through-table query."""
+    work_field = f"{model._meta.model_name}_id"
+    authors: dict[int, set[int]] = {}
+    rows = model.authors.through.objects.filter(**{f"{work_field}__in": list(work_ids)})
+    for work_id, profile_id in rows.values_list(work_field, "profile_id"):
+        authors.setdefault(work_id, set()).add(profile_id)
+    return authors
+
+
+def stats_keys(model, works, author_ids: dict[int, set[int]]) -> set:
+    kind = KIND_BY_MODEL[model]
+    keys = set()
+    for work in works:
+        keys |= work_keys(kind, work, author_ids.get(work.pk, ()))
+    return keys
+
+
+def refresh_works(model, work_ids, previous_keys: set = frozenset()) -> None:
+    """
+    Update rollup rows, cached stats and search documents for works written
+    with bulk_create/bulk_update or under mute_work_signals().
+    """
+    work_ids = list(work_ids)
+    works = model.objects.filter(pk__in=work_ids).only("id", "owner_id", "department_id", "year", "type", "language")
+    schedule_refresh(set(previous_keys) | stats_keys(model, works, author_ids_by_work(model, work_ids)))
+    index_works(model, work_ids)
+
+
+def set_authors(model, authors_by_work: dict[int, list]) -> None:
+    """Replace the authors of many works with one delete and one insert."""
+    if not authors_by_work:
+        return
+    through = model.authors.through
+    work_field = f"{model._meta.model_name}_id"
+    through.objects.filter(**{f"{work_field}__in": list(authors_by_work)}).delete()
+    through.objects.bulk_create(
+        [
+            through(**{work_field: work_id, "profile_id": author.pk})
+            for work_id, authors in authors_by_work.items()
+            for author in {author.pk: author for author in authors}.values()
+        ],
+        batch_size=BATCH_SIZE,
+    )
+
+
+def current_author_ids(work) -> set[int]:
+    """Author ids of a saved work, from prefetched authors when available."""
+    prefetched = getattr(work, "_prefetched_objects_cache", {}).get("authors")
+    if prefetched is not None:
+        return {author.pk for author in prefetched}
+    return author_ids_by_work(type(work), [work.pk]).get(work.pk, set())
+
+
+def cache_authors(work, authors) -> None:
+    """Store ``authors`` as the work's prefetched authors, so reads need no query."""
+    queryset = work.authors.all()
+    queryset._result_cache = sorted(authors, key=lambda author: author.user.username)
+    queryset._prefetch_done = True
+    work.__dict__.setdefault("_prefetched_objects_cache", {})["authors"] = queryset
+
+
+def sync_authors(work, authors, previous_ids: set[int]) -> None:
+    """
+    Make ``authors`` (resolved profiles) the work's authors, deleting and
+    inserting only the through rows that differ from ``previous_ids``.
+    """
+    authors = list({author.pk: author for author in authors}.values())
+    through = work.authors.through
+    work_field = f"{work._meta.model_name}_id"
+    removed = previous_ids - {author.pk for author in authors}
+    if removed:
+        through.objects.filter(**{work_field: work.pk, "profile_id__in": removed}).delete()
+    added = [author for author in authors if author.pk not in previous_ids]
+    if added:
+        through.objects.bulk_create(
+            [through(**{work_field: work.pk, "profile_id": author.pk}) for author in added],
+            batch_size=BATCH_SIZE,
+        )
+    cache_authors(work, authors)